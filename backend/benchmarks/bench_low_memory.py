@@ -0,0 +1,78 @@
+"""Benchmark: memory held by a long conversation, with and without spilling.
+
+Builds a synthetic conversation of large file reads, then reports the
+Python heap still allocated for it (``tracemalloc``) and the time to build
+one request, keeping contents in memory or in a ``BlobStore``.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_low_memory [turns]
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from src.models.config import ContextConfig
+from src.models.tool import ToolCall
+from src.models.tool import ToolResult
+from src.services.blob_store import DEFAULT_MIN_CHARS
+from src.services.blob_store import BlobStore
+from src.services.context_window import ContextWindowManager
+from src.services.message_repository import MessageRepository
+
+# Characters of each file read
+READ_CHARS = 20_000
+
+
+def _build(turns: int, blobs: BlobStore | None) -> ContextWindowManager:
+    """Create a conversation with one large read per turn."""
+    repository = MessageRepository("You are a coding agent.", blobs=blobs)
+    window = ContextWindowManager(repository, ContextConfig())
+    for index in range(turns):
+        repository.add_user_message(f"Explain module {index}.")
+        call = ToolCall(id=f"call_{index}", name="read_file", arguments="{}")
+        repository.add_assistant_tool_calls([call])
+        content = "".join(
+            f"{line}: module {index} line {line}\n" for line in range(1, 1000)
+        )[:READ_CHARS]
+        repository.add_tool_result(
+            ToolResult(tool_call_id=call.id, name=call.name, content=content)
+        )
+        repository.add_assistant_message(f"Module {index} does a few things.")
+        window.messages_for_request()
+    return window
+
+
+def _measure(label: str, turns: int, blobs: BlobStore | None) -> None:
+    """Report retained heap and request build time for one mode."""
+    tracemalloc.start()
+    window = _build(turns, blobs)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    window.messages_for_request()
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:>9}: {retained / 2**20:7.1f} MiB retained, "
+        f"request built in {elapsed * 1000:6.1f}ms"
+    )
+
+
+def main() -> None:
+    """Compare in-memory and spilled contents."""
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    _measure("in memory", turns, None)
+    with tempfile.TemporaryDirectory() as tmp:
+        blobs = BlobStore(tmp, min_chars=DEFAULT_MIN_CHARS)
+        _measure("spilled", turns, blobs)
+        print(f"blob file: {blobs.size / 2**20:.1f} MiB")
+        blobs.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark: per-round API message cost as a conversation grows.
+
+Grows a synthetic tool-heavy conversation to 10k messages and times one
+``get_messages_for_api()`` per round, against rebuilding every dict with
+``Message.to_dict()`` as before.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_message_serialization [message_count]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from src.models.message import Message
+from src.models.tool import ToolCall
+from src.models.tool import ToolResult
+from src.services.message_repository import MessageRepository
+
+REPORT_EVERY = 1000
+ROUNDS_PER_SAMPLE = 20
+
+
+def _add_round(repository: MessageRepository, index: int) -> None:
+    """Add one user turn: a request, three tool calls and their results."""
+    repository.add_user_message(f"Look at module {index} and explain it.")
+    calls = [
+        ToolCall(
+            id=f"call_{index}_{n}",
+            name="read_file",
+            arguments=f'{{"path": "/repo/src/module_{index}_{n}.py"}}',
+        )
+        for n in range(3)
+    ]
+    repository.add_assistant_tool_calls(calls)
+    for call in calls:
+        content = "\n".join(f"{line}: code line {line}" for line in range(1, 40))
+        repository.add_tool_result(
+            ToolResult(tool_call_id=call.id, name=call.name, content=content)
+        )
+    repository.add_assistant_message(f"Module {index} defines a few helpers.")
+
+
+def _per_round_us(action: object) -> float:
+    """Average microseconds of a zero-argument callable."""
+    started = time.perf_counter()
+    for _ in range(ROUNDS_PER_SAMPLE):
+        action()  # type: ignore[operator]
+    return (time.perf_counter() - started) / ROUNDS_PER_SAMPLE * 1e6
+
+
+def main() -> None:
+    """Report per-round cost at every thousand messages."""
+    target = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    repository = MessageRepository("You are a coding agent.")
+
+    print(f"{'messages':>8} {'rebuilt':>12} {'cached':>12}")
+    next_report = REPORT_EVERY
+    index = 0
+    while len(repository.get_all_messages()) < target:
+        _add_round(repository, index)
+        index += 1
+        count = len(repository.get_all_messages())
+        if count >= next_report:
+            messages = repository.get_all_messages()
+
+            def rebuild(messages: list[Message] = messages) -> object:
+                return [message.to_dict() for message in messages]
+
+            rebuilt = _per_round_us(rebuild)
+            cached = _per_round_us(repository.get_messages_for_api)
+            print(f"{count:>8} {rebuilt:10.1f}us {cached:10.1f}us")
+            next_report += REPORT_EVERY
+
+
+if __name__ == "__main__":
+    main()
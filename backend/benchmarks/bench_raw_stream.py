@@ -0,0 +1,202 @@
+"""Benchmark: consuming a streamed completion, SDK chunks vs. raw parser.
+
+Streams responses through ``ChatApiService`` and
+``StreamResponseProcessor``, once via the SDK's stream and chunk models and
+once with ``HttpConfig.raw_stream``. Bodies are served in network-sized
+pieces from an in-memory transport, so only client-side parsing and
+processing is measured.
+
+With a cassette (recorded with ``main.py --record``), its streamed
+responses are used. No recorded traffic ships with the repository, so
+without one a synthetic stream shaped like a real one is used: reasoning,
+content, then three tool calls with chunked arguments.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_raw_stream [repeats] [cassette]
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import sys
+import time
+from collections.abc import Iterator
+from http import HTTPStatus
+
+import httpx
+
+from src.models.config import ChatConfig
+from src.models.config import HttpConfig
+from src.models.tool import StreamResult
+from src.processors.stream_response_processor import StreamResponseProcessor
+from src.services.cassette import load_cassette
+from src.services.chat_api_service import ChatApiService
+from src.services.message_repository import MessageRepository
+from src.ui.console_output import ConsoleOutput
+from src.ui.loading_spinner import LoadingSpinner
+
+REASONING_CHUNKS = 400
+CONTENT_CHUNKS = 600
+TOOL_CALLS = 3
+ARGUMENT_CHUNKS = 20
+# Bytes per read, roughly one TLS record
+READ_SIZE = 1400
+
+
+class _NullOutput(ConsoleOutput):
+    """Output handler that discards what the processor displays."""
+
+    def display_reasoning(self, content: str, is_first: bool) -> None:
+        pass
+
+    def display_content(
+        self, content: str, is_first: bool, has_reasoning: bool
+    ) -> None:
+        pass
+
+    def newline(self) -> None:
+        pass
+
+    def display_tool_call_start(self) -> None:
+        pass
+
+    def display_tool_call_name(self, name: str) -> None:
+        pass
+
+    def display_tool_call(self, name: str, arguments: str) -> None:
+        pass
+
+
+class _NullSpinner(LoadingSpinner):
+    """Spinner that does not clear the terminal line."""
+
+    def stop(self) -> None:
+        pass
+
+
+def _chunk(delta: dict[str, object], **extra: object) -> dict[str, object]:
+    """A chunk as the API sends it."""
+    return {
+        "id": "20260101120000abcdef",
+        "created": 1767268800,
+        "model": "glm-4.7",
+        "choices": [{"index": 0, "delta": {"role": "assistant", **delta}}],
+        **extra,
+    }
+
+
+def synthetic_stream() -> bytes:
+    """Build a response body shaped like a recorded one."""
+    chunks = [_chunk({"reasoning_content": " step"}) for _ in range(REASONING_CHUNKS)]
+    chunks += [_chunk({"content": " word"}) for _ in range(CONTENT_CHUNKS)]
+    for index in range(TOOL_CALLS):
+        chunks.append(
+            _chunk(
+                {
+                    "tool_calls": [
+                        {
+                            "index": index,
+                            "id": f"call_{index}",
+                            "type": "function",
+                            "function": {"name": "read_file", "arguments": ""},
+                        }
+                    ]
+                }
+            )
+        )
+        chunks += [
+            _chunk(
+                {"tool_calls": [{"index": index, "function": {"arguments": "/src"}}]}
+            )
+            for _ in range(ARGUMENT_CHUNKS)
+        ]
+    chunks.append(
+        _chunk(
+            {},
+            usage={"prompt_tokens": 5000, "completion_tokens": 1100},
+        )
+    )
+    events = [f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n" for chunk in chunks]
+    return "".join([*events, "data: [DONE]\n\n"]).encode()
+
+
+def recorded_streams(path: str) -> list[bytes]:
+    """Bodies of the successful streamed responses in a cassette."""
+    return [
+        interaction.body
+        for interaction in load_cassette(path)
+        if interaction.is_stream and interaction.status == HTTPStatus.OK
+    ]
+
+
+def _service(bodies: list[bytes], raw_stream: bool) -> ChatApiService:
+    """A service that answers requests with ``bodies`` in turn."""
+    requests = itertools.count()
+
+    def pieces(body: bytes) -> Iterator[bytes]:
+        for start in range(0, len(body), READ_SIZE):
+            yield body[start : start + READ_SIZE]
+
+    def handler(request: httpx.Request) -> httpx.Response:  # noqa: ARG001
+        body = bodies[next(requests) % len(bodies)]
+        return httpx.Response(
+            200, headers={"Content-Type": "text/event-stream"}, content=pieces(body)
+        )
+
+    config = ChatConfig(
+        api_key="bench-key",
+        base_url="https://bench.invalid/v4",
+        model="glm-4.7",
+        system_prompt="Benchmark",
+        http=HttpConfig(warm_up=False, raw_stream=raw_stream),
+    )
+    return ChatApiService(config, httpx.MockTransport(handler))
+
+
+def _run(service: ChatApiService, streams: int) -> tuple[float, StreamResult]:
+    """Stream and process responses; return seconds per stream."""
+    processor = StreamResponseProcessor(
+        MessageRepository("Benchmark"), _NullOutput(), _NullSpinner()
+    )
+    messages: list[dict[str, object]] = [{"role": "user", "content": "Hi"}]
+    start = time.perf_counter()
+    for _ in range(streams):
+        with service.streaming_completion(messages) as response:
+            result = processor.process(response)
+    return (time.perf_counter() - start) / streams, result
+
+
+def main() -> None:
+    """Compare the SDK stream with the raw event parser."""
+    args = sys.argv[1:]
+    repeats = int(args[0]) if args else 50
+    bodies = recorded_streams(args[1]) if len(args) > 1 else [synthetic_stream()]
+    if not bodies:
+        print("cassette has no streamed responses", file=sys.stderr)
+        sys.exit(1)
+    size = sum(len(body) for body in bodies) / len(bodies)
+    events = sum(body.count(b"\n\ndata:") for body in bodies) / len(bodies)
+
+    print(f"streams: {len(bodies)}, per stream: {events:.0f} events, ", end="")
+    print(f"{size / 1024:.0f} KiB")
+    print(f"{'path':<6} {'per stream':>11} {'per event':>10}")
+    timings = {}
+    results = []
+    for label, raw_stream in (("sdk", False), ("raw", True)):
+        service = _service(bodies, raw_stream)
+        _run(service, len(bodies))
+        seconds, result = _run(service, repeats * len(bodies))
+        service.close()
+        timings[label] = seconds
+        results.append(result)
+        print(f"{label:<6} {seconds * 1e3:9.2f}ms {seconds / events * 1e6:8.2f}us")
+    print(f"speedup: {timings['sdk'] / timings['raw']:.2f}x")
+    if results[0] != results[1]:
+        print("results differ between paths", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark: processing recorded chat completion streams.
+
+Replays the streamed responses of a cassette (recorded with
+``main.py --record``) through ``ChatApiService`` and
+``StreamResponseProcessor`` with no delays, so only client-side parsing
+and processing of real traffic is measured. Profile it with
+``python -m cProfile -s cumtime -m benchmarks.bench_replay ...``; for the
+whole orchestrator loop, run ``main.py --replay CASSETTE --replay-speed 0``
+with the inputs of the recording.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_replay CASSETTE [repeats]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from http import HTTPStatus
+
+from benchmarks.bench_raw_stream import _NullOutput
+from benchmarks.bench_raw_stream import _NullSpinner
+from src.models.config import ChatConfig
+from src.models.config import HttpConfig
+from src.processors.stream_response_processor import StreamResponseProcessor
+from src.services.cassette import Interaction
+from src.services.cassette import ReplayTransport
+from src.services.cassette import load_cassette
+from src.services.chat_api_service import ChatApiService
+from src.services.message_repository import MessageRepository
+
+
+def _run(streams: list[Interaction], raw_stream: bool, repeats: int) -> float:
+    """Replay and process every stream; return seconds per pass."""
+    config = ChatConfig(
+        api_key="bench-key",
+        base_url="https://bench.invalid/v4",
+        model="glm-4.7",
+        system_prompt="Benchmark",
+        http=HttpConfig(warm_up=False, raw_stream=raw_stream),
+    )
+    processor = StreamResponseProcessor(
+        MessageRepository("Benchmark"), _NullOutput(), _NullSpinner()
+    )
+    messages: list[dict[str, object]] = [{"role": "user", "content": "Hi"}]
+
+    elapsed = 0.0
+    for _ in range(repeats):
+        service = ChatApiService(config, ReplayTransport(streams, speed=0))
+        start = time.perf_counter()
+        for _ in streams:
+            with service.streaming_completion(messages) as response:
+                processor.process(response)
+        elapsed += time.perf_counter() - start
+        service.close()
+    return elapsed / repeats
+
+
+def main() -> None:
+    """Replay a cassette through both stream paths."""
+    args = sys.argv[1:]
+    if not args:
+        print(__doc__, file=sys.stderr)
+        sys.exit(2)
+    path, *rest = args
+    repeats = int(rest[0]) if rest else 20
+    streams = [
+        interaction
+        for interaction in load_cassette(path)
+        if interaction.is_stream and interaction.status == HTTPStatus.OK
+    ]
+    events = sum(len(interaction.events) for interaction in streams)
+    if not events:
+        print("cassette has no streamed responses", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"streams: {len(streams)}, events: {events}")
+    print(f"{'path':<6} {'per pass':>11} {'per event':>10}")
+    for label, raw_stream in (("sdk", False), ("raw", True)):
+        _run(streams, raw_stream, 1)
+        seconds = _run(streams, raw_stream, repeats)
+        print(f"{label:<6} {seconds * 1e3:9.2f}ms {seconds / events * 1e6:8.2f}us")
+
+
+if __name__ == "__main__":
+    main()
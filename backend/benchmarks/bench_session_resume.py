@@ -0,0 +1,88 @@
+"""Benchmark: resuming a stored conversation.
+
+Stores a synthetic tool-heavy conversation, then times
+``MessageRepository.resume`` (system prompt plus the tail that fits the
+default context budget) against reading and deserializing every message.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_session_resume [message_count]
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.models.config import ContextConfig
+from src.models.tool import ToolCall
+from src.models.tool import ToolResult
+from src.services.message_repository import MessageRepository
+from src.services.session_store import SessionStore
+
+RUNS = 5
+
+
+def _add_round(repository: MessageRepository, index: int) -> None:
+    """Add one user turn: a request, three tool calls and their results."""
+    repository.add_user_message(f"Look at module {index} and explain it.")
+    calls = [
+        ToolCall(
+            id=f"call_{index}_{n}",
+            name="read_file",
+            arguments=f'{{"path": "/repo/src/module_{index}_{n}.py"}}',
+        )
+        for n in range(3)
+    ]
+    repository.add_assistant_tool_calls(calls)
+    for call in calls:
+        content = "\n".join(f"{line}: code line {line}" for line in range(1, 40))
+        repository.add_tool_result(
+            ToolResult(tool_call_id=call.id, name=call.name, content=content)
+        )
+    repository.add_assistant_message(f"Module {index} defines a few helpers.")
+
+
+def _best_ms(store: SessionStore, session_id: str, max_tokens: int) -> float:
+    """Best of RUNS resume times in milliseconds."""
+    best = float("inf")
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        MessageRepository.resume(store.open(session_id), max_tokens)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    """Report resume time for a tail and for the whole conversation."""
+    target = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SessionStore(Path(tmp) / "sessions.sqlite3")
+        session = store.create()
+        repository = MessageRepository("You are a coding agent.", session)
+
+        started = time.perf_counter()
+        index = 0
+        while len(repository) < target:
+            _add_round(repository, index)
+            index += 1
+        elapsed = time.perf_counter() - started
+        print(f"stored {len(session)} messages in {elapsed:.2f}s")
+
+        budget = ContextConfig().max_tokens
+        tail = MessageRepository.resume(store.open(session.id), budget)
+        print(
+            f"tail resume: {len(tail):>6} messages "
+            f"{_best_ms(store, session.id, budget):8.1f}ms"
+        )
+        print(
+            f"full resume: {len(session):>6} messages "
+            f"{_best_ms(store, session.id, sys.maxsize):8.1f}ms"
+        )
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
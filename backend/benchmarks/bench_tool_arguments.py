@@ -0,0 +1,54 @@
+"""Benchmark: tool argument parsing, two-pass dict vs. single-pass JSON.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_tool_arguments [iterations]
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import timeit
+
+from src.tools import ReadFileTool
+
+# Argument strings as models send them: small objects, absolute paths,
+# optional ranges, occasionally long values.
+PAYLOADS = {
+    "path only": '{"path": "/home/user/project/src/services/tool_executor.py"}',
+    "path + range": (
+        '{"path": "/home/user/project/src/orchestrators/chat_orchestrator.py",'
+        ' "start_line": 120, "end_line": 180}'
+    ),
+    "coerced ints": (
+        '{"path": "/srv/app/main.py", "start_line": "10", "end_line": "40"}'
+    ),
+    "long path": json.dumps({"path": "/" + "/".join(["nested"] * 60) + "/file.py"}),
+}
+
+
+def main() -> None:
+    """Compare json.loads + model_validate with model_validate_json."""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    tool = ReadFileTool()
+
+    print(f"iterations: {iterations}")
+    print(f"{'payload':<14} {'two-pass':>10} {'one-pass':>10} {'speedup':>8}")
+    for label, payload in PAYLOADS.items():
+
+        def two_pass_parse(p: str = payload) -> object:
+            return tool.parse_arguments(json.loads(p))
+
+        def one_pass_parse(p: str = payload) -> object:
+            return tool.parse_json_arguments(p)
+
+        two_pass = timeit.timeit(two_pass_parse, number=iterations)
+        one_pass = timeit.timeit(one_pass_parse, number=iterations)
+        two_us = two_pass / iterations * 1e6
+        one_us = one_pass / iterations * 1e6
+        print(f"{label:<14} {two_us:8.2f}us {one_us:8.2f}us {two_us / one_us:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
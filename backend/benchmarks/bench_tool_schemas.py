@@ -0,0 +1,82 @@
+"""Benchmark: per-request tool schema cost, rebuilt vs. precomputed.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_tool_schemas [tool_count]
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import timeit
+
+from pydantic import BaseModel
+from pydantic import Field
+from pydantic import create_model
+
+from src.tools import AnyTool
+from src.tools import BaseTool
+from src.tools import ToolRegistry
+
+REQUESTS = 200
+
+
+class _SyntheticTool(BaseTool[BaseModel]):
+    """Tool with a generated multi-field argument model."""
+
+    def __init__(self, index: int) -> None:
+        self._name = f"tool_{index}"
+        fields: dict[str, object] = {
+            "path": (str, Field(description="Absolute path to operate on.")),
+            "start_line": (int, Field(default=1, ge=1, description="First line.")),
+            "end_line": (int | None, Field(default=None, description="Last line.")),
+            "pattern": (str, Field(default="", description="Optional pattern.")),
+        }
+        self._args_model: type[BaseModel] = create_model(  # type: ignore[call-overload]
+            f"Args{index}", **fields
+        )
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return f"Synthetic tool number {self._name}."
+
+    @property
+    def args_model(self) -> type[BaseModel]:
+        return self._args_model
+
+    def execute(self, args: BaseModel) -> str:
+        return args.model_dump_json()
+
+
+def _per_request_us(stmt: object) -> float:
+    """Average microseconds per call of a zero-argument callable."""
+    seconds = timeit.timeit(stmt, number=REQUESTS)  # type: ignore[arg-type]
+    return seconds / REQUESTS * 1e6
+
+
+def main() -> None:
+    """Compare rebuilding schemas per request with the registry."""
+    tool_count = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    tools: list[AnyTool] = [_SyntheticTool(i) for i in range(tool_count)]
+    registry = ToolRegistry(tools)
+
+    rebuilt = _per_request_us(lambda: [tool.schema for tool in tools])
+    cached = _per_request_us(registry.schemas)
+    rebuilt_json = _per_request_us(lambda: json.dumps([t.schema for t in tools]))
+    cached_json = _per_request_us(registry.schemas_json)
+
+    print(f"tools: {tool_count}, requests: {REQUESTS}")
+    print(f"schemas rebuilt per request:      {rebuilt:10.1f} us")
+    print(f"schemas from registry:            {cached:10.1f} us")
+    print(f"rebuilt + json.dumps per request: {rebuilt_json:10.1f} us")
+    print(f"pre-serialized from registry:     {cached_json:10.1f} us")
+    print(f"saved per request:                {rebuilt - cached:10.1f} us")
+
+
+if __name__ == "__main__":
+    main()
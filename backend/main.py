@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
+import argparse
+import asyncio
 import sys
 
 from colorama import init
 
 from src.config.config_service import ConfigService
+from src.config.paths import default_cache_dir
+from src.models.config import CassetteMode
+from src.models.config import HttpConfig
+from src.models.config import SessionConfig
+from src.orchestrators.async_chat_orchestrator import AsyncChatOrchestrator
 from src.orchestrators.chat_orchestrator import ChatOrchestrator
+from src.services.blob_store import DEFAULT_MIN_CHARS
 from pathlib import Path
 
 from src.tracing import SSEServer
@@ -16,8 +24,86 @@ from src.tracing import TracingConfig
 init(autoreset=True)
 
 
+def _parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Personal coding agent")
+    parser.add_argument(
+        "--resume",
+        nargs="?",
+        const="latest",
+        metavar="SESSION_ID",
+        help="continue a saved session (default: the most recent one)",
+    )
+    parser.add_argument(
+        "--low-memory",
+        action="store_true",
+        help=(
+            f"keep message contents of {DEFAULT_MIN_CHARS}+ characters on disk "
+            "instead of in memory"
+        ),
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="run the asyncio pipeline",
+    )
+    parser.add_argument(
+        "--base-url",
+        help="chat API to use, e.g. a local mock (python -m src.mock_llm)",
+    )
+    parser.add_argument(
+        "--raw-stream",
+        action="store_true",
+        help="parse streamed responses directly instead of through the SDK",
+    )
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help="send a second request when a stream is slow to start (billed twice)",
+    )
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument(
+        "--record",
+        metavar="CASSETTE",
+        help="record chat completions with their timing to a cassette file",
+    )
+    cassette.add_argument(
+        "--replay",
+        metavar="CASSETTE",
+        help="answer chat completions from a recorded cassette, in order",
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=1.0,
+        metavar="FACTOR",
+        help="replay speed relative to the recording (0: no delays)",
+    )
+    args = parser.parse_args()
+    if args.hedge and args.replay:
+        # A hedged request would use up the next recorded response
+        parser.error("--hedge cannot be used with --replay")
+    return args
+
+
+def _http_config(args: argparse.Namespace) -> HttpConfig:
+    """HTTP settings from command line arguments."""
+    if args.replay:
+        return HttpConfig(
+            raw_stream=args.raw_stream,
+            cassette=args.replay,
+            cassette_mode=CassetteMode.REPLAY,
+            replay_speed=args.replay_speed,
+        )
+    return HttpConfig(
+        raw_stream=args.raw_stream, hedge=args.hedge, cassette=args.record
+    )
+
+
 def main() -> None:
     """Main application entry point."""
+    args = _parse_args()
     sse_server: SSEServer | None = None
 
     try:
@@ -28,14 +114,29 @@ def main() -> None:
         sse_server.start()
         print(f"Trace viewer: {sse_server.url}")
 
-        config = config_service.create_chat_config(tracing=tracing_config)
+        session_config = SessionConfig(
+            db_path=str(default_cache_dir() / "sessions.sqlite3"),
+            resume=args.resume,
+            spill_chars=DEFAULT_MIN_CHARS if args.low_memory else 0,
+        )
+        config = config_service.create_chat_config(
+            base_url=args.base_url,
+            tracing=tracing_config,
+            session=session_config,
+            http=_http_config(args),
+        )
 
-        orchestrator = ChatOrchestrator(config)
-        orchestrator.run()
+        if args.use_async:
+            asyncio.run(AsyncChatOrchestrator(config).run())
+        else:
+            ChatOrchestrator(config).run()
 
     except ValueError as e:
         print(f"Configuration error: {e}", file=sys.stderr)
         sys.exit(1)
+    except KeyError as e:
+        print(f"Configuration error: {e.args[0]}", file=sys.stderr)
+        sys.exit(1)
     except Exception as e:
         print(f"Unexpected error: {e}", file=sys.stderr)
         sys.exit(1)
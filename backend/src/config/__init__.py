@@ -3,5 +3,6 @@
 from __future__ import annotations
 
 from .config_service import ConfigService
+from .paths import default_cache_dir
 
-__all__ = ["ConfigService"]
+__all__ = ["ConfigService", "default_cache_dir"]
@@ -7,6 +7,8 @@ import os
 from dotenv import load_dotenv
 
 from ..models.config import ChatConfig
+from ..models.config import HttpConfig
+from ..models.config import SessionConfig
 from ..tracing import TracingConfig
 
 
@@ -25,12 +27,15 @@ class ConfigService:
             raise ValueError(msg)
         return api_key
 
-    def create_chat_config(
+    def create_chat_config(  # noqa: PLR0913
         self,
         base_url: str | None = None,
         model: str | None = None,
         system_prompt: str | None = None,
         tracing: TracingConfig | None = None,
+        *,
+        session: SessionConfig | None = None,
+        http: HttpConfig | None = None,
     ) -> ChatConfig:
         """Create chat configuration from environment and parameters."""
         api_key = self.get_api_key()
@@ -40,4 +45,6 @@ class ConfigService:
             model=model or "glm-4.7",
             system_prompt=system_prompt,
             tracing=tracing,
+            session=session,
+            http=http,
         )
@@ -0,0 +1,18 @@
+"""Locations for on-disk caches."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+CACHE_DIR_ENV = "AGENT_CACHE_DIR"
+
+
+def default_cache_dir() -> Path:
+    """Directory for persistent caches, next to the default trace database.
+
+    Defaults to ``.agent_cache`` in the working directory; set
+    ``AGENT_CACHE_DIR`` to move it.
+    """
+    override = os.getenv(CACHE_DIR_ENV)
+    return Path(override) if override else Path.cwd() / ".agent_cache"
@@ -0,0 +1,20 @@
+"""Local OpenAI-compatible mock of the chat API.
+
+Run with ``python -m src.mock_llm`` and point ``--base-url`` at it.
+"""
+
+from __future__ import annotations
+
+from .script import Faults
+from .script import MockResponse
+from .script import MockScript
+from .script import MockToolCall
+from .server import MockLLMServer
+
+__all__ = [
+    "Faults",
+    "MockLLMServer",
+    "MockResponse",
+    "MockScript",
+    "MockToolCall",
+]
@@ -0,0 +1,86 @@
+"""Run the mock LLM server.
+
+From the backend directory:
+
+    python -m src.mock_llm [--script script.json] [--ttft 0.3] ...
+    python main.py --base-url http://127.0.0.1:8766/v1
+
+Options given on the command line override those of the script file.
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import replace
+from pathlib import Path
+
+from .script import MockScript
+from .server import DEFAULT_PORT
+from .server import MockLLMServer
+
+
+def _parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.mock_llm",
+        description="Local OpenAI-compatible chat completions server",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--script", type=Path, help="JSON file with the fields of MockScript"
+    )
+    timing = parser.add_argument_group("timing")
+    timing.add_argument("--ttft", type=float, help="seconds before the first chunk")
+    timing.add_argument("--token-delay", type=float, help="seconds between chunks")
+    timing.add_argument("--chunk-chars", type=int, help="characters per chunk")
+    faults = parser.add_argument_group("fault injection (probabilities)")
+    faults.add_argument("--error-rate", type=float, help="reject with an error status")
+    faults.add_argument("--stall-rate", type=float, help="stall mid-stream")
+    faults.add_argument("--disconnect-rate", type=float, help="drop mid-stream")
+    faults.add_argument(
+        "--error-event-rate", type=float, help="send an error event mid-stream"
+    )
+    faults.add_argument("--seed", type=int, help="seed for fault injection")
+    return parser.parse_args()
+
+
+def _script(args: argparse.Namespace) -> MockScript:
+    """Build the script from the file and command line options."""
+    script = MockScript.load(args.script) if args.script else MockScript()
+    timing = {
+        "ttft": args.ttft,
+        "token_delay": args.token_delay,
+        "chunk_chars": args.chunk_chars,
+    }
+    faults = {
+        "error_rate": args.error_rate,
+        "stall_rate": args.stall_rate,
+        "disconnect_rate": args.disconnect_rate,
+        "error_event_rate": args.error_event_rate,
+        "seed": args.seed,
+    }
+    return replace(
+        script,
+        faults=replace(
+            script.faults, **{k: v for k, v in faults.items() if v is not None}
+        ),
+        **{k: v for k, v in timing.items() if v is not None},
+    )
+
+
+def main() -> None:
+    """Serve until interrupted."""
+    args = _parse_args()
+    server = MockLLMServer(_script(args), host=args.host, port=args.port)
+    print(f"Mock LLM server: {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""Scripted replies of the mock LLM server."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
+from pathlib import Path
+
+from pydantic import TypeAdapter
+
+# Characters per token, for the usage the server reports
+CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class MockToolCall:
+    """A tool call the server makes."""
+
+    name: str
+    # JSON arguments, streamed in pieces of chunk_chars
+    arguments: str = "{}"
+
+
+@dataclass
+class MockResponse:
+    """One scripted reply."""
+
+    reasoning: str = ""
+    content: str = ""
+    tool_calls: list[MockToolCall] = field(default_factory=list)
+
+
+@dataclass
+class Faults:
+    """Failures injected into requests, each with its own probability."""
+
+    # Reject the request with error_status before streaming
+    error_rate: float = 0.0
+    error_status: int = 503
+    # Stop sending mid-stream for stall_seconds, then drop the connection
+    stall_rate: float = 0.0
+    stall_seconds: float = 300.0
+    # Drop the connection mid-stream
+    disconnect_rate: float = 0.0
+    # Send an error event mid-stream
+    error_event_rate: float = 0.0
+    # Seed for the fault dice (None: unseeded); each request rolls its own,
+    # derived from the seed and its arrival number
+    seed: int | None = None
+
+
+def _default_responses() -> list[MockResponse]:
+    """A reply that exercises reasoning and content."""
+    return [
+        MockResponse(
+            reasoning="The user said hello, so I should greet them back.",
+            content="Hello! This reply comes from the mock LLM server.",
+        )
+    ]
+
+
+@dataclass
+class MockScript:
+    """What the mock server replies, and how fast.
+
+    ``responses`` are the steps of one turn: the first answers the user
+    message, the next answers the results of its tool calls, and so on.
+    Steps past the end repeat the last response. A request ending in an
+    assistant message without tool calls continues that partial reply.
+    """
+
+    responses: list[MockResponse] = field(default_factory=_default_responses)
+    # Seconds before the first chunk
+    ttft: float = 0.3
+    # Seconds between chunks
+    token_delay: float = 0.02
+    # Characters of reasoning, content or arguments per chunk
+    chunk_chars: int = 4
+    model: str = "mock-model"
+    faults: Faults = field(default_factory=Faults)
+
+    @classmethod
+    def load(cls, path: Path) -> MockScript:
+        """Load a script from a JSON file with the fields of this class.
+
+        Args:
+            path: Path to the script file
+
+        Returns:
+            The parsed script
+
+        Raises:
+            pydantic.ValidationError: If the file does not match
+        """
+        return TypeAdapter(cls).validate_json(path.read_bytes())
+
+    def response_for(self, messages: list[dict[str, object]]) -> MockResponse:
+        """Return the response for the step of the turn ``messages`` end at.
+
+        Args:
+            messages: Messages of the request
+
+        Returns:
+            The scripted response
+        """
+        prefix = ""
+        last = messages[-1] if messages else {}
+        if last.get("role") == "assistant" and not last.get("tool_calls"):
+            prefix = str(last.get("content") or "")
+            messages = messages[:-1]
+
+        step = 0
+        for message in reversed(messages):
+            if message.get("role") == "user":
+                break
+            if message.get("role") == "assistant":
+                step += 1
+        response = self.responses[min(step, len(self.responses) - 1)]
+
+        if prefix and response.content.startswith(prefix):
+            return replace(
+                response, reasoning="", content=response.content[len(prefix) :]
+            )
+        return response
+
+
+def _pieces(text: str, size: int) -> Iterator[str]:
+    """Split ``text`` into pieces of ``size`` characters."""
+    for start in range(0, len(text), size):
+        yield text[start : start + size]
+
+
+def _usage(messages: list[dict[str, object]], response: MockResponse) -> dict[str, int]:
+    """Approximate token usage of a request and its response."""
+    prompt = sum(len(str(message.get("content") or "")) for message in messages)
+    completion = len(response.reasoning) + len(response.content)
+    completion += sum(len(call.arguments) for call in response.tool_calls)
+    prompt_tokens = prompt // CHARS_PER_TOKEN
+    completion_tokens = completion // CHARS_PER_TOKEN
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def _finish_reason(response: MockResponse) -> str:
+    """The finish reason of a response."""
+    return "tool_calls" if response.tool_calls else "stop"
+
+
+def stream_chunks(
+    response: MockResponse,
+    script: MockScript,
+    messages: list[dict[str, object]],
+    completion_id: str,
+) -> Iterator[dict[str, object]]:
+    """Build the streamed chunks of a response.
+
+    Args:
+        response: Response to stream
+        script: Script (chunk size and model)
+        messages: Messages of the request, for usage
+        completion_id: ID of the completion; tool call IDs derive from it
+
+    Yields:
+        Chunk payloads, the last with finish reason and usage
+    """
+    created = int(time.time())
+
+    def chunk(delta: dict[str, object], **extra: object) -> dict[str, object]:
+        return {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": script.model,
+            "choices": [{"index": 0, "delta": delta, **extra}],
+        }
+
+    size = max(1, script.chunk_chars)
+    role: dict[str, object] = {"role": "assistant"}
+    for piece in _pieces(response.reasoning, size):
+        yield chunk({**role, "reasoning_content": piece})
+        role = {}
+    for piece in _pieces(response.content, size):
+        yield chunk({**role, "content": piece})
+        role = {}
+    for index, call in enumerate(response.tool_calls):
+        start = {
+            "index": index,
+            "id": f"call_{completion_id}_{index}",
+            "type": "function",
+            "function": {"name": call.name, "arguments": ""},
+        }
+        yield chunk({**role, "tool_calls": [start]})
+        role = {}
+        for piece in _pieces(call.arguments, size):
+            arguments = {"index": index, "function": {"arguments": piece}}
+            yield chunk({"tool_calls": [arguments]})
+
+    last = chunk(role, finish_reason=_finish_reason(response))
+    last["usage"] = _usage(messages, response)
+    yield last
+
+
+def completion(
+    response: MockResponse,
+    script: MockScript,
+    messages: list[dict[str, object]],
+    completion_id: str,
+) -> dict[str, object]:
+    """Build the non-streamed completion of a response.
+
+    Args:
+        response: Response to return
+        script: Script (model)
+        messages: Messages of the request, for usage
+        completion_id: ID of the completion; tool call IDs derive from it
+
+    Returns:
+        Completion payload
+    """
+    message: dict[str, object] = {
+        "role": "assistant",
+        "content": response.content,
+    }
+    if response.reasoning:
+        message["reasoning_content"] = response.reasoning
+    if response.tool_calls:
+        message["tool_calls"] = [
+            {
+                "id": f"call_{completion_id}_{index}",
+                "type": "function",
+                "function": {"name": call.name, "arguments": call.arguments},
+            }
+            for index, call in enumerate(response.tool_calls)
+        ]
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": script.model,
+        "choices": [
+            {
+                "index": 0,
+                "message": message,
+                "finish_reason": _finish_reason(response),
+            }
+        ],
+        "usage": _usage(messages, response),
+    }
@@ -0,0 +1,227 @@
+"""OpenAI-compatible chat completions server with scripted replies."""
+
+from __future__ import annotations
+
+import itertools
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from threading import Lock
+from threading import Thread
+
+from .script import MockScript
+from .script import completion
+from .script import stream_chunks
+
+DEFAULT_PORT = 8766
+
+CHAT_COMPLETIONS_PATH = "/chat/completions"
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    """HTTP server holding the script and the fault dice."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], script: MockScript) -> None:
+        super().__init__(address, MockLLMHandler)
+        self.script = script
+        self.completion_ids = itertools.count(1)
+        self._request_numbers = itertools.count()
+        self._lock = Lock()
+
+    def request_rng(self) -> random.Random:
+        """Fault dice for the next chat completion, in order of arrival.
+
+        Each request gets its own generator, seeded from the script's seed
+        and the request's number, so which request gets which fault does
+        not depend on how handler threads interleave.
+        """
+        with self._lock:
+            number = next(self._request_numbers)
+        seed = self.script.faults.seed
+        if seed is None:
+            return random.Random()  # noqa: S311
+        return random.Random(f"{seed}:{number}")  # noqa: S311
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    """Serves ``POST .../chat/completions``, streamed or not.
+
+    Streams are sent with chunked transfer encoding, so connections stay
+    open for reuse as with the real API.
+    """
+
+    protocol_version = "HTTP/1.1"
+    server: _MockHTTPServer
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Suppress default logging."""
+
+    def do_HEAD(self) -> None:
+        """Answer connection warm-ups."""
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        """Handle GET requests."""
+        if self.path.rstrip("/").endswith("/health"):
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self) -> None:
+        """Handle chat completion requests."""
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        if not self.path.rstrip("/").endswith(CHAT_COMPLETIONS_PATH):
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+        try:
+            request = json.loads(body)
+            messages = list(request["messages"])
+        except (ValueError, KeyError, TypeError):
+            self._send_json(400, {"error": {"message": "Invalid request"}})
+            return
+
+        script = self.server.script
+        faults = script.faults
+        rng = self.server.request_rng()
+        if rng.random() < faults.error_rate:
+            error = {"message": "Injected failure", "code": str(faults.error_status)}
+            self._send_json(faults.error_status, {"error": error})
+            return
+
+        response = script.response_for(messages)
+        completion_id = f"mock{next(self.server.completion_ids)}"
+        time.sleep(script.ttft)
+        if request.get("stream"):
+            payloads = list(stream_chunks(response, script, messages, completion_id))
+            self._stream(payloads, rng)
+        else:
+            self._send_json(200, completion(response, script, messages, completion_id))
+
+    def _stream(self, payloads: list[dict[str, object]], rng: random.Random) -> None:
+        """Send chunks as server-sent events, injecting mid-stream faults."""
+        script = self.server.script
+        fault = self._roll_stream_fault(rng)
+        # Chunk before which a fault strikes, after at least one chunk
+        fault_at = rng.randrange(1, max(2, len(payloads)))
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        try:
+            for index, payload in enumerate(payloads):
+                if fault is not None and index == fault_at:
+                    if fault == "stall":
+                        time.sleep(script.faults.stall_seconds)
+                    if fault in {"stall", "disconnect"}:
+                        self.close_connection = True
+                        return
+                    error = {"message": "Injected stream error", "code": "500"}
+                    self._write_event(json.dumps({"error": error}))
+                    break
+                if index:
+                    time.sleep(script.token_delay)
+                self._write_event(json.dumps(payload))
+            else:
+                self._write_event("[DONE]")
+            self._write(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _roll_stream_fault(self, rng: random.Random) -> str | None:
+        """Pick the mid-stream fault of a request, if any."""
+        faults = self.server.script.faults
+        roll = rng.random()
+        for fault, rate in (
+            ("stall", faults.stall_rate),
+            ("disconnect", faults.disconnect_rate),
+            ("error_event", faults.error_event_rate),
+        ):
+            if roll < rate:
+                return fault
+            roll -= rate
+        return None
+
+    def _write_event(self, data: str) -> None:
+        """Write one ``data:`` event."""
+        self._write(f"data: {data}\n\n".encode())
+
+    def _write(self, data: bytes) -> None:
+        """Write one piece of a chunked body (empty to end it)."""
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _send_json(self, status: int, data: dict[str, object]) -> None:
+        """Send a JSON response."""
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MockLLMServer:
+    """Local stand-in for the chat API, for offline benchmarks and tests.
+
+    Point ``ChatConfig.base_url`` at ``url``; any API key is accepted.
+    """
+
+    def __init__(
+        self,
+        script: MockScript | None = None,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+    ) -> None:
+        """Initialize the server.
+
+        Args:
+            script: What to reply (default: ``MockScript()``)
+            host: Interface to listen on
+            port: Port to listen on (0 for any free port)
+        """
+        self._server = _MockHTTPServer((host, port), script or MockScript())
+        self._thread: Thread | None = None
+
+    def start(self) -> None:
+        """Start serving in a background thread."""
+        self._thread = Thread(
+            target=self._server.serve_forever, name="mock-llm", daemon=True
+        )
+        self._thread.start()
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread until interrupted."""
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+    @property
+    def script(self) -> MockScript:
+        """The script being served; may be changed while running."""
+        return self._server.script
+
+    @property
+    def port(self) -> int:
+        """Get the server port."""
+        return self._server.server_address[1]
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as ``ChatConfig.base_url``."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}/v1"
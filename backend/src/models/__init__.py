@@ -3,6 +3,11 @@
 from __future__ import annotations
 
 from .config import ChatConfig
+from .config import ContextConfig
+from .config import HttpConfig
+from .config import SessionConfig
+from .config import ToolIsolation
+from .config import ToolsConfig
 from .message import Message
 from .message import MessageRole
 from .tool import StreamResult
@@ -11,9 +16,14 @@ from .tool import ToolResult
 
 __all__ = [
     "ChatConfig",
+    "ContextConfig",
+    "HttpConfig",
     "Message",
     "MessageRole",
+    "SessionConfig",
     "StreamResult",
     "ToolCall",
+    "ToolIsolation",
     "ToolResult",
+    "ToolsConfig",
 ]
@@ -4,11 +4,98 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from dataclasses import field
+from enum import Enum
 from pathlib import Path
 
 from ..tracing import TracingConfig
 
 
+class ToolIsolation(Enum):
+    """Where tool code runs."""
+
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+class CassetteMode(Enum):
+    """What is done with ``HttpConfig.cassette``."""
+
+    RECORD = "record"
+    REPLAY = "replay"
+
+
+@dataclass
+class ToolsConfig:
+    """Tool execution settings."""
+
+    max_parallel: int = 8
+    isolation: ToolIsolation = ToolIsolation.THREAD
+    process_workers: int = 2
+    cache_entries: int = 256
+    # Characters of tool output sent to the model per call (0: no limit)
+    max_output_chars: int = 32_000
+
+
+@dataclass
+class ContextConfig:
+    """Context window settings."""
+
+    # Estimated prompt tokens per request before old context is evicted
+    max_tokens: int = 120_000
+    # Most recent user turns that are never evicted
+    keep_recent_turns: int = 2
+    # Estimated prompt tokens at which older turns are summarized (0: never)
+    compact_at_tokens: int = 80_000
+
+
+@dataclass
+class SessionConfig:
+    """Conversation persistence settings."""
+
+    # SQLite database conversations are saved to (None: not saved)
+    db_path: str | None = None
+    # Session ID to continue, or "latest" (None: start a new session)
+    resume: str | None = None
+    # Message contents at least this long are kept in an on-disk blob file
+    # instead of memory (0: keep everything in memory)
+    spill_chars: int = 0
+
+
+@dataclass
+class HttpConfig:
+    """HTTP connection settings for the chat API."""
+
+    max_connections: int = 8
+    # Idle connections kept open for reuse
+    max_keepalive_connections: int = 4
+    # Seconds an idle connection is kept before it is closed
+    keepalive_expiry: float = 120.0
+    # Open a connection while waiting for user input
+    warm_up: bool = True
+    # Stream completions through the built-in event parser instead of the SDK
+    raw_stream: bool = False
+    # Resend requests that fail with a retryable status or connection error
+    max_retries: int = 2
+    # Seconds before the first retry, doubling up to retry_backoff_max
+    retry_backoff: float = 0.5
+    retry_backoff_max: float = 8.0
+    # Send a second request if no chunk arrives within this percentile of
+    # observed times to first chunk, once hedge_min_samples are observed.
+    # Off by default: a hedge is a second, billed completion.
+    hedge: bool = False
+    hedge_percentile: float = 0.95
+    hedge_min_samples: int = 5
+    # Seconds without a chunk before a stream counts as stalled (0: never)
+    stream_idle_timeout: float = 60.0
+    # Continuation requests sent after stalls, per completion
+    max_stall_resumes: int = 2
+    # File chat completions are recorded to or replayed from (None: neither)
+    cassette: str | None = None
+    cassette_mode: CassetteMode = CassetteMode.RECORD
+    # Replay speed relative to the recording (0: no delays)
+    replay_speed: float = 1.0
+
+
 @dataclass
 class ChatConfig:
     """Chat configuration settings."""
@@ -18,15 +105,22 @@ class ChatConfig:
     model: str
     system_prompt: str
     tracing: TracingConfig = field(default_factory=TracingConfig)
+    tools: ToolsConfig = field(default_factory=ToolsConfig)
+    context: ContextConfig = field(default_factory=ContextConfig)
+    session: SessionConfig = field(default_factory=SessionConfig)
+    http: HttpConfig = field(default_factory=HttpConfig)
 
     @classmethod
-    def default(
+    def default(  # noqa: PLR0913
         cls,
         api_key: str,
         base_url: str = "https://api.z.ai/api/coding/paas/v4",
         model: str = "glm-4.7",
         system_prompt: str | None = None,
         tracing: TracingConfig | None = None,
+        *,
+        session: SessionConfig | None = None,
+        http: HttpConfig | None = None,
     ) -> ChatConfig:
         """Create default configuration."""
         cwd = Path.cwd()
@@ -43,4 +137,6 @@ class ChatConfig:
             model=model,
             system_prompt=system_prompt or default_prompt,
             tracing=tracing or TracingConfig(),
+            session=session or SessionConfig(),
+            http=http or HttpConfig(),
         )
@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass
 from dataclasses import field
 from enum import Enum
+from functools import cached_property
 from typing import TYPE_CHECKING
+from typing import cast
+
+from .tool import ToolCall
 
 if TYPE_CHECKING:
-    from .tool import ToolCall
+    from ..services.blob_store import BlobRef
 
 
 class MessageRole(str, Enum):
@@ -22,20 +27,43 @@ class MessageRole(str, Enum):
 
 @dataclass
 class Message:
-    """Represents a chat message."""
+    """Represents a chat message.
+
+    A message whose content was moved to a ``BlobStore`` has ``blob`` set
+    and an empty ``content``. ``to_dict`` reads it back; ``api_dict`` keeps
+    the ``BlobRef`` as content until ``rehydrate`` reads it.
+    """
 
     role: MessageRole
     content: str
     tool_calls: list[ToolCall] = field(default_factory=list)
     tool_call_id: str | None = None
     name: str | None = None
+    blob: BlobRef | None = None
+
+    @property
+    def text(self) -> str:
+        """The content, read from the blob store if it was moved there."""
+        return self.blob.text() if self.blob is not None else self.content
 
     def to_dict(self) -> dict[str, object]:
         """Convert message to dictionary format for API."""
+        return self._as_dict(self.text)
+
+    def to_stored_dict(self) -> dict[str, object]:
+        """Like ``to_dict``, but with a moved content kept as its ``BlobRef``.
+
+        Only for the message repository and session store, which rehydrate
+        it before the dict leaves them.
+        """
+        return self._as_dict(self.blob if self.blob is not None else self.content)
+
+    def _as_dict(self, content: str | BlobRef) -> dict[str, object]:
+        """Build the API dict with the given content."""
         result: dict[str, object] = {"role": self.role.value}
 
-        if self.content:
-            result["content"] = self.content
+        if content:
+            result["content"] = content
 
         if self.tool_calls:
             result["tool_calls"] = [
@@ -58,7 +86,35 @@ class Message:
 
         return result
 
+    @cached_property
+    def api_dict(self) -> dict[str, object]:
+        """Stored representation, built on first access and then reused.
+
+        Messages are not modified once added to a conversation, so the dict
+        is shared by every request that includes the message; do not mutate.
+        A moved content is a ``BlobRef`` (see ``to_stored_dict``).
+        """
+        return self.to_stored_dict()
+
     @classmethod
-    def from_dict(cls, data: dict[str, str]) -> Message:
-        """Create message from dictionary."""
-        return cls(role=MessageRole(data["role"]), content=data["content"])
+    def from_dict(cls, data: Mapping[str, object]) -> Message:
+        """Create message from dictionary (the API format of ``to_dict``)."""
+        tool_calls = []
+        for call in cast("list[dict[str, object]]", data.get("tool_calls") or []):
+            function = cast("dict[str, str]", call["function"])
+            tool_calls.append(
+                ToolCall(
+                    id=str(call["id"]),
+                    name=function["name"],
+                    arguments=function["arguments"],
+                )
+            )
+        tool_call_id = data.get("tool_call_id")
+        name = data.get("name")
+        return cls(
+            role=MessageRole(data["role"]),
+            content=str(data.get("content") or ""),
+            tool_calls=tool_calls,
+            tool_call_id=tool_call_id if isinstance(tool_call_id, str) else None,
+            name=name if isinstance(name, str) else None,
+        )
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from .async_chat_orchestrator import AsyncChatOrchestrator
 from .chat_orchestrator import ChatOrchestrator
 
-__all__ = ["ChatOrchestrator"]
+__all__ = ["AsyncChatOrchestrator", "ChatOrchestrator"]
@@ -0,0 +1,138 @@
+"""Asyncio-native orchestrator for the chat application."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+
+import httpx
+
+from ..models.config import ChatConfig
+from ..models.tool import StreamResult
+from ..services.async_chat_api_service import AsyncChatApiService
+from ..tracing import SpanKind
+from ..tracing import span
+from ..tracing import trace
+from .chat_orchestrator import BaseChatOrchestrator
+
+
+class AsyncChatOrchestrator(BaseChatOrchestrator):
+    """Runs the chat workflow on an asyncio event loop.
+
+    Same components, commands and tracing as ``ChatOrchestrator``: responses
+    stream through ``AsyncChatApiService`` and are consumed with
+    ``async for``, and tools run on worker threads through
+    ``ToolExecutor.aexecute_many``. Spans follow each task through
+    contextvars, so a ``turn`` span and its ``llm`` and ``tool`` spans nest as
+    in the sync loop. Background summaries still use the sync
+    ``ChatApiService`` on their own thread.
+
+    Several orchestrators can share one event loop, each driven through
+    ``process_message``.
+    """
+
+    def __init__(
+        self, config: ChatConfig, transport: httpx.AsyncBaseTransport | None = None
+    ) -> None:
+        """Initialize chat orchestrator with configuration.
+
+        Args:
+            config: Chat configuration
+            transport: HTTP transport to use instead of the network (for tests)
+        """
+        super().__init__(config)
+        self._async_api_service = AsyncChatApiService(config, transport)
+
+    async def run(self) -> None:
+        """Run the main chat loop."""
+        self._display_session()
+        try:
+            with trace("conversation", config=self._config.tracing) as t:
+                self._record_session(t)
+                await self._chat_loop()
+        finally:
+            self._close()
+            await self._async_api_service.aclose()
+
+    async def process_message(self, user_input: str) -> None:
+        """Run one user turn: the reply and any tool calls it makes.
+
+        Args:
+            user_input: User's input message
+        """
+        with span("turn", kind=SpanKind.TURN) as s:
+            self._start_turn(s, user_input)
+            await self._complete_with_tools()
+
+        # Summarize while the user reads the reply and types the next message
+        self._compactor.maybe_start()
+
+    async def _chat_loop(self) -> None:
+        """Read user input and process messages until the user exits."""
+        while True:
+            try:
+                self._async_api_service.warm_up()
+                user_input = await self._read_input()
+
+                if self._should_exit(user_input):
+                    self._output_handler.display_goodbye()
+                    break
+
+                if not user_input:
+                    continue
+
+                if user_input.startswith("/") and self._handle_command(user_input):
+                    continue
+
+                await self.process_message(user_input)
+
+            except (KeyboardInterrupt, asyncio.CancelledError):
+                # asyncio.run turns Ctrl+C into a cancellation of this task
+                self._output_handler.display_goodbye()
+                break
+            except Exception as e:
+                self._output_handler.display_error(str(e))
+
+    def _read_input(self) -> asyncio.Future[str]:
+        """Read user input on a daemon thread, so Ctrl+C does not wait for it."""
+        future: Future[str] = Future()
+
+        def _target() -> None:
+            try:
+                future.set_result(self._output_handler.get_user_input(""))
+            except Exception as e:
+                future.set_exception(e)
+
+        threading.Thread(target=_target, name="input", daemon=True).start()
+        return asyncio.wrap_future(future)
+
+    async def _complete_with_tools(self) -> None:
+        """Run completion loop, handling tool calls until done."""
+        while True:
+            self._spinner.start()
+
+            try:
+                messages = self._context_window.messages_for_request()
+
+                async with self._async_api_service.streaming_completion(
+                    messages
+                ) as response:
+                    result = await self._response_processor.aprocess(response)
+
+                    if result.has_tool_calls:
+                        await self._execute_tool_calls(result)
+
+                if not result.has_tool_calls:
+                    break
+
+            except Exception:
+                self._spinner.stop()
+                raise
+
+    async def _execute_tool_calls(self, result: StreamResult) -> None:
+        """Execute tool calls and add results to message repository."""
+        self._message_repository.add_assistant_tool_calls(result.tool_calls)
+
+        tool_results = await self._tool_executor.aexecute_many(result.tool_calls)
+        self._add_tool_results(result, tool_results)
@@ -4,10 +4,19 @@ from __future__ import annotations
 
 from ..models.config import ChatConfig
 from ..models.tool import StreamResult
+from ..models.tool import ToolResult
 from ..processors.stream_response_processor import StreamResponseProcessor
+from ..services.blob_store import BlobStore
 from ..services.chat_api_service import ChatApiService
+from ..services.compactor import ConversationCompactor
+from ..services.context_window import ContextWindowManager
+from ..services.file_reads import FileReadTracker
 from ..services.message_repository import MessageRepository
+from ..services.session_store import Session
+from ..services.session_store import SessionStore
 from ..services.tool_executor import ToolExecutor
+from ..tracing import Span
+from ..tracing import Trace
 from ..tracing import span
 from ..tracing import trace
 from ..tracing import SpanKind
@@ -15,8 +24,8 @@ from ..ui.console_output import ConsoleOutput
 from ..ui.loading_spinner import LoadingSpinner
 
 
-class ChatOrchestrator:
-    """Orchestrates the chat application workflow."""
+class BaseChatOrchestrator:
+    """Components and commands shared by the sync and async orchestrators."""
 
     def __init__(self, config: ChatConfig) -> None:
         """Initialize chat orchestrator with configuration.
@@ -26,44 +35,200 @@ class ChatOrchestrator:
         """
         self._config = config
         self._api_service = ChatApiService(config)
-        self._message_repository = MessageRepository(config.system_prompt)
+        self._session_store: SessionStore | None = None
+        self._session: Session | None = None
+        spill_chars = config.session.spill_chars
+        self._blobs = BlobStore(min_chars=spill_chars) if spill_chars > 0 else None
+        self._message_repository = self._open_repository()
+        self._context_window = ContextWindowManager(
+            self._message_repository, config.context
+        )
+        self._file_reads = FileReadTracker(
+            self._message_repository, self._context_window
+        )
+        self._compactor = ConversationCompactor(
+            self._message_repository,
+            self._api_service,
+            self._context_window,
+            config.context,
+        )
         self._output_handler = ConsoleOutput()
         self._spinner = LoadingSpinner()
-        self._tool_executor = ToolExecutor(tracing_config=config.tracing)
+        self._tool_executor = ToolExecutor(
+            tracing_config=config.tracing,
+            tools_config=config.tools,
+        )
         self._response_processor = StreamResponseProcessor(
             message_repository=self._message_repository,
             output_handler=self._output_handler,
             spinner=self._spinner,
             tracing_config=config.tracing,
+            tool_executor=self._tool_executor,
         )
 
-    def run(self) -> None:
-        """Run the main chat loop."""
+    def _open_repository(self) -> MessageRepository:
+        """Create the conversation history, saved and resumed per config.session."""
+        session_config = self._config.session
+        if session_config.db_path is None:
+            return MessageRepository(self._config.system_prompt, blobs=self._blobs)
+
+        self._session_store = SessionStore(session_config.db_path)
+        if session_config.resume == "latest":
+            session = self._session_store.latest()
+        elif session_config.resume:
+            session = self._session_store.open(session_config.resume)
+        else:
+            session = None
+
+        if session is None:
+            session = self._session_store.create()
+        self._session = session
+        if not len(session):
+            return MessageRepository(self._config.system_prompt, session, self._blobs)
+        return MessageRepository.resume(
+            session, self._config.context.max_tokens, self._blobs
+        )
+
+    def _should_exit(self, user_input: str) -> bool:
+        """Check if user wants to exit."""
+        return user_input.lower() in ["exit", "quit", "bye"]
+
+    def fork(self, branch_id: str | None = None) -> str:
+        """Branch the conversation at this point and continue on the branch.
+
+        Args:
+            branch_id: ID for the new branch (default: generated)
+
+        Returns:
+            ID of the new branch
+        """
+        branch_id = self._message_repository.fork(branch_id)
+        self._message_repository.switch(branch_id)
+        return branch_id
+
+    def switch(self, branch_id: str) -> None:
+        """Continue the conversation on another branch.
+
+        Args:
+            branch_id: ID of the branch
+        """
+        self._message_repository.switch(branch_id)
+
+    def _handle_command(self, user_input: str) -> bool:
+        """Run a branch command (/fork, /switch, /branches).
+
+        Returns:
+            Whether the input was a command
+        """
+        command, _, argument = user_input.partition(" ")
+        argument = argument.strip()
+        try:
+            if command == "/fork":
+                branch_id = self.fork(argument or None)
+                self._output_handler.display_info(f"Now on new branch {branch_id}")
+            elif command == "/switch" and argument:
+                self.switch(argument)
+                self._output_handler.display_info(f"Now on branch {argument}")
+            elif command == "/branches":
+                active = self._message_repository.branch_id
+                self._output_handler.display_info(
+                    ", ".join(
+                        f"*{branch}" if branch == active else branch
+                        for branch in self._message_repository.branches
+                    )
+                )
+            else:
+                return False
+        except (KeyError, ValueError) as e:
+            self._output_handler.display_error(str(e.args[0]))
+        return True
+
+    def _display_session(self) -> None:
+        """Show the welcome message and the session to resume later."""
         self._output_handler.display_welcome()
+        session = self._session
+        if session is not None:
+            self._output_handler.display_info(
+                f"Session {session.id} (continue with --resume {session.id})"
+            )
 
-        with trace("conversation", config=self._config.tracing):
-            while True:
-                try:
-                    user_input = self._output_handler.get_user_input("")
+    def _record_session(self, t: Trace) -> None:
+        """Record the stored session on the conversation trace."""
+        session = self._session
+        if session is not None:
+            t.set(session_id=session.id, session_messages=len(session))
 
-                    if self._should_exit(user_input):
-                        self._output_handler.display_goodbye()
-                        break
+    def _start_turn(self, s: Span, user_input: str) -> None:
+        """Record the turn and add the user message to the history."""
+        s.set(
+            model=self._config.model,
+            branch_id=self._message_repository.branch_id,
+        )
+        self._compactor.apply()
+        self._message_repository.add_user_message(user_input)
+
+    def _add_tool_results(
+        self, result: StreamResult, tool_results: list[ToolResult]
+    ) -> None:
+        """Show tool results and add them to the history, deduplicated."""
+        for tool_call, result_of_call in zip(
+            result.tool_calls, tool_results, strict=True
+        ):
+            tool_result = self._file_reads.dedupe(tool_call, result_of_call)
+            self._output_handler.display_tool_result(
+                tool_result.content,
+                tool_result.is_error,
+            )
+
+            self._message_repository.add_tool_result(tool_result)
+
+    def _close(self) -> None:
+        """Release workers, connections and stores."""
+        self._tool_executor.shutdown()
+        self._api_service.close()
+        if self._session_store is not None:
+            self._session_store.close()
+        if self._blobs is not None:
+            self._blobs.close()
 
-                    if not user_input:
-                        continue
 
-                    self._process_user_message(user_input)
+class ChatOrchestrator(BaseChatOrchestrator):
+    """Orchestrates the chat application workflow."""
+
+    def run(self) -> None:
+        """Run the main chat loop."""
+        self._display_session()
+        try:
+            with trace("conversation", config=self._config.tracing) as t:
+                self._record_session(t)
+                self._chat_loop()
+        finally:
+            self._close()
+
+    def _chat_loop(self) -> None:
+        """Read user input and process messages until the user exits."""
+        while True:
+            try:
+                self._api_service.warm_up()
+                user_input = self._output_handler.get_user_input("")
 
-                except KeyboardInterrupt:
+                if self._should_exit(user_input):
                     self._output_handler.display_goodbye()
                     break
-                except Exception as e:
-                    self._output_handler.display_error(str(e))
 
-    def _should_exit(self, user_input: str) -> bool:
-        """Check if user wants to exit."""
-        return user_input.lower() in ["exit", "quit", "bye"]
+                if not user_input:
+                    continue
+
+                if user_input.startswith("/") and self._handle_command(user_input):
+                    continue
+
+                self._process_user_message(user_input)
+
+            except KeyboardInterrupt:
+                self._output_handler.display_goodbye()
+                break
+            except Exception as e:
+                self._output_handler.display_error(str(e))
 
     def _process_user_message(self, user_input: str) -> None:
         """Process a user message and get response.
@@ -72,17 +237,19 @@ class ChatOrchestrator:
             user_input: User's input message
         """
         with span("turn", kind=SpanKind.TURN) as s:
-            s.set(model=self._config.model)
-            self._message_repository.add_user_message(user_input)
+            self._start_turn(s, user_input)
             self._complete_with_tools()
 
+        # Summarize while the user reads the reply and types the next message
+        self._compactor.maybe_start()
+
     def _complete_with_tools(self) -> None:
         """Run completion loop, handling tool calls until done."""
         while True:
             self._spinner.start()
 
             try:
-                messages = self._message_repository.get_messages_for_api()
+                messages = self._context_window.messages_for_request()
 
                 with self._api_service.streaming_completion(messages) as response:
                     result = self._response_processor.process(response)
@@ -101,12 +268,5 @@ class ChatOrchestrator:
         """Execute tool calls and add results to message repository."""
         self._message_repository.add_assistant_tool_calls(result.tool_calls)
 
-        for tool_call in result.tool_calls:
-            tool_result = self._tool_executor.execute(tool_call)
-
-            self._output_handler.display_tool_result(
-                tool_result.content,
-                tool_result.is_error,
-            )
-
-            self._message_repository.add_tool_result(tool_result)
+        tool_results = self._tool_executor.execute_many(result.tool_calls)
+        self._add_tool_results(result, tool_results)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import time
+from collections.abc import AsyncIterable
 from collections.abc import Iterable
 from dataclasses import dataclass
 from dataclasses import field
@@ -11,6 +12,11 @@ from typing import TYPE_CHECKING
 from ..models.tool import StreamResult
 from ..models.tool import ToolCall
 from ..services.message_repository import MessageRepository
+from ..services.resumable_stream import ResumableStream
+from ..services.resumable_stream import StreamStalledError
+from ..services.sse_parser import StreamDelta
+from ..services.sse_parser import ToolCallDelta
+from ..services.tool_executor import ToolExecutor
 from ..tracing import TracingConfig
 from ..tracing import get_current_span
 from ..ui.console_output import OutputHandler
@@ -18,7 +24,6 @@ from ..ui.loading_spinner import LoadingSpinner
 
 if TYPE_CHECKING:
     from zai.types.chat.chat_completion_chunk import ChatCompletionChunk
-    from zai.types.chat.chat_completion_chunk import ChoiceDeltaToolCall
 
 
 @dataclass
@@ -31,6 +36,7 @@ class _ProcessingState:
     content_started: bool = False
     full_content: str = ""
     tool_calls: dict[int, _ToolCallBuilder] = field(default_factory=dict)
+    speculated: set[int] = field(default_factory=set)
     chunk_count: int = 0
     first_chunk_time: float | None = None
     start_time: float = field(default_factory=time.perf_counter)
@@ -50,7 +56,12 @@ class _ToolCallBuilder:
 
 
 class StreamResponseProcessor:
-    """Processes streaming responses from the API."""
+    """Processes streaming responses from the API.
+
+    Accepts the SDK's chunk models or the ``StreamDelta`` records of the
+    raw event parser; records are read directly, without attribute lookups
+    on nested models.
+    """
 
     def __init__(
         self,
@@ -58,6 +69,7 @@ class StreamResponseProcessor:
         output_handler: OutputHandler,
         spinner: LoadingSpinner,
         tracing_config: TracingConfig | None = None,
+        tool_executor: ToolExecutor | None = None,
     ) -> None:
         """Initialize stream response processor.
 
@@ -66,37 +78,109 @@ class StreamResponseProcessor:
             output_handler: Handler for console output
             spinner: Loading spinner instance
             tracing_config: Optional tracing configuration
+            tool_executor: Optional executor for speculative tool calls
         """
         self._message_repository = message_repository
         self._output_handler = output_handler
         self._spinner = spinner
         self._tracing_config = tracing_config
+        self._tool_executor = tool_executor
 
-    def process(self, response: Iterable[ChatCompletionChunk]) -> StreamResult:
+    def process(
+        self, response: Iterable[ChatCompletionChunk | StreamDelta]
+    ) -> StreamResult:
         """Process streaming response and update messages.
 
+        A ``ResumableStream`` that stalls is resumed after the content
+        received so far, as often as it allows.
+
         Args:
             response: Iterator over response chunks
 
         Returns:
             StreamResult with content and any tool calls
         """
-        state = _ProcessingState()
-
+        state = self._begin()
         try:
-            for chunk in response:
-                state.chunk_count += 1
-                if state.first_chunk_time is None:
-                    state.first_chunk_time = time.perf_counter()
-                self._process_chunk(chunk, state)
+            while True:
+                try:
+                    for chunk in response:
+                        self._consume(chunk, state)
+                except StreamStalledError:
+                    if not (
+                        isinstance(response, ResumableStream) and response.can_resume
+                    ):
+                        raise
+                    self._resume(response, state)
+                else:
+                    return self._end(state)
+        except Exception as e:
+            self._fail(e)
+            raise
+
+    async def aprocess(
+        self, response: AsyncIterable[ChatCompletionChunk | StreamDelta]
+    ) -> StreamResult:
+        """Process an async streaming response; see ``process``.
 
-            return self._finalize(state)
+        Args:
+            response: Async iterator over response chunks
 
+        Returns:
+            StreamResult with content and any tool calls
+        """
+        state = self._begin()
+        try:
+            async for chunk in response:
+                self._consume(chunk, state)
+            return self._end(state)
         except Exception as e:
-            self._spinner.stop()
-            self._output_handler.display_error(f"Error processing response: {e}")
+            self._fail(e)
             raise
 
+    def _begin(self) -> _ProcessingState:
+        """Start processing a stream."""
+        if self._tool_executor is not None:
+            self._tool_executor.begin_stream()
+        return _ProcessingState()
+
+    def _consume(
+        self, chunk: ChatCompletionChunk | StreamDelta, state: _ProcessingState
+    ) -> None:
+        """Count a chunk and process it."""
+        state.chunk_count += 1
+        if state.first_chunk_time is None:
+            state.first_chunk_time = time.perf_counter()
+        if isinstance(chunk, StreamDelta):
+            self._process_delta(chunk, state)
+        else:
+            self._process_chunk(chunk, state)
+
+    def _end(self, state: _ProcessingState) -> StreamResult:
+        """Finish a fully consumed stream."""
+        if self._tool_executor is not None:
+            self._tool_executor.end_stream()
+        return self._finalize(state)
+
+    def _resume(
+        self,
+        response: ResumableStream[ChatCompletionChunk | StreamDelta],
+        state: _ProcessingState,
+    ) -> None:
+        """Continue a stalled stream after the content received so far.
+
+        Tool calls cannot be continued mid-way, so any partial ones are
+        dropped and come again in full from the continuation.
+        """
+        state.tool_calls.clear()
+        state.speculated.clear()
+        response.resume(state.full_content)
+
+    def _fail(self, error: Exception) -> None:
+        """Report a stream that failed."""
+        self._spinner.stop()
+        self._output_handler.display_error(f"Error processing response: {error}")
+
     def _process_chunk(
         self,
         chunk: ChatCompletionChunk,
@@ -118,7 +202,29 @@ class StreamResponseProcessor:
             self._handle_content(content, state)
 
         if tool_calls:
-            self._handle_tool_calls(tool_calls, state)
+            for tool_call_delta in tool_calls:
+                function = tool_call_delta.function
+                self._handle_tool_call(
+                    ToolCallDelta(
+                        tool_call_delta.index,
+                        tool_call_delta.id,
+                        function.name if function else None,
+                        function.arguments if function else None,
+                    ),
+                    state,
+                )
+
+    def _process_delta(self, delta: StreamDelta, state: _ProcessingState) -> None:
+        """Process a delta record from the raw event parser."""
+        if delta.reasoning_content:
+            self._handle_reasoning(delta.reasoning_content, state)
+
+        if delta.content:
+            self._handle_content(delta.content, state)
+
+        if delta.tool_calls:
+            for tool_call_delta in delta.tool_calls:
+                self._handle_tool_call(tool_call_delta, state)
 
     def _handle_reasoning(
         self, reasoning_content: str, state: _ProcessingState
@@ -146,31 +252,48 @@ class StreamResponseProcessor:
             state.first_content = False
         state.full_content += content
 
-    def _handle_tool_calls(
-        self,
-        tool_calls: list[ChoiceDeltaToolCall],
-        state: _ProcessingState,
+    def _handle_tool_call(
+        self, tool_call_delta: ToolCallDelta, state: _ProcessingState
     ) -> None:
-        """Handle tool call deltas from chunk."""
-        for tool_call_delta in tool_calls:
-            index = tool_call_delta.index
+        """Handle a tool call delta from chunk."""
+        index = tool_call_delta.index
 
-            if index not in state.tool_calls:
-                self._spinner.stop()
-                state.tool_calls[index] = _ToolCallBuilder()
-                self._output_handler.display_tool_call_start()
+        if index not in state.tool_calls:
+            self._spinner.stop()
+            self._speculate_completed_calls(index, state)
+            state.tool_calls[index] = _ToolCallBuilder()
+            self._output_handler.display_tool_call_start()
+
+        builder = state.tool_calls[index]
+
+        if tool_call_delta.id:
+            builder.id = tool_call_delta.id
+
+        if tool_call_delta.name:
+            builder.name = tool_call_delta.name
+            self._output_handler.display_tool_call_name(builder.name)
 
-            builder = state.tool_calls[index]
+        if tool_call_delta.arguments:
+            builder.arguments += tool_call_delta.arguments
 
-            if tool_call_delta.id:
-                builder.id = tool_call_delta.id
+    def _speculate_completed_calls(
+        self, new_index: int, state: _ProcessingState
+    ) -> None:
+        """Start earlier tool calls now that a later index has appeared.
+
+        Deltas for a call stop once the next call begins, so earlier calls
+        are complete; the executor decides whether each may run early.
+        """
+        if self._tool_executor is None:
+            return
 
-            if tool_call_delta.function:
-                if tool_call_delta.function.name:
-                    builder.name = tool_call_delta.function.name
-                    self._output_handler.display_tool_call_name(builder.name)
-                if tool_call_delta.function.arguments:
-                    builder.arguments += tool_call_delta.function.arguments
+        for index, builder in state.tool_calls.items():
+            if index >= new_index or index in state.speculated:
+                continue
+            if not builder.id or not builder.name:
+                continue
+            state.speculated.add(index)
+            self._tool_executor.speculate(builder.to_tool_call())
 
     def _finalize(self, state: _ProcessingState) -> StreamResult:
         """Finalize processing after all chunks are consumed."""
@@ -209,7 +332,11 @@ class StreamResponseProcessor:
             tool_call_count=len(tool_calls),
         )
 
-        if state.first_chunk_time is not None:
+        # The API service measures from the request when it can
+        if (
+            state.first_chunk_time is not None
+            and current_span.data.get("time_to_first_token_ms") is None
+        ):
             ttft_ms = (state.first_chunk_time - state.start_time) * 1000
             current_span.set(time_to_first_token_ms=ttft_ms)
 
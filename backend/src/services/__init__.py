@@ -2,8 +2,14 @@
 
 from __future__ import annotations
 
+from .async_chat_api_service import AsyncChatApiService
 from .chat_api_service import ChatApiService
 from .message_repository import MessageRepository
 from .tool_executor import ToolExecutor
 
-__all__ = ["ChatApiService", "MessageRepository", "ToolExecutor"]
+__all__ = [
+    "AsyncChatApiService",
+    "ChatApiService",
+    "MessageRepository",
+    "ToolExecutor",
+]
@@ -0,0 +1,123 @@
+"""Async service for streaming chat completions."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections.abc import AsyncGenerator
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import httpx
+
+from ..models.config import ChatConfig
+from ..tools import get_tool_schemas
+from ..tools import get_tool_schemas_json
+from ..tracing import SpanKind
+from ..tracing import record_prompt
+from ..tracing import span
+from .http_pool import REQUEST_TIMEOUT
+from .http_pool import create_async_http_client
+from .sse_parser import StreamDelta
+from .sse_parser import aiter_deltas
+from .sse_parser import completions_url
+from .sse_parser import stream_body
+from .sse_parser import stream_headers
+
+
+class AsyncChatApiService:
+    """Async counterpart of ``ChatApiService``.
+
+    The SDK has no async client, so requests go straight to the
+    OpenAI-compatible chat completions endpoint through a pooled
+    ``httpx.AsyncClient`` and events are parsed into ``StreamDelta``
+    records, as with ``HttpConfig.raw_stream``. Tracing is the same:
+    one ``llm`` span per request, with connection metrics.
+    """
+
+    def __init__(
+        self, config: ChatConfig, transport: httpx.AsyncBaseTransport | None = None
+    ) -> None:
+        """Initialize API service with configuration.
+
+        Args:
+            config: Chat configuration
+            transport: HTTP transport to use instead of the network (for tests)
+        """
+        self._config = config
+        self._http = create_async_http_client(config.http, transport)
+        self._url = completions_url(config.base_url)
+        self._headers = stream_headers(config.api_key)
+        self._warm_up: asyncio.Task[None] | None = None
+
+    @asynccontextmanager
+    async def streaming_completion(
+        self, messages: list[dict[str, object]]
+    ) -> AsyncGenerator[AsyncIterator[StreamDelta], None]:
+        """Async context manager for streaming chat completion.
+
+        Keeps the llm span active while the stream is consumed.
+
+        Args:
+            messages: List of message dictionaries in API format
+
+        Yields:
+            Async iterator over response deltas
+
+        Raises:
+            httpx.HTTPStatusError: If the API rejects the request
+            StreamError: If the API reports an error mid-stream
+        """
+        tool_schemas = get_tool_schemas()
+
+        with span("llm", kind=SpanKind.LLM) as s:
+            s.set(
+                model=self._config.model,
+                message_count=len(messages),
+                tool_count=len(tool_schemas),
+            )
+            if self._config.tracing.include_sensitive_data:
+                record_prompt(s, messages)
+
+            await self._await_warm_up()
+            body = stream_body(self._config.model, messages, get_tool_schemas_json())
+            async with self._http.stream(
+                "POST", self._url, content=body, headers=self._headers
+            ) as response:
+                if response.is_error:
+                    await response.aread()
+                    response.raise_for_status()
+                chunks = aiter_deltas(response.aiter_bytes())
+                try:
+                    yield chunks
+                finally:
+                    await chunks.aclose()
+
+    def warm_up(self) -> None:
+        """Open a connection to the API in a background task.
+
+        Call from the event loop while waiting for user input. Does nothing
+        if disabled in config or if a warm-up is still running.
+        """
+        if not self._config.http.warm_up or (
+            self._warm_up is not None and not self._warm_up.done()
+        ):
+            return
+        self._warm_up = asyncio.get_running_loop().create_task(self._connect())
+
+    async def aclose(self) -> None:
+        """Cancel a running warm-up and close pooled connections."""
+        if self._warm_up is not None:
+            self._warm_up.cancel()
+        await self._http.aclose()
+
+    async def _connect(self) -> None:
+        """Send a HEAD request so a connection is left in the pool."""
+        with contextlib.suppress(httpx.HTTPError):
+            await self._http.head(self._config.base_url)
+
+    async def _await_warm_up(self) -> None:
+        """Let a warm-up in progress finish, so its connection gets reused."""
+        warm_up = self._warm_up
+        if warm_up is not None and not warm_up.done():
+            await asyncio.wait({warm_up}, timeout=REQUEST_TIMEOUT.connect)
@@ -0,0 +1,119 @@
+"""Content-addressed, memory-mapped storage for large message bodies."""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import tempfile
+import threading
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+
+from ..config.paths import default_cache_dir
+
+# Message contents at least this long are spilled by default
+DEFAULT_MIN_CHARS = 4096
+
+
+@dataclass(frozen=True)
+class BlobRef:
+    """Handle to a text stored in a ``BlobStore``."""
+
+    digest: str
+    offset: int
+    size: int
+    chars: int
+    store: BlobStore = field(compare=False, repr=False)
+
+    def text(self) -> str:
+        """Read the text back from the store."""
+        return self.store.read(self)
+
+
+class BlobStore:
+    """Append-only file of UTF-8 texts, deduplicated by SHA-256.
+
+    The file is an unnamed temporary file (removed when closed) and is read
+    through a memory map, so stored texts live in the OS page cache rather
+    than in Python objects.
+    """
+
+    def __init__(
+        self, directory: str | Path | None = None, min_chars: int = DEFAULT_MIN_CHARS
+    ) -> None:
+        """Create the backing file.
+
+        Args:
+            directory: Where to create it (default: the cache directory)
+            min_chars: Shortest text worth storing; see ``should_store``
+        """
+        directory = Path(directory) if directory else default_cache_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        self._file = tempfile.TemporaryFile(dir=directory)  # noqa: SIM115
+        self._min_chars = min_chars
+        self._lock = threading.Lock()
+        self._refs: dict[str, BlobRef] = {}
+        self._size = 0
+        self._map: mmap.mmap | None = None
+
+    @property
+    def size(self) -> int:
+        """Bytes stored."""
+        return self._size
+
+    def should_store(self, text: str) -> bool:
+        """Whether text is long enough to keep on disk."""
+        return len(text) >= self._min_chars
+
+    def put(self, text: str) -> BlobRef:
+        """Store a text (once per distinct content).
+
+        Args:
+            text: Text to store
+
+        Returns:
+            Handle to read it back
+        """
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            ref = self._refs.get(digest)
+            if ref is None:
+                self._file.seek(self._size)
+                self._file.write(data)
+                self._file.flush()
+                ref = BlobRef(digest, self._size, len(data), len(text), self)
+                self._refs[digest] = ref
+                self._size += len(data)
+        return ref
+
+    def read(self, ref: BlobRef) -> str:
+        """Read a stored text.
+
+        Args:
+            ref: Handle returned by ``put``
+        """
+        end = ref.offset + ref.size
+        with self._lock:
+            if self._map is None or len(self._map) < end:
+                if self._map is not None:
+                    self._map.close()
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._map[ref.offset : end].decode("utf-8")
+
+    def close(self) -> None:
+        """Unmap and delete the backing file."""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._file.close()
+
+
+def rehydrate(message: dict[str, object]) -> dict[str, object]:
+    """API message with stored content read back (the same dict if not stored)."""
+    content = message.get("content")
+    if isinstance(content, BlobRef):
+        return {**message, "content": content.text()}
+    return message
@@ -0,0 +1,400 @@
+"""Recorded chat completions, replayed without the network.
+
+A recording transport sits between the HTTP client and the network and
+writes every chat completion response to a cassette file, one event at a
+time with the time it arrived. A replay transport serves the recorded
+responses back in order, at the original pace, faster, or all at once.
+
+Cassettes are gzip-compressed JSON lines: a header, then one line per
+response::
+
+    {"version": 1}
+    {"status": 200, "content_type": "text/event-stream",
+     "events": [[412.5, "data: {...}"], [18.2, "data: {...}"], ...]}
+
+Each event holds the milliseconds since the previous event (for the first,
+since the request was sent) and its text. Streamed bodies are split into
+server-sent events; other bodies are kept whole as one event.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from collections.abc import Iterator
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+
+import httpx
+
+from .sse_parser import CHAT_COMPLETIONS_PATH
+
+CASSETTE_VERSION = 1
+
+_EVENT_END = b"\n\n"
+_DONE = b"[DONE]"
+
+
+class CassetteError(Exception):
+    """A cassette cannot be read or has no response left to replay."""
+
+
+@dataclass
+class Interaction:
+    """One recorded response."""
+
+    status: int
+    content_type: str
+    # (milliseconds since the previous event, event text)
+    events: list[tuple[float, str]] = field(default_factory=list)
+
+    @property
+    def is_stream(self) -> bool:
+        """Whether the body is a stream of server-sent events."""
+        return self.content_type.startswith("text/event-stream")
+
+    def encode(self, text: str) -> bytes:
+        """Bytes of one event as served on replay."""
+        data = text.encode()
+        return data + _EVENT_END if self.is_stream else data
+
+    @property
+    def body(self) -> bytes:
+        """The whole body as served on replay."""
+        return b"".join(self.encode(text) for _, text in self.events)
+
+
+def _is_completion(request: httpx.Request) -> bool:
+    """Whether a request is a chat completion (and not, e.g., a warm-up)."""
+    return request.method == "POST" and request.url.path.rstrip("/").endswith(
+        CHAT_COMPLETIONS_PATH
+    )
+
+
+def load_cassette(path: str | Path) -> list[Interaction]:
+    """Read the responses recorded in a cassette.
+
+    Args:
+        path: Cassette file
+
+    Returns:
+        Recorded responses, in order
+
+    Raises:
+        CassetteError: If the file is not a cassette of a known version
+    """
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+    except (OSError, EOFError, ValueError) as e:
+        msg = f"Cannot read cassette {path}: {e}"
+        raise CassetteError(msg) from e
+    if not lines or lines[0].get("version") != CASSETTE_VERSION:
+        msg = f"Not a version {CASSETTE_VERSION} cassette: {path}"
+        raise CassetteError(msg)
+    return [
+        Interaction(
+            status=line["status"],
+            content_type=line["content_type"],
+            events=[(delay, text) for delay, text in line["events"]],
+        )
+        for line in lines[1:]
+    ]
+
+
+class CassetteWriter:
+    """Appends recorded responses to a new cassette file.
+
+    Each response is written as its own gzip member as soon as it is
+    complete, so an interrupted recording keeps what it had.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Create the cassette, replacing an existing file.
+
+        Args:
+            path: Cassette file
+        """
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._append({"version": CASSETTE_VERSION}, mode="wb")
+
+    def write(self, interaction: Interaction) -> None:
+        """Append one response."""
+        self._append(
+            {
+                "status": interaction.status,
+                "content_type": interaction.content_type,
+                "events": interaction.events,
+            }
+        )
+
+    def _append(self, line: dict[str, object], mode: str = "ab") -> None:
+        """Write one JSON line as a gzip member."""
+        data = json.dumps(line, ensure_ascii=False, separators=(",", ":"))
+        with self._lock, gzip.GzipFile(self._path, mode) as f:
+            f.write(f"{data}\n".encode())
+
+
+class _Recorder:
+    """Splits a response body into timed events as it arrives."""
+
+    def __init__(self, response: httpx.Response, started: float) -> None:
+        self.interaction = Interaction(
+            status=response.status_code,
+            content_type=response.headers.get("content-type", ""),
+        )
+        self._last = started
+        self._buffer = b""
+        self._done = False
+
+    def feed(self, data: bytes) -> None:
+        """Add received bytes; complete events are recorded."""
+        now = time.perf_counter()
+        self._buffer += data
+        if not self.interaction.is_stream:
+            return
+        *events, self._buffer = self._buffer.split(_EVENT_END)
+        for event in events:
+            self._add(event, now)
+
+    def finish(self) -> Interaction:
+        """Record what is left of the body and return the response."""
+        if self._buffer:
+            self._add(self._buffer.rstrip(b"\n"), time.perf_counter())
+            self._buffer = b""
+        return self.interaction
+
+    def _add(self, event: bytes, now: float) -> None:
+        """Record one event received at ``now``."""
+        delay_ms = round((now - self._last) * 1000, 1)
+        self.interaction.events.append((delay_ms, event.decode()))
+        self._last = now
+        self._done = self._done or event.rstrip().endswith(_DONE)
+
+    @property
+    def done(self) -> bool:
+        """Whether ``[DONE]`` arrived; clients stop reading there."""
+        return self._done or _DONE in self._buffer
+
+
+class _RecordingStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """Body of a response being recorded; written out once fully read."""
+
+    def __init__(
+        self,
+        stream: httpx.SyncByteStream | httpx.AsyncByteStream,
+        recorder: _Recorder,
+        writer: CassetteWriter,
+    ) -> None:
+        self._stream = stream
+        self._recorder = recorder
+        self._writer = writer
+        self._complete = False
+        self._saved = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Pass on and record the body."""
+        if not isinstance(self._stream, httpx.SyncByteStream):
+            msg = "Attempted to read an async response synchronously"
+            raise TypeError(msg)
+        for data in self._stream:
+            self._recorder.feed(data)
+            yield data
+        self._complete = True
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """Pass on and record the body."""
+        if not isinstance(self._stream, httpx.AsyncByteStream):
+            msg = "Attempted to read a sync response asynchronously"
+            raise TypeError(msg)
+        async for data in self._stream:
+            self._recorder.feed(data)
+            yield data
+        self._complete = True
+
+    def close(self) -> None:
+        """Close the body; a fully read one is written to the cassette."""
+        if isinstance(self._stream, httpx.SyncByteStream):
+            self._stream.close()
+        self._save()
+
+    async def aclose(self) -> None:
+        """Close the body; a fully read one is written to the cassette."""
+        if isinstance(self._stream, httpx.AsyncByteStream):
+            await self._stream.aclose()
+        self._save()
+
+    def _save(self) -> None:
+        """Write the response, unless it was abandoned (e.g. a lost hedge)."""
+        if not self._saved and (self._complete or self._recorder.done):
+            self._saved = True
+            self._writer.write(self._recorder.finish())
+
+
+def _prepare_recording(request: httpx.Request) -> float:
+    """Ask for an unencoded body, so events can be split; return the time."""
+    request.headers["Accept-Encoding"] = "identity"
+    return time.perf_counter()
+
+
+def _recording_response(
+    response: httpx.Response, started: float, writer: CassetteWriter
+) -> httpx.Response:
+    """Wrap a response so its body is recorded as it is read."""
+    return httpx.Response(
+        status_code=response.status_code,
+        headers=response.headers,
+        stream=_RecordingStream(response.stream, _Recorder(response, started), writer),
+        extensions=response.extensions,
+    )
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """Sends requests on and records chat completion responses."""
+
+    def __init__(self, path: str | Path, transport: httpx.BaseTransport) -> None:
+        """Initialize with a new cassette.
+
+        Args:
+            path: Cassette file to create
+            transport: Transport that sends requests
+        """
+        self._writer = CassetteWriter(path)
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request, recording the response of chat completions."""
+        if not _is_completion(request):
+            return self._transport.handle_request(request)
+        started = _prepare_recording(request)
+        response = self._transport.handle_request(request)
+        return _recording_response(response, started, self._writer)
+
+    def close(self) -> None:
+        """Close the underlying transport."""
+        self._transport.close()
+
+
+class AsyncRecordingTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of ``RecordingTransport``."""
+
+    def __init__(self, path: str | Path, transport: httpx.AsyncBaseTransport) -> None:
+        """Initialize with a new cassette.
+
+        Args:
+            path: Cassette file to create
+            transport: Transport that sends requests
+        """
+        self._writer = CassetteWriter(path)
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request, recording the response of chat completions."""
+        if not _is_completion(request):
+            return await self._transport.handle_async_request(request)
+        started = _prepare_recording(request)
+        response = await self._transport.handle_async_request(request)
+        return _recording_response(response, started, self._writer)
+
+    async def aclose(self) -> None:
+        """Close the underlying transport."""
+        await self._transport.aclose()
+
+
+class _ReplayStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """Body of a recorded response, paced by its recorded timing."""
+
+    def __init__(self, interaction: Interaction, speed: float) -> None:
+        self._interaction = interaction
+        self._speed = speed
+
+    def _schedule(self) -> Iterator[tuple[float, bytes]]:
+        """Each event with the seconds after the request it is due."""
+        due = 0.0
+        for delay_ms, text in self._interaction.events:
+            if self._speed > 0:
+                due += delay_ms / 1000 / self._speed
+            yield due, self._interaction.encode(text)
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Yield events as they fall due."""
+        start = time.perf_counter()
+        for due, data in self._schedule():
+            wait = start + due - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            yield data
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """Yield events as they fall due."""
+        start = time.perf_counter()
+        for due, data in self._schedule():
+            wait = start + due - time.perf_counter()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            yield data
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Answers chat completions with recorded responses, in order.
+
+    Other requests (connection warm-ups) get an empty 200.
+    """
+
+    def __init__(self, interactions: list[Interaction], speed: float = 1.0) -> None:
+        """Initialize with responses to replay.
+
+        Args:
+            interactions: Recorded responses (see ``load_cassette``)
+            speed: Playback speed relative to the recording (0: no delays)
+        """
+        self._interactions = deque(interactions)
+        self._speed = speed
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: str | Path, speed: float = 1.0) -> ReplayTransport:
+        """Replay a cassette file.
+
+        Args:
+            path: Cassette file
+            speed: Playback speed relative to the recording (0: no delays)
+        """
+        return cls(load_cassette(path), speed)
+
+    @property
+    def remaining(self) -> int:
+        """Number of responses not replayed yet."""
+        return len(self._interactions)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Answer with the next recorded response.
+
+        Raises:
+            CassetteError: If every response has been replayed
+        """
+        if not _is_completion(request):
+            return httpx.Response(200, request=request)
+        with self._lock:
+            if not self._interactions:
+                msg = "Cassette has no recorded response left to replay"
+                raise CassetteError(msg)
+            interaction = self._interactions.popleft()
+        return httpx.Response(
+            interaction.status,
+            headers={"Content-Type": interaction.content_type},
+            stream=_ReplayStream(interaction, self._speed),
+            request=request,
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Async counterpart of ``handle_request``."""
+        return self.handle_request(request)
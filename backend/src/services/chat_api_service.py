@@ -2,35 +2,122 @@
 
 from __future__ import annotations
 
-import json
+import contextlib
+import threading
+from collections.abc import Callable
 from collections.abc import Generator
-from collections.abc import Iterable
+from collections.abc import Iterator
 from contextlib import contextmanager
+from functools import partial
 from typing import TYPE_CHECKING
+from typing import cast
 
+import httpx
 from zai import ZaiClient
 
 from ..models.config import ChatConfig
 from ..tools import get_tool_schemas
+from ..tools import get_tool_schemas_json
 from ..tracing import SpanKind
+from ..tracing import record_prompt
 from ..tracing import span
+from .hedging import LatencyTracker
+from .hedging import StartedStream
+from .hedging import call_with_retries
+from .hedging import start_stream
+from .http_pool import REQUEST_TIMEOUT
+from .http_pool import create_http_client
+from .resumable_stream import ResumableStream
+from .sse_parser import StreamDelta
+from .sse_parser import completions_url
+from .sse_parser import iter_deltas
+from .sse_parser import stream_body
+from .sse_parser import stream_headers
 
 if TYPE_CHECKING:
+    from zai.core import StreamResponse
+    from zai.types.chat.chat_completion import Completion
     from zai.types.chat.chat_completion_chunk import ChatCompletionChunk
 
+type _Chunk = ChatCompletionChunk | StreamDelta
+# A started stream and the callable that closes it
+type _Opened = tuple[Iterator[_Chunk], Callable[[], None]]
+
 
 class ChatApiService:
-    """Service for making API calls to the chat service."""
+    """Service for making API calls to the chat service.
+
+    Requests go through one keep-alive connection pool (``config.http``).
+    Each ``llm`` span records whether its request reused a pooled
+    connection (``connection_reused``) and how long opening a new one took
+    (``connect_ms``).
+
+    With ``config.http.raw_stream``, streamed completions skip the SDK: the
+    response is read from the same pool and its events are parsed straight
+    into ``StreamDelta`` records (see ``sse_parser``).
+
+    Retries and hedging are done here for both paths (see ``hedging``), so
+    the SDK's own retries are turned off. Each ``llm`` span records how many
+    requests were sent (``attempts``) and which one streamed
+    (``winning_attempt``). Streams that stall mid-way are continued (see
+    ``resumable_stream``).
+    """
+
+    def __init__(
+        self, config: ChatConfig, transport: httpx.BaseTransport | None = None
+    ) -> None:
+        """Initialize API service with configuration.
 
-    def __init__(self, config: ChatConfig) -> None:
-        """Initialize API service with configuration."""
+        Args:
+            config: Chat configuration
+            transport: HTTP transport to use instead of the network (for tests)
+        """
         self._config = config
-        self._client = ZaiClient(api_key=config.api_key, base_url=config.base_url)
+        self._http = create_http_client(config.http, transport)
+        self._client = ZaiClient(
+            api_key=config.api_key,
+            base_url=config.base_url,
+            max_retries=0,
+            http_client=self._http,
+        )
+        self._latencies = LatencyTracker()
+        self._warm_up: threading.Thread | None = None
+
+    def warm_up(self) -> None:
+        """Open a connection to the API in the background.
+
+        Call while waiting for user input, so the next request does not pay
+        for DNS, TCP and TLS setup. Does nothing if disabled in config or if
+        a warm-up is still running.
+        """
+        if not self._config.http.warm_up or (
+            self._warm_up is not None and self._warm_up.is_alive()
+        ):
+            return
+        self._warm_up = threading.Thread(
+            target=self._connect, name="http-warm-up", daemon=True
+        )
+        self._warm_up.start()
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self._http.close()
+
+    def _connect(self) -> None:
+        """Send a HEAD request so a connection is left in the pool."""
+        with contextlib.suppress(httpx.HTTPError):
+            self._http.head(self._config.base_url)
+
+    def _await_warm_up(self) -> None:
+        """Let a warm-up in progress finish, so its connection gets reused."""
+        warm_up = self._warm_up
+        if warm_up is not None and warm_up.is_alive():
+            warm_up.join(REQUEST_TIMEOUT.connect)
 
     @contextmanager
     def streaming_completion(
         self, messages: list[dict[str, object]]
-    ) -> Generator[Iterable[ChatCompletionChunk], None, None]:
+    ) -> Generator[ResumableStream[_Chunk], None, None]:
         """Context manager for streaming chat completion.
 
         Keeps api.request span active while consuming the stream,
@@ -40,7 +127,8 @@ class ChatApiService:
             messages: List of message dictionaries in API format
 
         Yields:
-            Iterator over response chunks
+            Response chunks, or deltas with ``raw_stream``, as a stream
+            that can be resumed after a stall
         """
         tool_schemas = get_tool_schemas()
 
@@ -51,20 +139,101 @@ class ChatApiService:
                 tool_count=len(tool_schemas),
             )
             if self._config.tracing.include_sensitive_data:
-                messages_str = json.dumps(messages, ensure_ascii=False)
-                s.set(messages=messages_str)
+                record_prompt(s, messages)
+
+            self._await_warm_up()
+            open_stream: Callable[[list[dict[str, object]]], _Opened]
+            if self._config.http.raw_stream:
+                open_stream = partial(self._open_raw, get_tool_schemas_json())
+            else:
+                open_stream = partial(self._open, tool_schemas)
+
+            def start(partial_content: str = "") -> StartedStream[_Chunk]:
+                request = messages
+                if partial_content:
+                    request = [
+                        *messages,
+                        {"role": "assistant", "content": partial_content},
+                    ]
+                return start_stream(
+                    partial(open_stream, request),
+                    self._config.http,
+                    self._latencies,
+                )
+
+            started = start()
+            s.set(time_to_first_token_ms=started.time_to_first_chunk * 1000)
+            stream = ResumableStream(started, start, self._config.http, s)
+
+            try:
+                yield stream
+            finally:
+                stream.close()
 
-            response = self._client.chat.completions.create(
+    def _open(
+        self,
+        tool_schemas: list[dict[str, object]],
+        messages: list[dict[str, object]],
+    ) -> _Opened:
+        """Send one streamed completion request through the SDK."""
+        response = cast(
+            "StreamResponse[ChatCompletionChunk]",
+            self._client.chat.completions.create(
                 model=self._config.model,
                 messages=messages,
                 stream=True,
                 tools=tool_schemas,
                 tool_choice="auto",
-            )
+            ),
+        )
+        return iter(response), response.response.close
 
-            try:
-                yield response
-            finally:
-                close = getattr(response, "close", None)
-                if callable(close):
-                    close()
+    def _open_raw(
+        self,
+        tools_json: str,
+        messages: list[dict[str, object]],
+    ) -> _Opened:
+        """Send one streamed completion request without the SDK.
+
+        The tool schemas are embedded pre-serialized; only the messages are
+        encoded per request.
+
+        Raises:
+            httpx.HTTPStatusError: If the API rejects the request
+        """
+        request = self._http.build_request(
+            "POST",
+            completions_url(self._config.base_url),
+            content=stream_body(self._config.model, messages, tools_json),
+            headers=stream_headers(self._config.api_key),
+        )
+        response = self._http.send(request, stream=True)
+        if response.is_error:
+            response.read()
+            response.raise_for_status()
+        return iter_deltas(response.iter_bytes()), response.close
+
+    def completion(self, messages: list[dict[str, object]]) -> str:
+        """Run a non-streaming chat completion without tools.
+
+        Args:
+            messages: List of message dictionaries in API format
+
+        Returns:
+            Content of the response message ("" if none)
+        """
+        with span("llm", kind=SpanKind.LLM) as s:
+            s.set(model=self._config.model, message_count=len(messages), tool_count=0)
+            if self._config.tracing.include_sensitive_data:
+                record_prompt(s, messages, incremental=False)
+
+            create = partial(
+                self._client.chat.completions.create,
+                model=self._config.model,
+                messages=messages,
+                stream=False,
+            )
+            response = cast("Completion", call_with_retries(create, self._config.http))
+            content = response.choices[0].message.content or ""
+            s.set(response_chars=len(content))
+            return content
@@ -0,0 +1,238 @@
+"""Background summarization of old conversation turns."""
+
+from __future__ import annotations
+
+import contextvars
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from ..models.config import ContextConfig
+from ..models.message import Message
+from ..models.message import MessageRole
+from ..tracing import SpanKind
+from ..tracing import get_current_span
+from ..tracing import span
+from .blob_store import rehydrate
+from .context_window import estimate_tokens
+
+if TYPE_CHECKING:
+    from .chat_api_service import ChatApiService
+    from .context_window import ContextWindowManager
+    from .message_repository import MessageRepository
+
+SUMMARY_PREFIX = "[Summary of the earlier conversation]"
+# Characters of each message included in the summarization transcript
+TRANSCRIPT_CHARS_PER_MESSAGE = 4000
+# Fewer old messages than this are not worth a summarization request
+MIN_COMPACTED_MESSAGES = 2
+
+_INSTRUCTIONS = (
+    "You compress conversation history for a coding agent. Summarize the "
+    "transcript below so the agent can continue the work without it. Keep: "
+    "the user's goals and constraints, decisions made, files and symbols "
+    "involved, tool findings that are still relevant, and open tasks. Drop "
+    "pleasantries and superseded details. Reply with the summary only."
+)
+
+
+@dataclass
+class _Job:
+    """A summarization of messages[start:end] taken at one revision."""
+
+    start: int
+    end: int
+    revision: int
+    future: Future[str]
+
+
+def _transcript(messages: list[dict[str, object]]) -> str:
+    """Render API messages as plain text for the summarization request."""
+    lines: list[str] = []
+    for message in map(rehydrate, messages):
+        role = str(message.get("role"))
+        content = str(message.get("content") or "")
+        omitted = len(content) - TRANSCRIPT_CHARS_PER_MESSAGE
+        if omitted > 0:
+            content = content[:TRANSCRIPT_CHARS_PER_MESSAGE]
+            content += f" [... {omitted} chars omitted]"
+        if role == "tool":
+            lines.append(f"TOOL RESULT ({message.get('name', 'tool')}): {content}")
+            continue
+        tool_calls = message.get("tool_calls")
+        if isinstance(tool_calls, list):
+            for call in tool_calls:
+                function = call.get("function", {}) if isinstance(call, dict) else {}
+                lines.append(
+                    f"ASSISTANT CALLED {function.get('name')}"
+                    f"({function.get('arguments', '')})"
+                )
+        if content:
+            lines.append(f"{role.upper()}: {content}")
+    return "\n\n".join(lines)
+
+
+class ConversationCompactor:
+    """Folds old turns into one summary message, off the request path.
+
+    After a turn, once the context window passes
+    ``ContextConfig.compact_at_tokens``, the messages between the system
+    prompt and the most recent turns are summarized by the model on a
+    background thread. The summary replaces them at the start of the next
+    turn (if it is ready), as a system message right after the system
+    prompt. Later compactions fold the previous summary into the new one.
+
+    Each summarization runs in a ``compaction`` span.
+    """
+
+    def __init__(
+        self,
+        repository: MessageRepository,
+        api_service: ChatApiService,
+        context_window: ContextWindowManager,
+        config: ContextConfig,
+    ) -> None:
+        """Initialize the compactor.
+
+        Args:
+            repository: Conversation history
+            api_service: Service used for the summarization request
+            context_window: Source of the current prompt size
+            config: Threshold and retention settings
+        """
+        self._repository = repository
+        self._api_service = api_service
+        self._context_window = context_window
+        self._config = config
+        self._job: _Job | None = None
+
+    @property
+    def pending(self) -> bool:
+        """Whether a summarization was started and not yet applied."""
+        return self._job is not None
+
+    def maybe_start(self) -> bool:
+        """Start summarizing old turns if the prompt passed the threshold.
+
+        Call between turns, from the thread that owns the repository.
+
+        Returns:
+            Whether a summarization was started
+        """
+        threshold = self._config.compact_at_tokens
+        if (
+            self._job is not None
+            or threshold <= 0
+            or self._context_window.total_tokens < threshold
+        ):
+            return False
+
+        messages = self._repository.get_messages_for_api()
+        start, end = 1, self._recent_start(messages)
+        if end - start < MIN_COMPACTED_MESSAGES:
+            return False
+
+        future: Future[str] = Future()
+        self._job = _Job(start, end, self._repository.revision, future)
+        thread = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(self._summarize, messages[start:end], future),
+            name="compaction",
+            daemon=True,
+        )
+        thread.start()
+        return True
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait for a started summarization to finish.
+
+        Args:
+            timeout: Seconds to wait (None: no limit)
+
+        Returns:
+            Whether no summarization is still running
+        """
+        if self._job is None:
+            return True
+        try:
+            self._job.future.exception(timeout=timeout)
+        except TimeoutError:
+            return False
+        return True
+
+    def apply(self) -> bool:
+        """Swap the summarized messages for the summary, if it is ready.
+
+        Call at the start of a turn, from the thread that owns the
+        repository. A failed summarization, or one whose messages were
+        rewritten meanwhile, is discarded.
+
+        Returns:
+            Whether the history was compacted
+        """
+        job = self._job
+        if job is None or not job.future.done():
+            return False
+        self._job = None
+        if job.future.exception() is not None:
+            return False
+        if self._repository.revision != job.revision:
+            return False
+
+        summary = Message(
+            role=MessageRole.SYSTEM,
+            content=f"{SUMMARY_PREFIX}\n{job.future.result()}",
+        )
+        self._repository.replace_range(job.start, job.end, summary)
+
+        s = get_current_span()
+        if s is not None:
+            s.set(compacted_messages=job.end - job.start)
+        return True
+
+    def _recent_start(self, messages: list[dict[str, object]]) -> int:
+        """Index of the first message of the turns kept verbatim."""
+        remaining = max(self._config.keep_recent_turns, 1)
+        for index in range(len(messages) - 1, 0, -1):
+            if messages[index].get("role") == "user":
+                remaining -= 1
+                if remaining == 0:
+                    return index
+        return 1
+
+    def _summarize(
+        self, messages: list[dict[str, object]], future: Future[str]
+    ) -> None:
+        """Summarize messages on the background thread."""
+        try:
+            with span("compaction", kind=SpanKind.COMPACTION) as s:
+                s.set(
+                    message_count=len(messages),
+                    tokens_before=sum(estimate_tokens(m) for m in messages),
+                )
+                summary = self._request_summary(messages)
+                s.set(
+                    tokens_after=estimate_tokens(
+                        {"role": "system", "content": f"{SUMMARY_PREFIX}\n{summary}"}
+                    ),
+                    summary_chars=len(summary),
+                )
+        except Exception as e:
+            # The span has recorded the error; apply() discards the job.
+            future.set_exception(e)
+        else:
+            future.set_result(summary)
+
+    def _request_summary(self, messages: list[dict[str, object]]) -> str:
+        """Ask the model for a summary of messages."""
+        summary = self._api_service.completion(
+            [
+                {"role": "system", "content": _INSTRUCTIONS},
+                {"role": "user", "content": _transcript(messages)},
+            ]
+        )
+        if not summary.strip():
+            msg = "Summarization returned no content."
+            raise ValueError(msg)
+        return summary
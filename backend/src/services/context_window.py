@@ -0,0 +1,300 @@
+"""Token-budgeted view of the conversation sent with each request."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from typing import NotRequired
+from typing import TypedDict
+
+from ..models.config import ContextConfig
+from ..tracing import get_current_span
+from .blob_store import BlobRef
+from .blob_store import rehydrate
+
+if TYPE_CHECKING:
+    from .message_repository import MessageRepository
+
+# Rough size of a token for English text and code; no tokenizer needed.
+CHARS_PER_TOKEN = 4
+# Per-message framing (role, separators) added by chat templates
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(message: dict[str, object]) -> int:
+    """Estimate the prompt tokens of an API message."""
+    content = message.get("content")
+    if isinstance(content, BlobRef):
+        # Counted without reading the stored text back
+        message = {**message, "content": ""}
+        chars = len(json.dumps(message, ensure_ascii=False)) + content.chars
+    else:
+        chars = len(json.dumps(message, ensure_ascii=False))
+    return MESSAGE_OVERHEAD_TOKENS + -(-chars // CHARS_PER_TOKEN)
+
+
+class Eviction(TypedDict):
+    """One eviction, as recorded in ``context_evictions`` span data."""
+
+    action: str
+    tokens: int
+    tool: NotRequired[str]
+    messages: NotRequired[int]
+
+
+@dataclass
+class _Entry:
+    """A message as sent in requests, with its token estimate."""
+
+    api: dict[str, object]
+    tokens: int
+    stubbed: bool = False
+    # A reference replaced by the full content it stood for
+    expanded: bool = False
+
+    @property
+    def role(self) -> object:
+        return self.api.get("role")
+
+
+class ContextWindowManager:
+    """Keeps requests within a token budget by evicting old context.
+
+    Token estimates are computed once per message as it is appended to the
+    repository. When the total exceeds the budget, eviction runs oldest
+    first, outside the system prompt and the most recent turns:
+
+    1. Old tool results are replaced with a short stub.
+    2. Whole old turns (a user message and the replies to it) are dropped.
+
+    Evictions are permanent for the view, so the prompt prefix stays stable
+    between requests. The repository keeps the full history. Each eviction
+    is recorded on the active span (the ``turn`` span).
+
+    Tool results that point at an earlier result (see ``add_reference``)
+    are sent in full once that result is evicted or rewritten away.
+    """
+
+    def __init__(self, repository: MessageRepository, config: ContextConfig) -> None:
+        """Initialize the manager.
+
+        Args:
+            repository: Conversation history
+            config: Budget and retention settings
+        """
+        self._repository = repository
+        self._config = config
+        self._revision: int | None = None
+        self._synced = 0
+        self._entries: list[_Entry] = []
+        self._total = 0
+        # tool_call_ids of results stubbed or dropped from the view
+        self._evicted_calls: set[str] = set()
+        # tool_call_id -> (tool_call_id referred to, full content)
+        self._references: dict[str, tuple[str, str]] = {}
+
+    @property
+    def total_tokens(self) -> int:
+        """Estimated tokens of the current view."""
+        return self._total
+
+    def is_live(self, tool_call_id: str) -> bool:
+        """Whether a tool result is still sent in full (not evicted).
+
+        Only meaningful while the repository revision is unchanged.
+        """
+        return tool_call_id not in self._evicted_calls
+
+    def add_reference(self, tool_call_id: str, refers_to: str, content: str) -> None:
+        """Register a tool result that only makes sense next to an earlier one.
+
+        Args:
+            tool_call_id: Call whose result points at the earlier result
+            refers_to: Call of the earlier result
+            content: Full result to send once the earlier one is not sent
+        """
+        self._references[tool_call_id] = (refers_to, content)
+
+    def messages_for_request(self) -> list[dict[str, object]]:
+        """Get the messages to send, evicting old context if over budget.
+
+        Contents kept in a ``BlobStore`` are read back here, so the texts
+        live only as long as the returned list.
+
+        Returns:
+            API messages within the budget when eviction can achieve it
+        """
+        self._sync()
+        events: list[Eviction] = []
+        self._expand_references()
+        while self._total > self._config.max_tokens:
+            events.extend(self._evict())
+            if not self._expand_references():
+                break
+        self._record(events)
+        return [rehydrate(entry.api) for entry in self._entries]
+
+    def _sync(self) -> None:
+        """Add messages appended since the last request."""
+        revision = self._repository.revision
+        if revision != self._revision:
+            self._revision = revision
+            self._synced = 0
+            self._entries = []
+            self._total = 0
+            self._evicted_calls = set()
+
+        for message in self._repository.get_messages_for_api(self._synced):
+            entry = _Entry(api=message, tokens=estimate_tokens(message))
+            self._entries.append(entry)
+            self._total += entry.tokens
+            self._synced += 1
+
+    def _expand_references(self) -> bool:
+        """Send results in full whose referred result is gone from the view.
+
+        Returns:
+            Whether any result was expanded
+        """
+        if not self._references:
+            return False
+        live = {
+            str(entry.api.get("tool_call_id"))
+            for entry in self._entries
+            if entry.role == "tool" and not entry.stubbed
+        }
+        expanded = False
+        for entry in self._entries:
+            if entry.role != "tool" or entry.stubbed or entry.expanded:
+                continue
+            reference = self._references.get(str(entry.api.get("tool_call_id")))
+            if reference is None or reference[0] in live:
+                continue
+            _, content = reference
+            entry.api = {**entry.api, "content": content}
+            entry.expanded = True
+            tokens = estimate_tokens(entry.api)
+            self._total += tokens - entry.tokens
+            entry.tokens = tokens
+            expanded = True
+        return expanded
+
+    def _evict(self) -> list[Eviction]:
+        """Stub old tool results, then drop old turns, until within budget."""
+        events: list[Eviction] = []
+        budget = self._config.max_tokens
+
+        for index in range(self._protected_head(), self._recent_start()):
+            if self._total <= budget:
+                return events
+            entry = self._entries[index]
+            if entry.role == "tool" and not entry.stubbed:
+                event = self._stub(index)
+                if event is not None:
+                    events.append(event)
+
+        while self._total > budget:
+            event = self._drop_oldest_turn()
+            if event is None:
+                break
+            events.append(event)
+        return events
+
+    def _stub(self, index: int) -> Eviction | None:
+        """Replace a tool result with a stub that keeps the call pairing."""
+        entry = self._entries[index]
+        name = entry.api.get("name") or "tool"
+        stub: dict[str, object] = {
+            "role": "tool",
+            "content": (
+                f"[Earlier {name} result removed to save context "
+                f"(~{entry.tokens} tokens). Call the tool again if needed.]"
+            ),
+            "tool_call_id": entry.api.get("tool_call_id"),
+        }
+        if "name" in entry.api:
+            stub["name"] = entry.api["name"]
+
+        replacement = _Entry(api=stub, tokens=estimate_tokens(stub), stubbed=True)
+        if replacement.tokens >= entry.tokens:
+            return None
+        self._entries[index] = replacement
+        self._evicted_calls.add(str(entry.api.get("tool_call_id")))
+        freed = entry.tokens - replacement.tokens
+        self._total -= freed
+        return {"action": "stub_tool_result", "tool": str(name), "tokens": freed}
+
+    def _drop_oldest_turn(self) -> Eviction | None:
+        """Drop the oldest unprotected user turn, if any."""
+        recent_start = self._recent_start()
+        start = next(
+            (
+                i
+                for i in range(self._protected_head(), recent_start)
+                if self._entries[i].role == "user"
+            ),
+            None,
+        )
+        if start is None:
+            return None
+        end = next(
+            (
+                i
+                for i in range(start + 1, len(self._entries))
+                if self._entries[i].role == "user"
+            ),
+            len(self._entries),
+        )
+        if end > recent_start:
+            return None
+
+        dropped = self._entries[start:end]
+        freed = sum(entry.tokens for entry in dropped)
+        self._evicted_calls.update(
+            str(entry.api.get("tool_call_id"))
+            for entry in dropped
+            if entry.role == "tool"
+        )
+        del self._entries[start:end]
+        self._total -= freed
+        return {"action": "drop_turn", "messages": end - start, "tokens": freed}
+
+    def _protected_head(self) -> int:
+        """Index after the leading system messages."""
+        for index, entry in enumerate(self._entries):
+            if entry.role != "system":
+                return index
+        return len(self._entries)
+
+    def _recent_start(self) -> int:
+        """Index of the first message of the protected recent turns."""
+        remaining = self._config.keep_recent_turns
+        if remaining <= 0:
+            return len(self._entries)
+        for index in range(len(self._entries) - 1, -1, -1):
+            if self._entries[index].role == "user":
+                remaining -= 1
+                if remaining == 0:
+                    return index
+        return self._protected_head()
+
+    def _record(self, events: list[Eviction]) -> None:
+        """Record the budget state and any evictions on the active span."""
+        s = get_current_span()
+        if s is None:
+            return
+        s.set(context_tokens=self._total, context_budget=self._config.max_tokens)
+        if not events:
+            return
+
+        recorded = s.data.get("context_evictions")
+        history = json.loads(recorded) if isinstance(recorded, str) else []
+        history.extend(events)
+        freed = s.data.get("context_tokens_freed")
+        s.set(
+            context_evictions=json.dumps(history),
+            context_tokens_freed=(freed if isinstance(freed, int) else 0)
+            + sum(event["tokens"] for event in events),
+            context_over_budget=self._total > self._config.max_tokens,
+        )
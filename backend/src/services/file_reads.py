@@ -0,0 +1,241 @@
+"""Deduplication of repeated file reads in the conversation."""
+
+from __future__ import annotations
+
+import difflib
+import re
+from collections.abc import Hashable
+from dataclasses import dataclass
+from dataclasses import replace
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pydantic import ValidationError
+
+from ..tools.read_file import ReadFileArgs
+from ..tools.read_file import ReadFileTool
+from ..tracing import get_current_span
+
+if TYPE_CHECKING:
+    from ..models.tool import ToolCall
+    from ..models.tool import ToolResult
+    from .context_window import ContextWindowManager
+    from .message_repository import MessageRepository
+
+# A diff is sent instead of the new content only if it is at most this
+# fraction of the content's size.
+MAX_DIFF_RATIO = 0.5
+# Unchanged lines shown around each change in a diff
+DIFF_CONTEXT_LINES = 2
+
+_NUMBERED_LINE = re.compile(r"(\d+): ?(.*)", re.DOTALL)
+
+
+@dataclass
+class _Output:
+    """A read_file output split into its header and numbered lines."""
+
+    header: str
+    first_line: int
+    lines: list[str]
+
+    @property
+    def last_line(self) -> int:
+        return self.first_line + len(self.lines) - 1
+
+
+def _parse_output(output: str) -> _Output | None:
+    """Split a read_file output; None if it is not a complete read."""
+    header, separator, body = output.partition("\n\n")
+    if not separator or not body:
+        return None
+    first_line: int | None = None
+    lines: list[str] = []
+    for raw in body.split("\n"):
+        match = _NUMBERED_LINE.fullmatch(raw)
+        if match is None:
+            # e.g. the note of an output cut to its first page
+            return None
+        if first_line is None:
+            first_line = int(match.group(1))
+        lines.append(match.group(2))
+    if first_line is None:
+        return None
+    return _Output(header, first_line, lines)
+
+
+def _diff(old: _Output, new: _Output) -> str:
+    """Unified diff between two reads of the same lines, in file line numbers."""
+    hunks: list[str] = []
+    matcher = difflib.SequenceMatcher(a=old.lines, b=new.lines, autojunk=False)
+    for group in matcher.get_grouped_opcodes(DIFF_CONTEXT_LINES):
+        i1, i2 = group[0][1], group[-1][2]
+        j1, j2 = group[0][3], group[-1][4]
+        hunks.append(
+            f"@@ -{old.first_line + i1},{i2 - i1} +{new.first_line + j1},{j2 - j1} @@"
+        )
+        for tag, a1, a2, b1, b2 in group:
+            if tag == "equal":
+                hunks.extend(f" {line}" for line in old.lines[a1:a2])
+                continue
+            hunks.extend(f"-{line}" for line in old.lines[a1:a2])
+            hunks.extend(f"+{line}" for line in new.lines[b1:b2])
+    return "\n".join(hunks)
+
+
+@dataclass
+class _Read:
+    """A file read whose full output is in the conversation."""
+
+    tool_call_id: str
+    message_index: int
+    revision: int
+    fingerprint: Hashable
+    output: _Output
+
+    @property
+    def span(self) -> tuple[int, int]:
+        """First and last line read."""
+        return (self.output.first_line, self.output.last_line)
+
+    def covers(self, first_line: int, last_line: int) -> bool:
+        """Whether the read includes the given lines."""
+        return (
+            self.output.first_line <= first_line and last_line <= self.output.last_line
+        )
+
+
+class FileReadTracker:
+    """Replaces re-reads of content already in the prompt.
+
+    Remembers each ``read_file`` result that is still sent in full (same
+    repository revision, not evicted by the context window). When the
+    model reads lines it already has:
+
+    - If the file is unchanged, the result becomes a short stub pointing at
+      the earlier message.
+    - If the file changed and the same lines were read, the result becomes
+      a diff against the earlier read, when that is much smaller.
+
+    Stubs and diffs are registered with the context window, which sends
+    the full result instead once the earlier read is evicted or compacted.
+    """
+
+    def __init__(
+        self, repository: MessageRepository, context_window: ContextWindowManager
+    ) -> None:
+        """Initialize the tracker.
+
+        Args:
+            repository: Conversation history the results are added to
+            context_window: Tells which earlier results are still sent
+        """
+        self._repository = repository
+        self._context_window = context_window
+        self._tool = ReadFileTool()
+        self._reads: dict[Path, list[_Read]] = {}
+
+    def dedupe(self, tool_call: ToolCall, result: ToolResult) -> ToolResult:
+        """Get the result to add to the conversation for a tool call.
+
+        Call just before the result is added to the repository.
+
+        Args:
+            tool_call: The call, for its arguments
+            result: Output of the call
+
+        Returns:
+            The result, or a copy with a stub or diff as content
+        """
+        if result.is_error or tool_call.name != self._tool.name:
+            return result
+        try:
+            args = ReadFileArgs.model_validate_json(tool_call.arguments or "{}")
+        except ValidationError:
+            return result
+        output = _parse_output(result.content)
+        fingerprint = self._tool.fingerprint(args)
+        if output is None or fingerprint is None:
+            return result
+
+        replacement = self._replacement(args.path, output, fingerprint, result)
+        if replacement is None:
+            return result
+        content, read = replacement
+        self._context_window.add_reference(
+            result.tool_call_id, read.tool_call_id, result.content
+        )
+        return self._replaced(result, content)
+
+    def _replacement(
+        self, path: str, output: _Output, fingerprint: Hashable, result: ToolResult
+    ) -> tuple[str, _Read] | None:
+        """Stub or diff to send instead of an output, with the read it uses."""
+        reads = self._live_reads(Path(path).resolve())
+        span = (output.first_line, output.last_line)
+
+        for read in reversed(reads):
+            if read.fingerprint == fingerprint and read.covers(*span):
+                return self._stub(path, output, read), read
+
+        same_lines = next((read for read in reversed(reads) if read.span == span), None)
+        if same_lines is not None and same_lines.output.lines == output.lines:
+            # Touched but not modified
+            same_lines.fingerprint = fingerprint
+            return self._stub(path, output, same_lines), same_lines
+
+        reads.append(
+            _Read(
+                result.tool_call_id,
+                len(self._repository),
+                self._repository.revision,
+                fingerprint,
+                output,
+            )
+        )
+        if same_lines is None:
+            return None
+        diff = _diff(same_lines.output, output)
+        if len(diff) > len(result.content) * MAX_DIFF_RATIO:
+            return None
+        content = (
+            f"{output.header}\n"
+            f"[changed since message {same_lines.message_index}; "
+            f"diff of lines {output.first_line}-{output.last_line}]\n\n{diff}"
+        )
+        return content, same_lines
+
+    def _live_reads(self, path: Path) -> list[_Read]:
+        """Earlier reads of path whose output is still sent in full."""
+        revision = self._repository.revision
+        reads = [
+            read
+            for read in self._reads.get(path, [])
+            if read.revision == revision
+            and self._context_window.is_live(read.tool_call_id)
+        ]
+        self._reads[path] = reads
+        return reads
+
+    def _stub(self, path: str, output: _Output, read: _Read) -> str:
+        """Pointer to an earlier read that contains the requested lines."""
+        return (
+            f"[file: {path}]\n"
+            f"[lines {output.first_line}-{output.last_line} unchanged since "
+            f"message {read.message_index} (read_file call {read.tool_call_id}); "
+            "use the content shown there]"
+        )
+
+    def _replaced(self, result: ToolResult, content: str) -> ToolResult:
+        """Copy of result with new content, recording the saving on the span."""
+        s = get_current_span()
+        if s is not None:
+            saved = s.data.get("dedup_chars_saved")
+            reads = s.data.get("dedup_reads")
+            s.set(
+                dedup_reads=(reads if isinstance(reads, int) else 0) + 1,
+                dedup_chars_saved=(saved if isinstance(saved, int) else 0)
+                + len(result.content)
+                - len(content),
+            )
+        return replace(result, content=content)
@@ -0,0 +1,333 @@
+"""Hedged and retried starts of streamed completions.
+
+A streamed completion is started on a worker thread and counts as started
+once its first chunk arrives. If that takes longer than a high percentile
+of earlier times to first chunk, a second identical request is sent and
+whichever streams first is used; the other is closed. Requests that fail
+with a retryable status or connection error before streaming are sent
+again after an exponential backoff.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import itertools
+import math
+import queue
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from collections.abc import Iterator
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+import httpx
+from zai.core import APIStatusError
+
+from ..tracing import get_current_span
+
+if TYPE_CHECKING:
+    from ..models.config import HttpConfig
+
+# Besides 5xx, as retried by the SDK
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429})
+
+# Times to first chunk kept for the hedging percentile
+LATENCY_WINDOW = 100
+
+
+def is_retryable(error: Exception) -> bool:
+    """Return whether a request that failed with ``error`` may be sent again.
+
+    Args:
+        error: Error raised by the SDK or by httpx
+
+    Returns:
+        True for retryable statuses and for connection errors and timeouts
+    """
+    status: int | None = None
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+    elif isinstance(error, APIStatusError):
+        status = error.status_code
+    if status is not None:
+        return (
+            status >= HTTPStatus.INTERNAL_SERVER_ERROR
+            or status in RETRYABLE_STATUS_CODES
+        )
+    # The SDK wraps transport errors in its own connection errors
+    return isinstance(error, httpx.TransportError) or isinstance(
+        error.__cause__, httpx.TransportError
+    )
+
+
+def retry_delay(error: Exception, retry: int, config: HttpConfig) -> float:
+    """Return the seconds to wait before sending a failed request again.
+
+    Doubles with each retry, with jitter, up to ``config.retry_backoff_max``.
+    A longer ``Retry-After`` from the server is honored up to the same cap.
+
+    Args:
+        error: Error the request failed with
+        retry: Number of retries already made
+        config: HTTP configuration
+
+    Returns:
+        Delay in seconds
+    """
+    backoff = config.retry_backoff * 2.0**retry
+    delay = backoff * random.uniform(0.5, 1.0)  # noqa: S311
+    retry_after = _retry_after(error)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return min(delay, config.retry_backoff_max)
+
+
+def _retry_after(error: Exception) -> float | None:
+    """Return the ``Retry-After`` of an error response in seconds, if any."""
+    response = getattr(error, "response", None)
+    if not isinstance(response, httpx.Response):
+        return None
+    value = response.headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def call_with_retries[T](call: Callable[[], T], config: HttpConfig) -> T:
+    """Call ``call``, retrying retryable failures with backoff.
+
+    Args:
+        call: Function that sends one request
+        config: HTTP configuration (``max_retries`` and backoff)
+
+    Returns:
+        What ``call`` returns
+    """
+    retry = 0
+    while True:
+        try:
+            return call()
+        except Exception as e:
+            if retry >= config.max_retries or not is_retryable(e):
+                raise
+            time.sleep(retry_delay(e, retry, config))
+            retry += 1
+
+
+class LatencyTracker:
+    """Rolling window of observed times to first chunk."""
+
+    def __init__(self, size: int = LATENCY_WINDOW) -> None:
+        """Initialize an empty window.
+
+        Args:
+            size: Number of most recent samples kept
+        """
+        self._samples: deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of samples in the window."""
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        """Record one time to first chunk."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the nearest-rank percentile, or None without samples.
+
+        Args:
+            fraction: Percentile as a fraction (0.95 for p95)
+        """
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return None
+        rank = min(len(ordered), max(1, math.ceil(fraction * len(ordered))))
+        return ordered[rank - 1]
+
+
+@dataclass
+class StartedStream[T]:
+    """A stream whose first chunk has arrived."""
+
+    # All chunks, including the first
+    chunks: Iterator[T]
+    close: Callable[[], None]
+    # Requests sent, including hedges and retries
+    attempts: int
+    # 1-based number of the request that is streaming
+    winner: int
+    # Seconds from the first request to the first chunk
+    time_to_first_chunk: float
+
+
+class _Attempt[T]:
+    """One request, opened and read up to its first chunk on a thread."""
+
+    def __init__(self, number: int) -> None:
+        self.number = number
+        self.started = time.perf_counter()
+        self.first_chunk_time = self.started
+        self.chunks: Iterator[T] = iter(())
+        self.first: list[T] = []
+        self.error: Exception | None = None
+        self._close: Callable[[], None] | None = None
+        self._cancelled = False
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        open_stream: Callable[[], tuple[Iterator[T], Callable[[], None]]],
+        results: queue.SimpleQueue[_Attempt[T]],
+    ) -> None:
+        """Open the stream, wait for its first chunk and report back."""
+        try:
+            chunks, close = open_stream()
+            with self._lock:
+                self._close = close
+                cancelled = self._cancelled
+            if cancelled:
+                close()
+                return
+            self.chunks = chunks
+            self.first = list(itertools.islice(chunks, 1))
+            self.first_chunk_time = time.perf_counter()
+        except Exception as e:
+            self.error = e
+            self.close()
+        results.put(self)
+
+    def close(self) -> None:
+        """Close the response, now or as soon as it is opened."""
+        with self._lock:
+            self._cancelled = True
+            close = self._close
+        if close is not None:
+            # A losing request may fail in any way while being torn down
+            with contextlib.suppress(Exception):
+                close()
+
+
+def start_stream[T](
+    open_stream: Callable[[], tuple[Iterator[T], Callable[[], None]]],
+    config: HttpConfig,
+    latencies: LatencyTracker,
+) -> StartedStream[T]:
+    """Start a stream, hedging and retrying as configured.
+
+    Records ``attempts`` and ``winning_attempt`` on the current span.
+
+    Args:
+        open_stream: Sends one request; returns its chunks and a close function
+        config: HTTP configuration
+        latencies: Observed times to first chunk; the winner's is added
+
+    Returns:
+        The first stream to deliver a chunk
+
+    Raises:
+        Exception: The last error, if no request got a stream going
+    """
+    results: queue.SimpleQueue[_Attempt[T]] = queue.SimpleQueue()
+    attempts: list[_Attempt[T]] = []
+    start = time.perf_counter()
+
+    def launch() -> None:
+        attempt = _Attempt[T](len(attempts) + 1)
+        attempts.append(attempt)
+        threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(attempt.run, open_stream, results),
+            name=f"llm-attempt-{attempt.number}",
+            daemon=True,
+        ).start()
+
+    current_span = get_current_span()
+    try:
+        winner = _wait_for_winner(launch, results, config, latencies)
+    except BaseException:
+        for attempt in attempts:
+            attempt.close()
+        raise
+    finally:
+        if current_span is not None:
+            current_span.set(attempts=len(attempts))
+
+    for attempt in attempts:
+        if attempt is not winner:
+            attempt.close()
+    latencies.add(winner.first_chunk_time - winner.started)
+    if current_span is not None:
+        current_span.set(winning_attempt=winner.number)
+
+    return StartedStream(
+        chunks=itertools.chain(winner.first, winner.chunks),
+        close=winner.close,
+        attempts=len(attempts),
+        winner=winner.number,
+        time_to_first_chunk=winner.first_chunk_time - start,
+    )
+
+
+def _wait_for_winner[T](
+    launch: Callable[[], None],
+    results: queue.SimpleQueue[_Attempt[T]],
+    config: HttpConfig,
+    latencies: LatencyTracker,
+) -> _Attempt[T]:
+    """Launch requests until one delivers a first chunk."""
+    retries = 0
+    launch()
+    pending = 1
+    hedge_at = _hedge_deadline(config, latencies)
+
+    while True:
+        timeout = None if hedge_at is None else max(0.0, hedge_at - time.perf_counter())
+        try:
+            attempt = results.get(timeout=timeout)
+        except queue.Empty:
+            launch()
+            pending += 1
+            hedge_at = None
+            continue
+
+        pending -= 1
+        if attempt.error is None:
+            return attempt
+        if pending:
+            # The other request may still get through
+            continue
+        if retries >= config.max_retries or not is_retryable(attempt.error):
+            raise attempt.error
+
+        time.sleep(retry_delay(attempt.error, retries, config))
+        retries += 1
+        launch()
+        pending = 1
+        hedge_at = _hedge_deadline(config, latencies)
+
+
+def _hedge_deadline(config: HttpConfig, latencies: LatencyTracker) -> float | None:
+    """Return when to send a hedged request, or None not to hedge."""
+    if not config.hedge or len(latencies) < config.hedge_min_samples:
+        return None
+    delay = latencies.percentile(config.hedge_percentile)
+    if delay is None:
+        return None
+    return time.perf_counter() + delay
@@ -0,0 +1,153 @@
+"""Pooled HTTP client for the chat API, with connection metrics."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+import httpx
+
+from ..models.config import CassetteMode
+from ..tracing import get_current_span
+from .cassette import AsyncRecordingTransport
+from .cassette import RecordingTransport
+from .cassette import ReplayTransport
+
+if TYPE_CHECKING:
+    from ..models.config import HttpConfig
+    from ..tracing import Span
+
+# Same as the SDK's own client: long reads for streamed responses
+REQUEST_TIMEOUT = httpx.Timeout(300.0, connect=8.0)
+
+
+class _ConnectionTrace:
+    """httpcore trace callbacks that record connection setup on a span.
+
+    httpcore only emits ``connection.*`` events when it opens a connection,
+    so a request without them reused one from the pool.
+    """
+
+    def __init__(self, s: Span) -> None:
+        self._span = s
+        self._started: float | None = None
+
+    def record(self, event_name: str, info: dict[str, object]) -> None:  # noqa: ARG002
+        """Callback for sync clients."""
+        if event_name == "connection.connect_tcp.started":
+            self._started = time.perf_counter()
+            self._span.set(connection_reused=False)
+        elif self._started is not None and event_name in (
+            "connection.connect_tcp.complete",
+            "connection.start_tls.complete",
+        ):
+            # DNS and TCP, then TLS: the last event gives the full setup time
+            elapsed = (time.perf_counter() - self._started) * 1000
+            self._span.set(connect_ms=round(elapsed, 1))
+
+    async def arecord(self, event_name: str, info: dict[str, object]) -> None:
+        """Callback for async clients (httpcore awaits it)."""
+        self.record(event_name, info)
+
+
+def _start_trace() -> _ConnectionTrace | None:
+    """Trace for a request made inside a span (None outside spans).
+
+    Sets ``connection_reused`` and ``connect_ms`` (0 when reused) on the
+    current span.
+    """
+    s = get_current_span()
+    if s is None:
+        return None
+    s.set(connection_reused=True, connect_ms=0.0)
+    return _ConnectionTrace(s)
+
+
+def _trace_connection(request: httpx.Request) -> None:
+    """Request hook: trace connection setup of requests made inside a span."""
+    connection_trace = _start_trace()
+    if connection_trace is not None:
+        request.extensions["trace"] = connection_trace.record
+
+
+async def _atrace_connection(request: httpx.Request) -> None:
+    """Async request hook: as ``_trace_connection``."""
+    connection_trace = _start_trace()
+    if connection_trace is not None:
+        request.extensions["trace"] = connection_trace.arecord
+
+
+def _limits(config: HttpConfig) -> httpx.Limits:
+    """Pool limits from config."""
+    return httpx.Limits(
+        max_connections=config.max_connections,
+        max_keepalive_connections=config.max_keepalive_connections,
+        keepalive_expiry=config.keepalive_expiry,
+    )
+
+
+def _cassette_transport(
+    config: HttpConfig, transport: httpx.BaseTransport | None
+) -> httpx.BaseTransport | None:
+    """Transport that records to or replays ``config.cassette``, if set."""
+    if config.cassette is None:
+        return transport
+    if config.cassette_mode is CassetteMode.REPLAY:
+        return ReplayTransport.from_file(config.cassette, config.replay_speed)
+    network = transport or httpx.HTTPTransport(limits=_limits(config))
+    return RecordingTransport(config.cassette, network)
+
+
+def _async_cassette_transport(
+    config: HttpConfig, transport: httpx.AsyncBaseTransport | None
+) -> httpx.AsyncBaseTransport | None:
+    """Async counterpart of ``_cassette_transport``."""
+    if config.cassette is None:
+        return transport
+    if config.cassette_mode is CassetteMode.REPLAY:
+        return ReplayTransport.from_file(config.cassette, config.replay_speed)
+    network = transport or httpx.AsyncHTTPTransport(limits=_limits(config))
+    return AsyncRecordingTransport(config.cassette, network)
+
+
+def create_http_client(
+    config: HttpConfig, transport: httpx.BaseTransport | None = None
+) -> httpx.Client:
+    """Create the keep-alive connection pool requests are sent through.
+
+    With ``config.cassette``, chat completions are recorded or replayed
+    (see ``cassette``).
+
+    Args:
+        config: Pool size, keep-alive and cassette settings
+        transport: Transport to use instead of the network (for tests)
+
+    Raises:
+        CassetteError: If the cassette to replay cannot be read
+    """
+    return httpx.Client(
+        timeout=REQUEST_TIMEOUT,
+        limits=_limits(config),
+        event_hooks={"request": [_trace_connection]},
+        transport=_cassette_transport(config, transport),
+    )
+
+
+def create_async_http_client(
+    config: HttpConfig, transport: httpx.AsyncBaseTransport | None = None
+) -> httpx.AsyncClient:
+    """Async counterpart of ``create_http_client``.
+
+    Args:
+        config: Pool size, keep-alive and cassette settings
+        transport: Transport to use instead of the network (for tests)
+
+    Raises:
+        CassetteError: If the cassette to replay cannot be read
+    """
+    return httpx.AsyncClient(
+        timeout=REQUEST_TIMEOUT,
+        limits=_limits(config),
+        event_hooks={"request": [_atrace_connection]},
+        transport=_async_cassette_transport(config, transport),
+    )
@@ -2,42 +2,145 @@
 
 from __future__ import annotations
 
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
+from functools import partial
 from typing import TYPE_CHECKING
 
 from ..models.message import Message
 from ..models.message import MessageRole
+from .context_window import estimate_tokens
 
 if TYPE_CHECKING:
     from ..models.tool import ToolCall
     from ..models.tool import ToolResult
+    from .blob_store import BlobStore
+    from .session_store import Session
+
+MAIN_BRANCH = "main"
+
+
+@dataclass(eq=False)
+class _Segment:
+    """Messages appended on one branch, after a prefix of its parent segment.
+
+    Segments are append-only. A fork sees its parent's first
+    ``parent_length`` messages, so later appends to the parent are invisible
+    to it.
+    """
+
+    parent: _Segment | None
+    parent_length: int
+    messages: list[Message] = field(default_factory=list)
+
+    def chain(self, length: int) -> list[Message]:
+        """The first length messages of the history ending in this segment."""
+        parts: list[list[Message]] = []
+        segment: _Segment | None = self
+        visible = length
+        while segment is not None:
+            offset = segment.parent_length if segment.parent is not None else 0
+            parts.append(segment.messages[: visible - offset])
+            visible = offset
+            segment = segment.parent
+        return [message for part in reversed(parts) for message in part]
+
+
+@dataclass(eq=False)
+class _Branch:
+    """A line of conversation: its own tip segment and API cache."""
+
+    id: str
+    tip: _Segment
+    length: int
+    # Stored session this branch writes to (only the branch it was opened on)
+    session: Session | None = None
+    # Reads the stored messages between the system prompt and the loaded tail
+    archived: Callable[[], list[Message]] | None = None
+    # API dicts of the branch's messages, built on first use after a fork
+    api_messages: list[dict[str, object]] | None = None
 
 
 class MessageRepository:
-    """Repository for managing chat messages."""
+    """Repository for managing chat messages.
+
+    The history can be forked: ``fork`` starts a branch that shares every
+    message so far with its parent in O(1), and ``switch`` changes which
+    branch messages are added to and read from. Each branch keeps its own
+    list of API dicts, built on first use.
 
-    def __init__(self, system_prompt: str) -> None:
-        """Initialize message repository with system prompt."""
-        self._messages: list[Message] = [
-            Message(role=MessageRole.SYSTEM, content=system_prompt)
-        ]
+    With a ``Session``, every message added on the branch the session was
+    opened with is also written to the session store. The store keeps the
+    full log: ``replace_range`` and ``clear`` start a new history in the
+    session rather than changing stored messages. Other branches are not
+    stored.
+
+    With a ``BlobStore``, contents long enough for it are moved to its file
+    as messages are added, and only a ``BlobRef`` stays in memory.
+    """
+
+    def __init__(
+        self,
+        system_prompt: str,
+        session: Session | None = None,
+        blobs: BlobStore | None = None,
+    ) -> None:
+        """Initialize message repository with system prompt.
+
+        Args:
+            system_prompt: System prompt that starts the conversation
+            session: Empty stored session to write messages to
+            blobs: Store for long message contents (None: keep in memory)
+        """
+        self._revision = 0
+        self._blobs = blobs
+        self._branch = _Branch(
+            MAIN_BRANCH, _Segment(None, 0), 0, session=session, api_messages=[]
+        )
+        self._branches = {MAIN_BRANCH: self._branch}
+        self._append(Message(role=MessageRole.SYSTEM, content=system_prompt))
+
+    @classmethod
+    def resume(
+        cls, session: Session, max_tokens: int, blobs: BlobStore | None = None
+    ) -> MessageRepository:
+        """Continue a stored conversation, loading only its latest turns.
+
+        Args:
+            session: Stored session with at least its system prompt
+            max_tokens: Token budget for the loaded turns; older messages are
+                read from the store only by ``get_all_messages``
+            blobs: Store for long message contents (None: keep in memory)
+        """
+        start, messages = session.load_tail(max_tokens)
+        repository = cls(messages[0].content, blobs=blobs)
+        for message in messages[1:]:
+            repository._append(message)
+        repository._branch.session = session
+        if start > session.head + 1:
+            repository._branch.archived = partial(session.load, session.head + 1, start)
+        return repository
 
     def add_user_message(self, content: str) -> None:
         """Add a user message to the conversation."""
-        self._messages.append(Message(role=MessageRole.USER, content=content))
+        self._append(Message(role=MessageRole.USER, content=content))
 
     def add_assistant_message(self, content: str) -> None:
         """Add an assistant message to the conversation."""
-        self._messages.append(Message(role=MessageRole.ASSISTANT, content=content))
+        self._append(Message(role=MessageRole.ASSISTANT, content=content))
 
     def add_assistant_tool_calls(self, tool_calls: list[ToolCall]) -> None:
         """Add an assistant message with tool calls."""
-        self._messages.append(
+        self._append(
             Message(role=MessageRole.ASSISTANT, content="", tool_calls=tool_calls)
         )
 
     def add_tool_result(self, result: ToolResult) -> None:
         """Add a tool result message."""
-        self._messages.append(
+        self._append(
             Message(
                 role=MessageRole.TOOL,
                 content=result.content,
@@ -46,16 +149,147 @@ class MessageRepository:
             )
         )
 
-    def get_messages_for_api(self) -> list[dict[str, object]]:
-        """Get all messages in API format."""
-        return [msg.to_dict() for msg in self._messages]
+    @property
+    def revision(self) -> int:
+        """Changes whenever messages are removed or replaced (not on append)."""
+        return self._revision
+
+    @property
+    def branch_id(self) -> str:
+        """ID of the active branch."""
+        return self._branch.id
+
+    @property
+    def branches(self) -> list[str]:
+        """IDs of all branches, in creation order."""
+        return list(self._branches)
+
+    def fork(self, branch_id: str | None = None) -> str:
+        """Start a branch from the end of the active branch (O(1)).
+
+        The active branch does not change; call ``switch`` to use the fork.
+
+        Args:
+            branch_id: ID for the new branch (default: generated)
+
+        Returns:
+            ID of the new branch
+
+        Raises:
+            ValueError: If a branch with that ID already exists
+        """
+        branch_id = branch_id or f"br_{uuid.uuid4().hex[:8]}"
+        if branch_id in self._branches:
+            msg = f"Branch '{branch_id}' already exists."
+            raise ValueError(msg)
+        parent = self._branch
+        self._branches[branch_id] = _Branch(
+            branch_id,
+            _Segment(parent.tip, parent.length),
+            parent.length,
+            archived=parent.archived,
+        )
+        return branch_id
+
+    def switch(self, branch_id: str) -> None:
+        """Make a branch the active one.
+
+        Args:
+            branch_id: ID of the branch
+
+        Raises:
+            KeyError: If the branch does not exist
+        """
+        if branch_id not in self._branches:
+            available = ", ".join(self._branches)
+            msg = f"Unknown branch '{branch_id}'. Branches: {available}."
+            raise KeyError(msg)
+        if branch_id != self._branch.id:
+            self._branch = self._branches[branch_id]
+            self._revision += 1
+
+    def __len__(self) -> int:
+        """Number of messages, including the system prompt."""
+        return self._branch.length
+
+    def get_messages_for_api(self, start: int = 0) -> list[dict[str, object]]:
+        """Get messages in API format.
+
+        The list is new, but the dicts are each message's cached
+        representation; do not mutate them.
+
+        Args:
+            start: Index of the first message to include
+        """
+        return self._api_messages()[start:]
 
     def get_all_messages(self) -> list[Message]:
-        """Get all messages."""
-        return self._messages.copy()
+        """Get all messages, reading any not loaded on resume from the store."""
+        branch = self._branch
+        messages = branch.tip.chain(branch.length)
+        if branch.archived is None:
+            return messages
+        return [messages[0], *branch.archived(), *messages[1:]]
+
+    def replace_range(self, start: int, end: int, message: Message) -> None:
+        """Replace messages[start:end] with a single message.
+
+        Args:
+            start: Index of the first message to replace
+            end: Index after the last message to replace
+            message: Message that takes their place
+        """
+        branch = self._branch
+        messages = branch.tip.chain(branch.length)
+        messages[start:end] = [self._spill(message)]
+        if branch.session is not None:
+            # Resume loads the stored history, so it must match this one
+            stored = messages
+            if branch.archived is not None:
+                stored = [messages[0], *branch.archived(), *messages[1:]]
+            branch.session.rewrite([(m, estimate_tokens(m.api_dict)) for m in stored])
+        self._rebase(messages)
 
     def clear(self) -> None:
         """Clear all messages except system message."""
-        if self._messages:
-            system_msg = self._messages[0]
-            self._messages = [system_msg]
+        branch = self._branch
+        self._rebase(branch.tip.chain(1))
+        branch.archived = None
+        if branch.session is not None:
+            system = branch.tip.messages[0]
+            branch.session.restart(system, estimate_tokens(system.api_dict))
+
+    def _rebase(self, messages: list[Message]) -> None:
+        """Give the active branch a new history without touching shared ones."""
+        branch = self._branch
+        branch.tip = _Segment(None, 0, messages)
+        branch.length = len(messages)
+        branch.api_messages = [message.api_dict for message in messages]
+        self._revision += 1
+
+    def _api_messages(self) -> list[dict[str, object]]:
+        """The active branch's API dicts, built on first use."""
+        branch = self._branch
+        if branch.api_messages is None:
+            branch.api_messages = [
+                message.api_dict for message in branch.tip.chain(branch.length)
+            ]
+        return branch.api_messages
+
+    def _append(self, message: Message) -> None:
+        """Add a message and its serialized API form, and store it."""
+        branch = self._branch
+        if branch.session is not None:
+            # Before spilling, so the session gets the text without a read
+            branch.session.append(message, estimate_tokens(message.api_dict))
+        message = self._spill(message)
+        branch.tip.messages.append(message)
+        branch.length += 1
+        if branch.api_messages is not None:
+            branch.api_messages.append(message.api_dict)
+
+    def _spill(self, message: Message) -> Message:
+        """Move a long content to the blob store, if there is one."""
+        if self._blobs is None or not self._blobs.should_store(message.content):
+            return message
+        return replace(message, content="", blob=self._blobs.put(message.content))
@@ -0,0 +1,160 @@
+"""Streams watched for stalls and continued after one.
+
+A stream is read on a worker thread, so the reader can give up on it when
+no chunk arrives for ``HttpConfig.stream_idle_timeout`` seconds, even if
+the socket read is still blocked. The stalled response is closed and a
+continuation request is sent with the partial assistant content appended,
+so the model carries on where it stopped.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import queue
+import threading
+import time
+from collections.abc import Callable
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from ..tracing import Span
+from .hedging import StartedStream
+
+if TYPE_CHECKING:
+    from ..models.config import HttpConfig
+
+
+class StreamStalledError(Exception):
+    """No chunk arrived within the idle timeout."""
+
+    def __init__(self, idle_timeout: float) -> None:
+        """Initialize with the timeout that ran out.
+
+        Args:
+            idle_timeout: Seconds waited for the next chunk
+        """
+        self.idle_timeout = idle_timeout
+        super().__init__(f"Stream stalled: no data for {idle_timeout:g}s")
+
+
+@dataclass
+class _End:
+    """Marks the end of a watched stream."""
+
+    error: Exception | None = None
+
+
+def watch[T](chunks: Iterator[T], idle_timeout: float) -> Iterator[T]:
+    """Yield ``chunks`` as read on a thread, giving up on a stall.
+
+    Args:
+        chunks: Chunks of a stream
+        idle_timeout: Seconds to wait for each chunk
+
+    Yields:
+        The chunks, in order
+
+    Raises:
+        StreamStalledError: If a chunk takes longer than ``idle_timeout``
+    """
+    items: queue.SimpleQueue[T | _End] = queue.SimpleQueue()
+
+    def _pump() -> None:
+        try:
+            for chunk in chunks:
+                items.put(chunk)
+        except Exception as e:
+            items.put(_End(e))
+        else:
+            items.put(_End())
+
+    threading.Thread(
+        target=contextvars.copy_context().run,
+        args=(_pump,),
+        name="llm-stream",
+        daemon=True,
+    ).start()
+
+    while True:
+        try:
+            item = items.get(timeout=idle_timeout)
+        except queue.Empty:
+            raise StreamStalledError(idle_timeout) from None
+        if isinstance(item, _End):
+            if item.error is not None:
+                raise item.error
+            return
+        yield item
+
+
+class ResumableStream[T]:
+    """Chunks of a streamed completion that can be continued after a stall.
+
+    Iterating raises ``StreamStalledError`` when the stream stalls. The consumer
+    then calls ``resume`` with the content received so far and iterates
+    again. Stalls (``stalls``) and the time from a stall to the first chunk
+    of its continuation (``stall_recovery_ms``, summed) are recorded on the
+    span, as is the total of requests sent (``attempts``).
+    """
+
+    def __init__(
+        self,
+        stream: StartedStream[T],
+        restart: Callable[[str], StartedStream[T]],
+        config: HttpConfig,
+        span: Span,
+    ) -> None:
+        """Initialize with a started stream.
+
+        Args:
+            stream: The stream to read first
+            restart: Starts a continuation after the given partial content
+            config: HTTP configuration (idle timeout and resume limit)
+            span: Span to record stalls on
+        """
+        self._stream = stream
+        self._restart = restart
+        self._config = config
+        self._span = span
+        self._chunks = self._watch(stream)
+        self._attempts = stream.attempts
+        self._stalls = 0
+        self._recovery_ms = 0.0
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterate over chunks of the current stream."""
+        return self._chunks
+
+    @property
+    def can_resume(self) -> bool:
+        """Whether another continuation may be sent."""
+        return self._stalls < self._config.max_stall_resumes
+
+    def resume(self, partial_content: str) -> None:
+        """Replace the stalled stream with a continuation.
+
+        Args:
+            partial_content: Assistant content received before the stall
+        """
+        stalled_at = time.perf_counter()
+        self._stalls += 1
+        self._span.set(stalls=self._stalls)
+        self._stream.close()
+
+        self._stream = self._restart(partial_content)
+        self._chunks = self._watch(self._stream)
+        self._attempts += self._stream.attempts
+        self._recovery_ms += (time.perf_counter() - stalled_at) * 1000
+        self._span.set(attempts=self._attempts, stall_recovery_ms=self._recovery_ms)
+
+    def close(self) -> None:
+        """Close the current response."""
+        self._stream.close()
+
+    def _watch(self, stream: StartedStream[T]) -> Iterator[T]:
+        """Watch a stream for stalls, unless the idle timeout is disabled."""
+        idle_timeout = self._config.stream_idle_timeout
+        if idle_timeout <= 0:
+            return stream.chunks
+        return watch(stream.chunks, idle_timeout)
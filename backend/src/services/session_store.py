@@ -0,0 +1,248 @@
+"""SQLite-backed, append-only storage for conversations."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from ..models.message import Message
+from .blob_store import rehydrate
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    opened_at REAL NOT NULL,
+    head_seq INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS messages (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    tokens INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID;
+"""
+
+
+class SessionStore:
+    """Database of conversations, one row per message.
+
+    Messages are stored in API format with their token estimate, so a
+    resumed conversation can load just the tail that fits in a request.
+    """
+
+    def __init__(self, db_path: str | Path) -> None:
+        """Open (or create) the database.
+
+        Args:
+            db_path: SQLite database path
+        """
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(db_path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;")
+        self._conn.executescript(_SCHEMA)
+
+    def create(self) -> Session:
+        """Start a new, empty session."""
+        session_id = f"ses_{uuid.uuid4().hex[:12]}"
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sessions (id, created_at, opened_at) VALUES (?, ?, ?)",
+                (session_id, now, now),
+            )
+        return Session(self._conn, self._lock, session_id, head=0, length=0)
+
+    def open(self, session_id: str) -> Session:
+        """Open an existing session.
+
+        Args:
+            session_id: ID returned by ``Session.id``
+
+        Raises:
+            KeyError: If the session does not exist
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT head_seq FROM sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                msg = f"Unknown session '{session_id}'."
+                raise KeyError(msg)
+            self._conn.execute(
+                "UPDATE sessions SET opened_at = ? WHERE id = ?",
+                (time.time(), session_id),
+            )
+            (length,) = self._conn.execute(
+                "SELECT COALESCE(MAX(seq) + 1, 0) FROM messages WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+        return Session(self._conn, self._lock, session_id, row[0], length)
+
+    def latest(self) -> Session | None:
+        """Open the most recently created or opened session, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM sessions ORDER BY opened_at DESC LIMIT 1"
+            ).fetchone()
+        return self.open(row[0]) if row else None
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class Session:
+    """One stored conversation.
+
+    Sequence numbers count every message ever appended. ``head`` is the
+    sequence number of the system prompt that starts the current history
+    (it moves forward when the conversation is cleared).
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        lock: threading.Lock,
+        session_id: str,
+        head: int,
+        length: int,
+    ) -> None:
+        """Initialize the handle; use ``SessionStore.create`` or ``open``."""
+        self._conn = conn
+        self._lock = lock
+        self._id = session_id
+        self._head = head
+        self._length = length
+
+    @property
+    def id(self) -> str:
+        """Session ID, for resuming later."""
+        return self._id
+
+    @property
+    def head(self) -> int:
+        """Sequence number of the current history's system prompt."""
+        return self._head
+
+    def __len__(self) -> int:
+        """Number of messages ever appended."""
+        return self._length
+
+    def append(self, message: Message, tokens: int) -> None:
+        """Store a message (one INSERT).
+
+        Args:
+            message: Message to store
+            tokens: Estimated prompt tokens of the message
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO messages (session_id, seq, role, tokens, body) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    self._id,
+                    self._length,
+                    message.role.value,
+                    tokens,
+                    json.dumps(rehydrate(message.api_dict), ensure_ascii=False),
+                ),
+            )
+        self._length += 1
+
+    def restart(self, system_prompt: Message, tokens: int) -> None:
+        """Start a new history in this session, beginning with system_prompt."""
+        self.rewrite([(system_prompt, tokens)])
+
+    def rewrite(self, messages: list[tuple[Message, int]]) -> None:
+        """Start a new history holding the given messages, in one transaction.
+
+        The old history stays in the log; only ``head`` moves past it.
+
+        Args:
+            messages: Messages with their estimated prompt tokens, system
+                prompt first
+        """
+        head = self._length
+        rows = [
+            (
+                self._id,
+                head + offset,
+                message.role.value,
+                tokens,
+                json.dumps(rehydrate(message.api_dict), ensure_ascii=False),
+            )
+            for offset, (message, tokens) in enumerate(messages)
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO messages (session_id, seq, role, tokens, body) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute(
+                    "UPDATE sessions SET head_seq = ? WHERE id = ?", (head, self._id)
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        self._length += len(rows)
+        self._head = head
+
+    def load_tail(self, max_tokens: int) -> tuple[int, list[Message]]:
+        """Load the system prompt and the latest turns that fit the budget.
+
+        Whole user turns are loaded, newest first, while their estimated
+        tokens fit in max_tokens; the latest turn is always loaded. Only
+        (seq, role, tokens) of the skipped messages are read.
+
+        Args:
+            max_tokens: Token budget for the turns
+
+        Returns:
+            Sequence number of the first loaded turn message, and the
+            messages (system prompt first)
+        """
+        first_user: int | None = None
+        total = 0
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, role, tokens FROM messages "
+                "WHERE session_id = ? AND seq > ? ORDER BY seq DESC",
+                (self._id, self._head),
+            )
+            for seq, role, tokens in rows:
+                total += tokens
+                if role != "user":
+                    continue
+                if total > max_tokens and first_user is not None:
+                    break
+                first_user = seq
+
+        start = self._head + 1 if first_user is None else first_user
+        system = self.load(self._head, self._head + 1)
+        return start, system + self.load(start, self._length)
+
+    def load(self, start: int, end: int) -> list[Message]:
+        """Load stored messages with start <= seq < end."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT body FROM messages "
+                "WHERE session_id = ? AND seq >= ? AND seq < ? ORDER BY seq",
+                (self._id, start, end),
+            ).fetchall()
+        return [Message.from_dict(json.loads(body)) for (body,) in rows]
@@ -0,0 +1,201 @@
+"""Incremental parser for streamed chat completions.
+
+Reads the server-sent events of an OpenAI-compatible chat completions
+stream straight from the response bytes and turns each ``data:`` event into
+a small slotted ``StreamDelta``, without building the SDK's chunk models.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncGenerator
+from collections.abc import AsyncIterable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+# Relative to ChatConfig.base_url, as used by the SDK
+CHAT_COMPLETIONS_PATH = "chat/completions"
+
+_DATA = b"data:"
+_DONE = b"[DONE]"
+
+
+class StreamError(Exception):
+    """The API reported an error in the middle of a stream."""
+
+
+@dataclass(slots=True)
+class ToolCallDelta:
+    """Part of a streamed tool call."""
+
+    index: int
+    id: str | None = None
+    name: str | None = None
+    arguments: str | None = None
+
+
+@dataclass(slots=True)
+class StreamDelta:
+    """Delta of the first choice of one streamed chunk."""
+
+    reasoning_content: str | None = None
+    content: str | None = None
+    tool_calls: list[ToolCallDelta] | None = None
+
+
+def completions_url(base_url: str) -> str:
+    """Return the chat completions endpoint for an API base URL."""
+    return f"{base_url.rstrip('/')}/{CHAT_COMPLETIONS_PATH}"
+
+
+def stream_headers(api_key: str) -> dict[str, str]:
+    """Return the headers for a streamed completion request."""
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Accept": "text/event-stream",
+        "Content-Type": "application/json",
+    }
+
+
+def stream_body(
+    model: str,
+    messages: list[dict[str, object]],
+    tools_json: str,
+) -> bytes:
+    """Return the JSON body for a streamed completion request.
+
+    Args:
+        model: Model name
+        messages: Messages in API format
+        tools_json: Tool schemas as a JSON array (see
+            ``ToolRegistry.schemas_json``), embedded as is
+    """
+    head = json.dumps(
+        {"model": model, "messages": messages, "stream": True, "tool_choice": "auto"},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return f'{head[:-1]},"tools":{tools_json}}}'.encode()
+
+
+class SSEParser:
+    """Turns response bytes into deltas, one ``data:`` line per event.
+
+    Bytes may be fed in arbitrary pieces; an incomplete trailing line is
+    kept until the rest arrives. Other fields (``event:``, ``id:``,
+    comments) are ignored, as chat completion streams do not use them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty parser."""
+        self._buffer = b""
+        self.done = False
+
+    def feed(self, data: bytes) -> list[StreamDelta]:
+        """Parse the complete lines in ``data`` and any buffered bytes.
+
+        Args:
+            data: Next bytes of the response body
+
+        Returns:
+            Deltas of the events completed by ``data`` (none once done)
+
+        Raises:
+            StreamError: If the API reports an error event
+        """
+        if self.done:
+            return []
+        lines = (self._buffer + data).split(b"\n")
+        self._buffer = lines.pop()
+
+        deltas = []
+        for line in lines:
+            if not line.startswith(_DATA):
+                continue
+            payload = line[5:].strip()
+            if payload == _DONE:
+                self.done = True
+                break
+            deltas.append(_parse_delta(payload))
+        return deltas
+
+
+def _parse_delta(payload: bytes) -> StreamDelta:
+    """Parse one event payload into a delta."""
+    chunk = json.loads(payload)
+    if not isinstance(chunk, dict):
+        msg = f"Unexpected event in stream: {payload[:100]!r}"
+        raise StreamError(msg)
+    if chunk.get("error"):
+        msg = f"API error during streaming: {chunk['error']}"
+        raise StreamError(msg)
+
+    choices = chunk.get("choices")
+    if not choices:
+        return StreamDelta()
+    delta = choices[0].get("delta") or {}
+
+    tool_calls = delta.get("tool_calls")
+    if tool_calls:
+        tool_calls = [_parse_tool_call(call) for call in tool_calls]
+    return StreamDelta(
+        delta.get("reasoning_content"), delta.get("content"), tool_calls or None
+    )
+
+
+def _parse_tool_call(call: dict[str, object]) -> ToolCallDelta:
+    """Parse one tool call delta."""
+    function = call.get("function")
+    name: str | None = None
+    arguments: str | None = None
+    if isinstance(function, dict):
+        name = function.get("name")
+        arguments = function.get("arguments")
+    index = call.get("index")
+    call_id = call.get("id")
+    return ToolCallDelta(
+        index if isinstance(index, int) else 0,
+        call_id if isinstance(call_id, str) else None,
+        name,
+        arguments,
+    )
+
+
+def iter_deltas(data: Iterable[bytes]) -> Iterator[StreamDelta]:
+    """Parse a streamed response body into deltas.
+
+    Args:
+        data: Response body, in pieces as received
+
+    Yields:
+        One delta per event, until ``[DONE]``
+    """
+    parser = SSEParser()
+    for piece in data:
+        yield from parser.feed(piece)
+        if parser.done:
+            return
+    # A last event without a trailing newline
+    yield from parser.feed(b"\n")
+
+
+async def aiter_deltas(
+    data: AsyncIterable[bytes],
+) -> AsyncGenerator[StreamDelta, None]:
+    """Async variant of ``iter_deltas``.
+
+    Args:
+        data: Response body, in pieces as received
+
+    Yields:
+        One delta per event, until ``[DONE]``
+    """
+    parser = SSEParser()
+    async for piece in data:
+        for delta in parser.feed(piece):
+            yield delta
+        if parser.done:
+            return
+    for delta in parser.feed(b"\n"):
+        yield delta
@@ -2,26 +2,92 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
 import json
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
+from pydantic import BaseModel
 from pydantic import ValidationError
 
+from ..models.config import ToolIsolation
+from ..models.config import ToolsConfig
 from ..models.tool import ToolCall
 from ..models.tool import ToolResult
+from ..tools import AnyTool
+from ..tools import ToolRegistry
+from ..tools import get_tool_output_store
 from ..tools import get_tool_registry
 from ..tools.errors import ToolError
+from ..tools.errors import ToolTimeoutError
+from ..tracing import Span
 from ..tracing import SpanKind
 from ..tracing import TracingConfig
 from ..tracing import span
+from .tool_process_pool import ToolProcessPool
+from .tool_result_cache import ToolResultCache
+
+
+def _execute_with_deadline(tool: AnyTool, args: BaseModel, timeout: float) -> str:
+    """Run a tool on its own thread and stop waiting after timeout seconds.
+
+    Threads cannot be killed, so an overrunning call keeps running in the
+    background (as a daemon) while the caller gets a timeout error.
+    """
+    future: Future[str] = Future()
+
+    def _target() -> None:
+        try:
+            future.set_result(tool.execute(args))
+        except Exception as e:
+            future.set_exception(e)
+
+    thread = threading.Thread(
+        target=contextvars.copy_context().run,
+        args=(_target,),
+        name=f"tool-{tool.name}",
+        daemon=True,
+    )
+    thread.start()
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError as e:
+        raise ToolTimeoutError(tool.name, timeout, killed=False) from e
 
 
 class ToolExecutor:
     """Executes tool calls and returns results."""
 
-    def __init__(self, tracing_config: TracingConfig | None = None) -> None:
-        """Initialize tool executor with available tools."""
-        self._tools = get_tool_registry()
+    def __init__(
+        self,
+        tracing_config: TracingConfig | None = None,
+        tools_config: ToolsConfig | None = None,
+        tools: Mapping[str, AnyTool] | None = None,
+    ) -> None:
+        """Initialize tool executor with available tools.
+
+        Args:
+            tracing_config: Optional tracing configuration
+            tools_config: Optional tool execution settings
+            tools: Tool name -> tool mapping (defaults to the shared registry)
+        """
+        self._registry = (
+            ToolRegistry(list(tools.values()))
+            if tools is not None
+            else get_tool_registry()
+        )
         self._tracing_config = tracing_config or TracingConfig()
+        self._tools_config = tools_config or ToolsConfig()
+        self._pool: ThreadPoolExecutor | None = None
+        self._process_pool: ToolProcessPool | None = None
+        self._cache = ToolResultCache(self._tools_config.cache_entries)
+        self._speculations: dict[str, tuple[ToolCall, Future[ToolResult]]] = {}
+        self._stream_end: float | None = None
 
     def execute(self, tool_call: ToolCall) -> ToolResult:
         """Execute a tool call and return the result.
@@ -32,62 +98,331 @@ class ToolExecutor:
         Returns:
             ToolResult with the execution result or error
         """
+        return self._execute(tool_call, speculative=False)
+
+    def execute_many(self, tool_calls: list[ToolCall]) -> list[ToolResult]:
+        """Execute tool calls, running parallel-safe calls concurrently.
+
+        Consecutive parallel-safe calls run together on a bounded thread
+        pool; any other call waits for the batch before it and runs alone.
+        Each call runs in a copy of the caller's context, so its span nests
+        under the span active here. Calls already started by ``speculate``
+        are collected instead of being run again.
+
+        Args:
+            tool_calls: Tool calls from a single assistant turn
+
+        Returns:
+            ToolResults in the same order as tool_calls
+        """
+        results: list[ToolResult] = []
+        batch: list[ToolCall] = []
+
+        for tool_call in tool_calls:
+            if self._is_parallel_safe(tool_call):
+                batch.append(tool_call)
+                continue
+            results.extend(self._execute_batch(batch))
+            batch = []
+            speculation = self._take_speculation(tool_call)
+            if speculation is not None:
+                results.append(speculation.result())
+            else:
+                results.append(self.execute(tool_call))
+
+        results.extend(self._execute_batch(batch))
+        return results
+
+    async def aexecute(self, tool_call: ToolCall) -> ToolResult:
+        """Execute a tool call on a worker thread; see ``execute``.
+
+        ``asyncio.to_thread`` copies the caller's context, so the tool span
+        nests under the span active in the awaiting task.
+        """
+        return await asyncio.to_thread(self.execute, tool_call)
+
+    async def aexecute_many(self, tool_calls: list[ToolCall]) -> list[ToolResult]:
+        """Async counterpart of ``execute_many``, with the same batching.
+
+        Sync tools run on worker threads, so the event loop stays free.
+        Calls in a parallel-safe batch are awaited together, at most
+        ``max_parallel`` at a time.
+
+        Args:
+            tool_calls: Tool calls from a single assistant turn
+
+        Returns:
+            ToolResults in the same order as tool_calls
+        """
+        results: list[ToolResult] = []
+        batch: list[ToolCall] = []
+
+        for tool_call in tool_calls:
+            if self._is_parallel_safe(tool_call):
+                batch.append(tool_call)
+                continue
+            results.extend(await self._aexecute_batch(batch))
+            batch = []
+            results.append(await self._acollect(tool_call))
+
+        results.extend(await self._aexecute_batch(batch))
+        return results
+
+    def begin_stream(self) -> None:
+        """Start a new speculation window for an incoming LLM stream.
+
+        Speculations left over from an earlier stream are dropped.
+        """
+        self._speculations.clear()
+        self._stream_end = None
+
+    def speculate(self, tool_call: ToolCall) -> bool:
+        """Start a read-only tool call before the stream has finished.
+
+        The call only starts if the tool is read-only and its arguments are
+        already complete JSON. ``execute_many`` later collects the result.
+
+        Args:
+            tool_call: A fully streamed tool call
+
+        Returns:
+            True if execution was started
+        """
+        tool = self._lookup(tool_call.name)
+        if tool is None or not tool.read_only:
+            return False
+        if tool_call.id in self._speculations:
+            return False
+
+        try:
+            json.loads(tool_call.arguments or "{}")
+        except json.JSONDecodeError:
+            return False
+
+        future = self._submit(tool_call, speculative=True)
+        self._speculations[tool_call.id] = (tool_call, future)
+        return True
+
+    def end_stream(self) -> None:
+        """Mark the end of the LLM stream for time-saved accounting."""
+        self._stream_end = time.perf_counter()
+
+    def shutdown(self) -> None:
+        """Release worker threads and processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+
+    def _execute(self, tool_call: ToolCall, *, speculative: bool) -> ToolResult:
+        """Execute a tool call inside a tool span."""
         with span("tool", kind=SpanKind.TOOL) as s:
-            s.set(tool_name=tool_call.name, tool_call_id=tool_call.id)
+            s.set(
+                tool_name=tool_call.name,
+                tool_call_id=tool_call.id,
+                speculative=speculative,
+            )
             if self._tracing_config.include_sensitive_data:
                 s.set(arguments=tool_call.arguments)
 
-            if tool_call.name not in self._tools:
-                available = ", ".join(self._tools.keys())
-                result = self._error_result(
-                    tool_call,
-                    f"Unknown tool '{tool_call.name}'. Available: {available}.",
-                )
-                s.set(is_error=True, error_type="unknown_tool")
-                return result
-
-            tool = self._tools[tool_call.name]
-
-            try:
-                raw_arguments = (
-                    json.loads(tool_call.arguments) if tool_call.arguments else {}
-                )
-                parsed_args = tool.parse_arguments(raw_arguments)
-                tool_output = tool.execute(parsed_args)
-
-                s.set(is_error=False, result_len=len(tool_output))
-                if self._tracing_config.include_sensitive_data:
-                    s.set(result=tool_output)
-                return ToolResult(
-                    tool_call_id=tool_call.id,
-                    name=tool_call.name,
-                    content=tool_output,
-                )
-
-            except json.JSONDecodeError as e:
-                s.set(is_error=True, error_type="json_decode")
-                return self._error_result(
-                    tool_call,
-                    f"Invalid JSON in arguments. {e.msg}.",
-                )
-
-            except ValidationError as e:
-                s.set(is_error=True, error_type="validation")
-                return self._error_result(
-                    tool_call,
-                    self._format_validation_error(e),
-                )
-
-            except ToolError as e:
-                s.set(is_error=True, error_type="tool_error")
-                return self._error_result(tool_call, e.message)
-
-            except Exception as e:
-                s.set(is_error=True, error_type=type(e).__name__)
-                return self._error_result(
-                    tool_call,
-                    f"Unexpected error: {type(e).__name__}: {e}",
-                )
+            started = time.perf_counter()
+            result = self._run_tool(tool_call, s)
+
+            if speculative:
+                s.set(speculation_saved_ms=self._hidden_ms(started))
+            return result
+
+    def _run_tool(self, tool_call: ToolCall, s: Span) -> ToolResult:
+        """Validate arguments, run the tool and record the outcome on s."""
+        if tool_call.name not in self._registry:
+            available = ", ".join(self._registry.names())
+            result = self._error_result(
+                tool_call,
+                f"Unknown tool '{tool_call.name}'. Available: {available}.",
+            )
+            s.set(is_error=True, error_type="unknown_tool")
+            return result
+
+        try:
+            tool = self._registry[tool_call.name]
+            parsed_args = tool.parse_json_arguments(tool_call.arguments)
+            tool_output = self._within_budget(
+                tool, self._invoke_cached(tool, parsed_args, s), s
+            )
+
+            s.set(is_error=False, result_len=len(tool_output))
+            if self._tracing_config.include_sensitive_data:
+                s.set(result=tool_output)
+            return ToolResult(
+                tool_call_id=tool_call.id,
+                name=tool_call.name,
+                content=tool_output,
+            )
+
+        except json.JSONDecodeError as e:
+            s.set(is_error=True, error_type="json_decode")
+            return self._error_result(
+                tool_call,
+                f"Invalid JSON in arguments. {e.msg}.",
+            )
+
+        except ValidationError as e:
+            s.set(is_error=True, error_type="validation")
+            return self._error_result(
+                tool_call,
+                self._format_validation_error(e),
+            )
+
+        except ToolError as e:
+            timed_out = isinstance(e, ToolTimeoutError)
+            s.set(is_error=True, error_type="timeout" if timed_out else "tool_error")
+            return self._error_result(tool_call, e.message)
+
+        except Exception as e:
+            s.set(is_error=True, error_type=type(e).__name__)
+            return self._error_result(
+                tool_call,
+                f"Unexpected error: {type(e).__name__}: {e}",
+            )
+
+    def _invoke_cached(self, tool: AnyTool, args: BaseModel, s: Span) -> str:
+        """Run a tool, reusing the output of an identical earlier call."""
+        if not tool.cacheable or self._tools_config.cache_entries <= 0:
+            return self._invoke(tool, args, s)
+
+        key = (tool.name, args.model_dump_json(), tool.fingerprint(args))
+        output, status = self._cache.get_or_compute(
+            key, lambda: self._invoke(tool, args, s)
+        )
+        s.set(
+            cache=status.value,
+            cache_hits=self._cache.hits,
+            cache_misses=self._cache.misses,
+        )
+        return output
+
+    def _within_budget(self, tool: AnyTool, output: str, s: Span) -> str:
+        """Replace an over-budget output with its first page and a handle."""
+        budget = tool.max_output_chars
+        if budget is None:
+            budget = self._tools_config.max_output_chars
+        if budget <= 0 or len(output) <= budget:
+            return output
+
+        store = get_tool_output_store()
+        handle = store.put(output)
+        page = store.page(handle, 0, budget)
+        if page is None:
+            return output
+        s.set(truncated=True, output_chars=len(output), output_handle=handle)
+        return page.render()
+
+    def _invoke(self, tool: AnyTool, args: BaseModel, s: Span) -> str:
+        """Run a tool under its deadline in the configured isolation mode."""
+        try:
+            isolation = self._tools_config.isolation
+            if isolation == ToolIsolation.PROCESS and tool.isolatable:
+                return self._get_process_pool().run(tool, args, tool.timeout)
+            if tool.timeout is None:
+                return tool.execute(args)
+            return _execute_with_deadline(tool, args, tool.timeout)
+        except ToolTimeoutError as e:
+            s.set(timed_out=True, timeout_s=e.timeout, worker_killed=e.killed)
+            raise
+
+    def _get_process_pool(self) -> ToolProcessPool:
+        """Get or create the worker process pool."""
+        if self._process_pool is None:
+            self._process_pool = ToolProcessPool(self._tools_config.process_workers)
+        return self._process_pool
+
+    def _hidden_ms(self, started: float) -> float:
+        """Time a speculative call overlapped with the LLM stream."""
+        finished = time.perf_counter()
+        stream_end = self._stream_end
+        overlap_end = finished if stream_end is None else min(finished, stream_end)
+        return max(0.0, overlap_end - started) * 1000
+
+    def _is_parallel_safe(self, tool_call: ToolCall) -> bool:
+        """Check whether a call may share a batch with other calls."""
+        tool = self._lookup(tool_call.name)
+        # Unknown tools only produce an error result, so they never conflict.
+        return tool is None or tool.parallel_safe
+
+    def _lookup(self, name: str) -> AnyTool | None:
+        """Get a tool for scheduling decisions; load failures surface later."""
+        try:
+            return self._registry.get(name)
+        except Exception:
+            return None
+
+    def _execute_batch(self, batch: list[ToolCall]) -> list[ToolResult]:
+        """Execute a batch of parallel-safe calls, preserving order."""
+        futures: dict[str, Future[ToolResult]] = {}
+        for tool_call in batch:
+            speculation = self._take_speculation(tool_call)
+            if speculation is not None:
+                futures[tool_call.id] = speculation
+
+        pending = [tc for tc in batch if tc.id not in futures]
+        if len(pending) > 1 and self._tools_config.max_parallel > 1:
+            for tool_call in pending:
+                futures[tool_call.id] = self._submit(tool_call, speculative=False)
+
+        return [
+            futures[tool_call.id].result()
+            if tool_call.id in futures
+            else self.execute(tool_call)
+            for tool_call in batch
+        ]
+
+    async def _aexecute_batch(self, batch: list[ToolCall]) -> list[ToolResult]:
+        """Execute a batch of parallel-safe calls concurrently, in order."""
+        limit = asyncio.Semaphore(max(1, self._tools_config.max_parallel))
+
+        async def run(tool_call: ToolCall) -> ToolResult:
+            async with limit:
+                return await self._acollect(tool_call)
+
+        return list(await asyncio.gather(*(run(tool_call) for tool_call in batch)))
+
+    async def _acollect(self, tool_call: ToolCall) -> ToolResult:
+        """Await the speculative execution of a call, or run it."""
+        speculation = self._take_speculation(tool_call)
+        if speculation is not None:
+            return await asyncio.wrap_future(speculation)
+        return await self.aexecute(tool_call)
+
+    def _take_speculation(self, tool_call: ToolCall) -> Future[ToolResult] | None:
+        """Claim a speculative execution that matches the final tool call."""
+        speculation = self._speculations.pop(tool_call.id, None)
+        if speculation is None:
+            return None
+        speculated_call, future = speculation
+        if speculated_call != tool_call:
+            return None
+        return future
+
+    def _submit(self, tool_call: ToolCall, *, speculative: bool) -> Future[ToolResult]:
+        """Run a tool call on the pool in a copy of the current context."""
+        context = contextvars.copy_context()
+        return self._get_pool().submit(
+            context.run,
+            self._execute,
+            tool_call,
+            speculative=speculative,
+        )
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Get or create the thread pool for parallel execution."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._tools_config.max_parallel,
+                thread_name_prefix="tool",
+            )
+        return self._pool
 
     def _error_result(self, tool_call: ToolCall, message: str) -> ToolResult:
         """Create an error ToolResult."""
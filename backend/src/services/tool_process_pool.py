@@ -0,0 +1,191 @@
+"""Reusable worker processes for isolated tool execution."""
+
+from __future__ import annotations
+
+import contextlib
+import importlib
+import multiprocessing
+import pickle
+import queue
+import threading
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import TYPE_CHECKING
+
+from ..tools.errors import ToolError
+from ..tools.errors import ToolTimeoutError
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+    from ..tools import AnyTool
+
+# Tool classes are resolved by import path in the worker and instantiated
+# once per process, so tools must have a no-argument constructor.
+type _Request = tuple[str, str]
+type _Response = tuple[bool, object]
+
+_SHUTDOWN_GRACE_SECONDS = 1.0
+
+
+def _tool_target(tool: AnyTool) -> str:
+    """Import path of a tool's class, e.g. ``src.tools.read_file:ReadFileTool``."""
+    cls = type(tool)
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _load_tool(target: str, cache: dict[str, AnyTool]) -> AnyTool:
+    """Import and instantiate a tool class inside the worker."""
+    if target not in cache:
+        module_name, _, class_name = target.partition(":")
+        tool_class = getattr(importlib.import_module(module_name), class_name)
+        cache[target] = tool_class()
+    return cache[target]
+
+
+def _portable_error(error: Exception) -> Exception:
+    """Return the error itself if it can be pickled, else a stand-in."""
+    try:
+        pickle.dumps(error)
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
+    return error
+
+
+def _serve(conn: Connection[_Response, _Request | None]) -> None:
+    """Worker loop: run requested tools until told to stop."""
+    tools: dict[str, AnyTool] = {}
+    while True:
+        try:
+            request: _Request | None = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+
+        target, arguments = request
+        try:
+            tool = _load_tool(target, tools)
+            output = tool.execute(tool.args_model.model_validate_json(arguments))
+            response: _Response = (True, output)
+        except Exception as e:
+            response = (False, _portable_error(e))
+        conn.send(response)
+
+
+class _Worker:
+    """A worker process and the parent's end of its pipe."""
+
+    def __init__(self, context: multiprocessing.context.SpawnContext) -> None:
+        parent_conn, child_conn = context.Pipe()
+        self.conn: Connection[_Request | None, _Response] = parent_conn
+        self.process: BaseProcess = context.Process(
+            target=_serve,
+            args=(child_conn,),
+            name="tool-worker",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def kill(self) -> None:
+        """Terminate the process immediately."""
+        self.process.kill()
+        self.process.join(timeout=_SHUTDOWN_GRACE_SECONDS)
+        self.conn.close()
+
+    def stop(self) -> None:
+        """Ask the process to exit, killing it if it does not."""
+        with contextlib.suppress(OSError):
+            self.conn.send(None)
+        self.process.join(timeout=_SHUTDOWN_GRACE_SECONDS)
+        if self.process.is_alive():
+            self.process.kill()
+        self.conn.close()
+
+
+class ToolProcessPool:
+    """Runs tools in reusable worker processes that can be killed on overrun.
+
+    Workers start lazily on first use and are reused across calls. A call
+    that exceeds its timeout gets its worker killed and replaced, so a hung
+    tool never blocks later calls.
+    """
+
+    def __init__(self, size: int = 2) -> None:
+        """Initialize the pool.
+
+        Args:
+            size: Maximum number of worker processes
+        """
+        self._size = max(1, size)
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        self._started = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def run(self, tool: AnyTool, args: BaseModel, timeout: float | None) -> str:
+        """Execute a tool in a worker process.
+
+        Args:
+            tool: Tool to run (its class is re-created in the worker)
+            args: Validated arguments
+            timeout: Seconds to wait for a result (None: no limit)
+
+        Returns:
+            The tool output
+
+        Raises:
+            ToolTimeoutError: If the call overran and its worker was killed
+            ToolError: If the tool failed or its worker crashed
+        """
+        worker = self._acquire()
+        try:
+            worker.conn.send((_tool_target(tool), args.model_dump_json()))
+            if not worker.conn.poll(timeout):
+                worker.kill()
+                worker = self._replace()
+                raise ToolTimeoutError(tool.name, timeout or 0.0, killed=True)
+            ok, payload = worker.conn.recv()
+        except (EOFError, BrokenPipeError, ConnectionResetError) as e:
+            worker.kill()
+            worker = self._replace()
+            msg = f"Tool '{tool.name}' worker crashed. Retry the call."
+            raise ToolError(msg, retryable=True) from e
+        finally:
+            self._idle.put(worker)
+
+        if ok:
+            return str(payload)
+        if isinstance(payload, Exception):
+            raise payload
+        msg = f"Tool '{tool.name}' failed in its worker process."
+        raise ToolError(msg)
+
+    def shutdown(self) -> None:
+        """Stop all idle workers."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            worker.stop()
+
+    def _acquire(self) -> _Worker:
+        """Take an idle worker, starting one if the pool is not full."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._started < self._size and not self._closed:
+                self._started += 1
+                return _Worker(self._context)
+        return self._idle.get()
+
+    def _replace(self) -> _Worker:
+        """Start a fresh worker in place of a killed one."""
+        return _Worker(self._context)
@@ -0,0 +1,105 @@
+"""Bounded LRU cache for tool outputs with single-flight deduplication."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from collections.abc import Hashable
+from concurrent.futures import Future
+from enum import Enum
+
+
+class CacheStatus(Enum):
+    """How a cached lookup was served."""
+
+    HIT = "hit"
+    MISS = "miss"
+    SHARED = "shared"
+
+
+class ToolResultCache:
+    """LRU cache of tool outputs keyed by call identity.
+
+    Concurrent lookups for the same key share one computation: the first
+    caller runs it and the others wait for its result (single-flight).
+    Only successful outputs are stored; errors reach every waiting caller
+    and are retried on the next lookup.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of outputs kept
+        """
+        self._max_entries = max_entries
+        self._entries: OrderedDict[Hashable, str] = OrderedDict()
+        self._inflight: dict[Hashable, Future[str]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        """Lookups served from the cache or a shared in-flight call."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Lookups that had to run the computation."""
+        return self._misses
+
+    def __len__(self) -> int:
+        """Number of stored outputs."""
+        return len(self._entries)
+
+    def get_or_compute(
+        self, key: Hashable, compute: Callable[[], str]
+    ) -> tuple[str, CacheStatus]:
+        """Return the cached output for key, computing it at most once.
+
+        Args:
+            key: Hashable call identity
+            compute: Produces the output on a miss
+
+        Returns:
+            The output and how it was served
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key], CacheStatus.HIT
+
+            pending = self._inflight.get(key)
+            if pending is not None:
+                self._hits += 1
+            else:
+                leader: Future[str] = Future()
+                self._inflight[key] = leader
+                self._misses += 1
+
+        if pending is not None:
+            return pending.result(), CacheStatus.SHARED
+
+        try:
+            output = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            leader.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._inflight[key]
+            self._entries[key] = output
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        leader.set_result(output)
+        return output, CacheStatus.MISS
+
+    def clear(self) -> None:
+        """Drop all stored outputs."""
+        with self._lock:
+            self._entries.clear()
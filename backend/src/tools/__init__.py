@@ -1,43 +1,101 @@
-"""Tool registry - exports all available tools."""
+"""Tool registry - exports all available tools.
+
+Built-in tools are registered by import path, so their modules (and any
+heavy dependencies) load only when a tool is first executed. The tool
+classes below are still importable from this package; they resolve on
+first attribute access.
+"""
 
 from __future__ import annotations
 
-from pydantic import BaseModel
+import importlib
+import threading
+from typing import TYPE_CHECKING
 
+from ..config.paths import default_cache_dir
 from .base import BaseTool
 from .base import EmptyArgs
-from .current_time import CurrentTimeArgs
-from .current_time import CurrentTimeTool
 from .errors import ToolError
-from .random_date import RandomDateArgs
-from .random_date import RandomDateTool
-from .read_file import ReadFileArgs
-from .read_file import ReadFileTool
-
-# Type alias for any tool (used in registry)
-AnyTool = BaseTool[BaseModel]
-
-# Registry of all available tools
-# Note: Generic variance means we need type: ignore here.
-# At runtime this is fine - all tools implement the same interface.
-TOOLS: list[AnyTool] = [
-    CurrentTimeTool(),  # type: ignore[list-item]
-    RandomDateTool(),  # type: ignore[list-item]
-    ReadFileTool(),  # type: ignore[list-item]
-]
+from .output_store import ToolOutputStore
+from .output_store import get_tool_output_store
+from .registry import AnyTool
+from .registry import RegisteredTool
+from .registry import ToolRegistry
+from .registry import ToolSchemaCache
+
+if TYPE_CHECKING:
+    from .current_time import CurrentTimeArgs
+    from .current_time import CurrentTimeTool
+    from .random_date import RandomDateArgs
+    from .random_date import RandomDateTool
+    from .read_file import ReadFileArgs
+    from .read_file import ReadFileTool
+    from .read_more import ReadMoreArgs
+    from .read_more import ReadMoreTool
+
+    TOOLS: list[AnyTool]
+
+# Built-in tools: name -> "module:Class"
+BUILTIN_TOOLS = {
+    "get_current_time": f"{__name__}.current_time:CurrentTimeTool",
+    "get_random_date": f"{__name__}.random_date:RandomDateTool",
+    "read_file": f"{__name__}.read_file:ReadFileTool",
+    "read_more": f"{__name__}.read_more:ReadMoreTool",
+}
+
+_LAZY_EXPORTS = {
+    "CurrentTimeArgs": "current_time",
+    "CurrentTimeTool": "current_time",
+    "RandomDateArgs": "random_date",
+    "RandomDateTool": "random_date",
+    "ReadFileArgs": "read_file",
+    "ReadFileTool": "read_file",
+    "ReadMoreArgs": "read_more",
+    "ReadMoreTool": "read_more",
+}
+
+_registry: ToolRegistry | None = None
+_lock = threading.Lock()
+
+
+def get_tool_registry() -> ToolRegistry:
+    """Get the shared registry of built-in and entry-point tools."""
+    global _registry  # noqa: PLW0603
+    with _lock:
+        if _registry is None:
+            schema_cache = ToolSchemaCache(default_cache_dir() / "tool_schemas.json")
+            registry = ToolRegistry(schema_cache=schema_cache)
+            for name, target in BUILTIN_TOOLS.items():
+                registry.register_lazy(name, target)
+            registry.discover_entry_points()
+            _registry = registry
+        return _registry
 
 
 def get_tool_schemas() -> list[dict[str, object]]:
-    """Get all tool schemas for the API."""
-    return [tool.schema for tool in TOOLS]
+    """Get all tool schemas for the API (precomputed, do not mutate)."""
+    return get_tool_registry().schemas()
+
+
+def get_tool_schemas_json() -> str:
+    """Get all tool schemas as one pre-serialized JSON array."""
+    return get_tool_registry().schemas_json()
 
 
-def get_tool_registry() -> dict[str, AnyTool]:
-    """Get tool name -> tool instance mapping."""
-    return {tool.name: tool for tool in TOOLS}
+def __getattr__(name: str) -> object:
+    """Resolve tool classes and ``TOOLS`` on first access."""
+    if name == "TOOLS":
+        return list(get_tool_registry().tools().values())
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    module = importlib.import_module(f"{__name__}.{module_name}")
+    return getattr(module, name)
 
 
 __all__ = [
+    "BUILTIN_TOOLS",
     "TOOLS",
     "AnyTool",
     "BaseTool",
@@ -48,7 +106,15 @@ __all__ = [
     "RandomDateTool",
     "ReadFileArgs",
     "ReadFileTool",
+    "ReadMoreArgs",
+    "ReadMoreTool",
+    "RegisteredTool",
     "ToolError",
+    "ToolOutputStore",
+    "ToolRegistry",
+    "ToolSchemaCache",
+    "get_tool_output_store",
     "get_tool_registry",
     "get_tool_schemas",
+    "get_tool_schemas_json",
 ]
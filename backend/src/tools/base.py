@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import json
 from abc import ABC
 from abc import abstractmethod
+from collections.abc import Hashable
 
 from pydantic import BaseModel
+from pydantic import ValidationError
 
 
 class EmptyArgs(BaseModel):
@@ -20,6 +23,10 @@ class BaseTool[ArgsT: BaseModel](ABC):
     - description: Human-readable description for the LLM
     - args_model: Pydantic model class for arguments
     - execute: The implementation that receives validated arguments
+
+    Tools may also override execution hints such as ``timeout``,
+    ``parallel_safe``, ``read_only``, ``cacheable``, ``max_output_chars``
+    and ``isolatable``.
     """
 
     @property
@@ -65,6 +72,75 @@ class BaseTool[ArgsT: BaseModel](ABC):
             },
         }
 
+    @property
+    def parallel_safe(self) -> bool:
+        """Whether calls may run concurrently with other calls.
+
+        Override to return True for tools without side effects that depend
+        on execution order.
+        """
+        return False
+
+    @property
+    def timeout(self) -> float | None:
+        """Seconds a call may run before it is abandoned (None: no limit).
+
+        A deadline runs the call on a thread of its own, and a call that
+        overruns keeps running there, so only tools that may block (disk,
+        network, subprocesses) should override this.
+        """
+        return None
+
+    @property
+    def read_only(self) -> bool:
+        """Whether the tool is free of side effects.
+
+        Read-only calls may start speculatively while the model is still
+        streaming later tool calls. Override to return True when that is safe.
+        """
+        return False
+
+    @property
+    def cacheable(self) -> bool:
+        """Whether outputs may be reused for identical calls.
+
+        Override to return True for deterministic tools. Tools whose output
+        depends on external state should also override ``fingerprint``.
+        """
+        return False
+
+    @property
+    def max_output_chars(self) -> int | None:
+        """Output budget in characters (None: executor default, 0: no limit).
+
+        Longer outputs are stored for the session and the model receives the
+        first page plus a handle it can pass to ``read_more``.
+        """
+        return None
+
+    @property
+    def isolatable(self) -> bool:
+        """Whether the tool may run in a worker process.
+
+        Override to return False for tools that use state held by the
+        executor's process.
+        """
+        return True
+
+    def fingerprint(self, args: ArgsT) -> Hashable | None:
+        """Identify the external state a call's output depends on.
+
+        Cached outputs are only reused while the fingerprint is unchanged.
+
+        Args:
+            args: Validated arguments
+
+        Returns:
+            Hashable state identity, or None if the output depends only on args
+        """
+        _ = args
+        return None
+
     def parse_arguments(self, arguments: dict[str, object]) -> ArgsT:
         """Parse and validate arguments using the Pydantic model.
 
@@ -79,6 +155,32 @@ class BaseTool[ArgsT: BaseModel](ABC):
         """
         return self.args_model.model_validate(arguments)
 
+    def parse_json_arguments(self, arguments: str) -> ArgsT:
+        """Parse and validate a raw JSON arguments string in one pass.
+
+        Uses the model's compiled validator directly on the JSON text, with
+        no intermediate dict. An empty string means no arguments.
+
+        Args:
+            arguments: Raw arguments JSON from the model
+
+        Returns:
+            Validated Pydantic model instance
+
+        Raises:
+            json.JSONDecodeError: If the arguments are not valid JSON
+            pydantic.ValidationError: If validation fails
+        """
+        try:
+            return self.args_model.model_validate_json(arguments or "{}")
+        except ValidationError as e:
+            if not any(err["type"] == "json_invalid" for err in e.errors()):
+                raise
+        # Malformed JSON (rare): let the stdlib parser raise its error, which
+        # carries the message shown to the model. Input that only the stdlib
+        # accepts falls back to dict validation.
+        return self.parse_arguments(json.loads(arguments))
+
     @abstractmethod
     def execute(self, args: ArgsT) -> str:
         """Execute the tool with validated arguments.
@@ -39,6 +39,16 @@ class CurrentTimeTool(BaseTool[CurrentTimeArgs]):
         """Pydantic model class for arguments."""
         return CurrentTimeArgs
 
+    @property
+    def parallel_safe(self) -> bool:
+        """Safe to run concurrently with other calls."""
+        return True
+
+    @property
+    def read_only(self) -> bool:
+        """Has no side effects, so it may run speculatively."""
+        return True
+
     def execute(self, args: CurrentTimeArgs) -> str:
         """Get current time for a timezone.
 
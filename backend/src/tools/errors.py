@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+
 
 class ToolError(Exception):
     """Tool error with actionable message.
@@ -19,3 +21,46 @@ class ToolError(Exception):
         super().__init__(message)
         self.message = message
         self.retryable = retryable
+
+    def __reduce__(
+        self,
+    ) -> tuple[
+        Callable[..., ToolError],
+        tuple[type[ToolError], tuple[object, ...], dict[str, object]],
+    ]:
+        """Keep the type and attributes when the error crosses a process boundary.
+
+        Subclass constructors take other arguments than the message, so the
+        error is rebuilt from its state instead of by calling ``__init__``.
+        """
+        return (_restore, (type(self), self.args, dict(self.__dict__)))
+
+
+def _restore[E: ToolError](
+    cls: type[E], args: tuple[object, ...], state: dict[str, object]
+) -> E:
+    """Rebuild a pickled tool error without calling its constructor."""
+    error = cls.__new__(cls)
+    error.args = args
+    error.__dict__.update(state)
+    return error
+
+
+class ToolTimeoutError(ToolError):
+    """Tool call exceeded its deadline."""
+
+    def __init__(self, tool_name: str, timeout: float, *, killed: bool) -> None:
+        """Create a timeout error.
+
+        Args:
+            tool_name: Name of the tool that overran
+            timeout: Deadline in seconds
+            killed: Whether the worker running the tool was terminated
+        """
+        super().__init__(
+            f"Tool '{tool_name}' timed out after {timeout:g}s. "
+            "Retry with a smaller request.",
+            retryable=True,
+        )
+        self.timeout = timeout
+        self.killed = killed
@@ -0,0 +1,261 @@
+"""Persistent reverse-import index for Python workspaces."""
+
+from __future__ import annotations
+
+import ast
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from ..config.paths import default_cache_dir
+
+# Directories never scanned, in addition to hidden ones (.git, .venv, ...)
+_SKIP_DIRS = frozenset(
+    {"__pycache__", "build", "dist", "env", "node_modules", "site-packages", "venv"}
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    root TEXT NOT NULL,
+    path TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (root, path)
+);
+
+CREATE TABLE IF NOT EXISTS imports (
+    root TEXT NOT NULL,
+    path TEXT NOT NULL,
+    module TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS imports_file ON imports(root, path);
+"""
+
+type _Stamp = tuple[int, int]
+
+
+def imported_modules(source: str | bytes) -> set[str]:
+    """Get the module names a Python source imports.
+
+    Every component of a dotted import counts (``import a.b`` imports ``a``
+    and ``b``), and so does each name in ``from x import y`` since ``y`` may
+    be a submodule.
+
+    Args:
+        source: Python source code
+
+    Returns:
+        Imported module names
+
+    Raises:
+        SyntaxError: If the source does not parse
+    """
+    modules: set[str] = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                modules.update(alias.name.split("."))
+        elif isinstance(node, ast.ImportFrom):
+            if node.module:
+                modules.update(node.module.split("."))
+            modules.update(alias.name for alias in node.names if alias.name != "*")
+    return modules
+
+
+def _parse_file(path: Path) -> set[str]:
+    """Imported modules of a file; unreadable or invalid files import nothing."""
+    try:
+        return imported_modules(path.read_bytes())
+    except (OSError, SyntaxError, ValueError):
+        return set()
+
+
+class ImportIndex:
+    """Module name -> importing files, for every ``.py`` file under a root.
+
+    Imports are parsed with ``ast`` and persisted in SQLite, so a file is only
+    parsed again when its mtime or size changes, in this process or a later
+    one. Lookups are answered from memory; the workspace is re-scanned (stat
+    only) at most once per ``refresh_interval`` seconds.
+    """
+
+    def __init__(
+        self, root: Path, db_path: Path, refresh_interval: float = 2.0
+    ) -> None:
+        """Initialize the index and load its persisted state.
+
+        Args:
+            root: Workspace directory to index
+            db_path: SQLite database file
+            refresh_interval: Minimum seconds between workspace scans
+        """
+        self._root = root.resolve()
+        self._root_key = str(self._root)
+        self._refresh_interval = refresh_interval
+        self._last_scan: float | None = None
+        self._lock = threading.Lock()
+
+        self._files: dict[str, _Stamp] = {}
+        self._imports: dict[str, set[str]] = {}
+        self._importers: dict[str, set[str]] = {}
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._load()
+
+    @property
+    def root(self) -> Path:
+        """Indexed workspace directory."""
+        return self._root
+
+    def importers(self, module: str) -> list[str]:
+        """Get files importing a module, refreshing the index if it is due.
+
+        Args:
+            module: Module name (last dotted component, e.g. ``tool_executor``)
+
+        Returns:
+            Sorted workspace-relative POSIX paths of importing files
+        """
+        with self._lock:
+            now = time.monotonic()
+            last = self._last_scan
+            if last is None or now - last >= self._refresh_interval:
+                self._refresh()
+                self._last_scan = time.monotonic()
+            return sorted(self._importers.get(module, ()))
+
+    def refresh(self) -> int:
+        """Re-scan the workspace now.
+
+        Returns:
+            Number of files (re)parsed
+        """
+        with self._lock:
+            parsed = self._refresh()
+            self._last_scan = time.monotonic()
+            return parsed
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def _load(self) -> None:
+        """Load persisted files and imports for this root."""
+        for path, mtime_ns, size in self._conn.execute(
+            "SELECT path, mtime_ns, size FROM files WHERE root = ?",
+            (self._root_key,),
+        ):
+            self._files[path] = (mtime_ns, size)
+            self._imports[path] = set()
+        for path, module in self._conn.execute(
+            "SELECT path, module FROM imports WHERE root = ?",
+            (self._root_key,),
+        ):
+            self._imports.setdefault(path, set()).add(module)
+            self._importers.setdefault(module, set()).add(path)
+
+    def _scan(self) -> dict[str, _Stamp]:
+        """Stat every indexable file under the root."""
+        found: dict[str, _Stamp] = {}
+        prefix_len = len(self._root_key) + 1
+        stack = [self._root_key]
+        while stack:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        name = entry.name
+                        if not name.startswith(".") and name not in _SKIP_DIRS:
+                            stack.append(entry.path)
+                    elif entry.name.endswith(".py") and entry.is_file():
+                        stat = entry.stat()
+                        path = entry.path[prefix_len:].replace(os.sep, "/")
+                        found[path] = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    continue
+        return found
+
+    def _refresh(self) -> int:
+        """Parse changed files, drop deleted ones and persist the difference."""
+        current = self._scan()
+        changed = [
+            path for path, stamp in current.items() if self._files.get(path) != stamp
+        ]
+        removed = [path for path in self._files if path not in current]
+        if not changed and not removed:
+            return 0
+
+        parsed = {path: _parse_file(self._root / path) for path in changed}
+
+        for path in removed:
+            self._forget(path)
+            del self._files[path]
+        for path, modules in parsed.items():
+            self._forget(path)
+            self._files[path] = current[path]
+            self._imports[path] = modules
+            for module in modules:
+                self._importers.setdefault(module, set()).add(path)
+
+        stale = [(self._root_key, path) for path in (*removed, *changed)]
+        with self._conn:
+            self._conn.executemany(
+                "DELETE FROM files WHERE root = ? AND path = ?", stale
+            )
+            self._conn.executemany(
+                "DELETE FROM imports WHERE root = ? AND path = ?", stale
+            )
+            self._conn.executemany(
+                "INSERT INTO files (root, path, mtime_ns, size) VALUES (?, ?, ?, ?)",
+                [(self._root_key, path, *current[path]) for path in changed],
+            )
+            self._conn.executemany(
+                "INSERT INTO imports (root, path, module) VALUES (?, ?, ?)",
+                [
+                    (self._root_key, path, module)
+                    for path, modules in parsed.items()
+                    for module in modules
+                ],
+            )
+        return len(changed)
+
+    def _forget(self, path: str) -> None:
+        """Remove a file's imports from the in-memory maps."""
+        for module in self._imports.pop(path, ()):
+            importers = self._importers.get(module)
+            if importers is not None:
+                importers.discard(path)
+                if not importers:
+                    del self._importers[module]
+
+
+_indexes: dict[Path, ImportIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_import_index(root: Path | None = None) -> ImportIndex:
+    """Get the shared index for a workspace (default: working directory).
+
+    Args:
+        root: Workspace directory
+
+    Returns:
+        Index stored in the default cache directory
+    """
+    resolved = (root or Path.cwd()).resolve()
+    with _indexes_lock:
+        index = _indexes.get(resolved)
+        if index is None:
+            index = ImportIndex(resolved, default_cache_dir() / "import_index.sqlite3")
+            _indexes[resolved] = index
+        return index
@@ -0,0 +1,148 @@
+"""Memory-mapped line range reads backed by a cached line-offset index."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+# Every CHECKPOINT_LINES-th line start is stored, so seeking to any line
+# scans at most that many newlines past the nearest checkpoint.
+CHECKPOINT_LINES = 256
+
+_MAX_CACHED_INDEXES = 64
+
+type _IndexKey = tuple[str, int, int, int]
+
+
+@dataclass(frozen=True)
+class LineIndex:
+    """Byte offsets of every ``CHECKPOINT_LINES``-th line start of a file.
+
+    Lines are separated by ``\\n``; a trailing ``\\r`` is dropped from each
+    line so CRLF files read the same as LF files.
+    """
+
+    checkpoints: array[int]
+    total_lines: int
+
+    @classmethod
+    def build(cls, data: mmap.mmap) -> LineIndex:
+        """Index a mapped file.
+
+        A regex consumes ``CHECKPOINT_LINES`` lines per match, so the scan
+        runs in C with one Python step per checkpoint.
+
+        Args:
+            data: Mapped file contents
+
+        Returns:
+            The file's line index
+        """
+        block = re.compile(rb"(?:[^\n]*\n){%d}" % CHECKPOINT_LINES)
+        checkpoints = array("q", [0])
+        offset = 0
+        while (match := block.match(data, offset)) is not None:
+            offset = match.end()
+            checkpoints.append(offset)
+
+        newlines = (len(checkpoints) - 1) * CHECKPOINT_LINES
+        while (offset := data.find(b"\n", offset) + 1) > 0:
+            newlines += 1
+
+        size = len(data)
+        ends_with_newline = size > 0 and data[size - 1] == ord("\n")
+        total_lines = newlines if ends_with_newline or size == 0 else newlines + 1
+        return cls(checkpoints=checkpoints, total_lines=total_lines)
+
+    def line_start(self, data: mmap.mmap, line: int) -> int:
+        """Byte offset where a line starts.
+
+        Args:
+            data: Mapped file contents (the file this index was built from)
+            line: 0-based line number, at most ``total_lines``
+
+        Returns:
+            Offset of the line, or the file size for ``total_lines``
+        """
+        if line >= self.total_lines:
+            return len(data)
+        offset = self.checkpoints[line // CHECKPOINT_LINES]
+        for _ in range(line % CHECKPOINT_LINES):
+            offset = data.find(b"\n", offset) + 1
+        return offset
+
+
+class _LineIndexCache:
+    """LRU of line indexes keyed by file identity and version."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[_IndexKey, LineIndex] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key: _IndexKey, data: mmap.mmap) -> LineIndex:
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+                return index
+        index = LineIndex.build(data)
+        with self._lock:
+            self._entries[key] = index
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_index_cache = _LineIndexCache(_MAX_CACHED_INDEXES)
+
+
+def read_line_range(path: Path, start: int, end: int | None) -> tuple[list[str], int]:
+    """Read lines ``[start, end)`` of a UTF-8 text file.
+
+    The file is memory-mapped and only the selected bytes are decoded. The
+    line index is cached per (path, inode, size, mtime_ns), so repeated reads
+    of an unchanged file cost O(range).
+
+    Args:
+        path: File to read
+        start: First line, 0-based
+        end: Line after the last one (None: to end of file)
+
+    Returns:
+        The selected lines and the file's total line count
+
+    Raises:
+        OSError: If the file cannot be opened or mapped
+        UnicodeDecodeError: If the selected lines are not valid UTF-8
+    """
+    with path.open("rb") as f:
+        stat = os.fstat(f.fileno())
+        if stat.st_size == 0:
+            return [], 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            key = (str(path), stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            index = _index_cache.get_or_build(key, data)
+            total = index.total_lines
+            stop = total if end is None else min(end, total)
+            if start >= stop:
+                return [], total
+
+            first = index.line_start(data, start)
+            last = index.line_start(data, stop)
+            text = data[first:last].decode("utf-8")
+
+    lines = text.split("\n")
+    if text.endswith("\n"):
+        del lines[-1]
+    return [line.removesuffix("\r") for line in lines], total
@@ -0,0 +1,148 @@
+"""Session store for tool outputs that exceed their output budget."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+_store: ToolOutputStore | None = None
+_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class OutputPage:
+    """A line-aligned slice of a stored output."""
+
+    handle: str
+    text: str
+    offset: int
+    end: int
+    total_chars: int
+    first_line: int
+    last_line: int
+    total_lines: int
+
+    @property
+    def has_more(self) -> bool:
+        """Whether output remains after this page."""
+        return self.end < self.total_chars
+
+    def render(self) -> str:
+        """Page text followed by a note on where it sits in the full output."""
+        position = (
+            f"lines {self.first_line}-{self.last_line} of {self.total_lines}, "
+            f"chars {self.offset}-{self.end} of {self.total_chars}"
+        )
+        if self.has_more:
+            note = (
+                f"[Output truncated ({position}). Full output saved as "
+                f"'{self.handle}'. Call read_more with handle '{self.handle}' "
+                f"and offset {self.end} to continue.]"
+            )
+        else:
+            note = f"[End of output '{self.handle}' ({position}).]"
+        return f"{self.text}\n\n{note}"
+
+
+class ToolOutputStore:
+    """In-memory, content-addressed store of full tool outputs.
+
+    Outputs live for the session; the oldest are evicted once the total
+    size exceeds ``max_chars``.
+    """
+
+    def __init__(self, max_chars: int = 64 * 1024 * 1024) -> None:
+        """Initialize the store.
+
+        Args:
+            max_chars: Total characters kept across all outputs
+        """
+        self._max_chars = max_chars
+        self._outputs: OrderedDict[str, str] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def put(self, output: str) -> str:
+        """Store an output and return its handle (same output, same handle)."""
+        digest = hashlib.sha256(output.encode("utf-8", "surrogatepass"))
+        handle = f"out_{digest.hexdigest()[:12]}"
+        with self._lock:
+            if handle in self._outputs:
+                self._outputs.move_to_end(handle)
+                return handle
+            self._outputs[handle] = output
+            self._size += len(output)
+            while self._size > self._max_chars and len(self._outputs) > 1:
+                _, evicted = self._outputs.popitem(last=False)
+                self._size -= len(evicted)
+        return handle
+
+    def get(self, handle: str) -> str | None:
+        """Get a stored output, or None if unknown or evicted."""
+        with self._lock:
+            return self._outputs.get(handle)
+
+    def page(self, handle: str, offset: int, max_chars: int) -> OutputPage | None:
+        """Get up to max_chars of an output starting at offset.
+
+        Pages end on a line boundary unless a single line exceeds max_chars.
+
+        Args:
+            handle: Handle returned by ``put``
+            offset: Character offset to start from
+            max_chars: Maximum characters in the page
+
+        Returns:
+            The page, or None if the handle is unknown or evicted
+        """
+        output = self.get(handle)
+        if output is None:
+            return None
+
+        total = len(output)
+        offset = min(offset, total)
+        end = min(offset + max_chars, total)
+        if end < total:
+            cut = output.rfind("\n", offset, end)
+            if cut > offset:
+                end = cut + 1
+
+        text = output[offset:end]
+        first_line = output.count("\n", 0, offset) + 1
+        total_lines = output.count("\n") + (0 if output.endswith("\n") else 1)
+        last_line = first_line + text.count("\n") - (1 if text.endswith("\n") else 0)
+        return OutputPage(
+            handle=handle,
+            text=text.removesuffix("\n"),
+            offset=offset,
+            end=end,
+            total_chars=total,
+            first_line=first_line,
+            last_line=max(first_line, last_line),
+            total_lines=total_lines,
+        )
+
+    def __contains__(self, handle: object) -> bool:
+        """Check whether a handle is still stored."""
+        return handle in self._outputs
+
+    def __len__(self) -> int:
+        """Number of stored outputs."""
+        return len(self._outputs)
+
+    def clear(self) -> None:
+        """Drop all stored outputs."""
+        with self._lock:
+            self._outputs.clear()
+            self._size = 0
+
+
+def get_tool_output_store() -> ToolOutputStore:
+    """Get or create the session's output store."""
+    global _store  # noqa: PLW0603
+    with _lock:
+        if _store is None:
+            _store = ToolOutputStore()
+        return _store
@@ -43,6 +43,16 @@ class RandomDateTool(BaseTool[RandomDateArgs]):
         """Pydantic model class for arguments."""
         return RandomDateArgs
 
+    @property
+    def parallel_safe(self) -> bool:
+        """Safe to run concurrently with other calls."""
+        return True
+
+    @property
+    def read_only(self) -> bool:
+        """Has no side effects, so it may run speculatively."""
+        return True
+
     def execute(self, args: RandomDateArgs) -> str:
         """Generate a random date.
 
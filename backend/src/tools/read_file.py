@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-import json
-import subprocess
+import sqlite3
+from collections.abc import Hashable
 from pathlib import Path
 
 from pydantic import BaseModel
@@ -11,10 +11,12 @@ from pydantic import Field
 
 from .base import BaseTool
 from .errors import ToolError
+from .import_index import get_import_index
+from .line_index import read_line_range
 
 
 def _get_importers(file_path: Path) -> list[str]:
-    """Get non-test files that import this module using tldr.
+    """Get non-test files that import this module from the import index.
 
     Args:
         file_path: Path to the file
@@ -27,31 +29,13 @@ def _get_importers(file_path: Path) -> list[str]:
         module_name = file_path.parent.name
 
     try:
-        result = subprocess.run(  # noqa: S603
-            ["tldr", "importers", module_name, "."],  # noqa: S607
-            capture_output=True,
-            text=True,
-            timeout=10,
-            check=False,
-        )
-    except (subprocess.TimeoutExpired, FileNotFoundError):
+        files = get_import_index().importers(module_name)
+    except (OSError, sqlite3.Error):
         return []
 
-    if result.returncode != 0:
-        return []
-
-    try:
-        data = json.loads(result.stdout)
-    except json.JSONDecodeError:
-        return []
-
-    importers: list[str] = []
-    for item in data.get("importers", []):
-        file = item.get("file", "")
-        is_test = file.startswith("tests/") or "test_" in file
-        if file and not is_test and file not in importers:
-            importers.append(file)
-    return importers
+    return [
+        file for file in files if not (file.startswith("tests/") or "test_" in file)
+    ]
 
 
 class ReadFileArgs(BaseModel):
@@ -90,6 +74,36 @@ class ReadFileTool(BaseTool[ReadFileArgs]):
         """Pydantic model class for arguments."""
         return ReadFileArgs
 
+    @property
+    def timeout(self) -> float | None:
+        """Leaves room for the first import index build on large workspaces."""
+        return 20.0
+
+    @property
+    def parallel_safe(self) -> bool:
+        """Safe to run concurrently with other calls."""
+        return True
+
+    @property
+    def read_only(self) -> bool:
+        """Has no side effects, so it may run speculatively."""
+        return True
+
+    @property
+    def cacheable(self) -> bool:
+        """Output only changes with the file and its importers."""
+        return True
+
+    def fingerprint(self, args: ReadFileArgs) -> Hashable | None:
+        """File version (mtime_ns, size, inode) and the ``used_by`` importers."""
+        file_path = Path(args.path)
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return None
+        importers = tuple(_get_importers(file_path))
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino, importers)
+
     def execute(self, args: ReadFileArgs) -> str:
         """Read file contents.
 
@@ -116,8 +130,12 @@ class ReadFileTool(BaseTool[ReadFileArgs]):
             msg = f"Path '{args.path}' is not a file. Use a file path."
             raise ToolError(msg)
 
+        start_idx = args.start_line - 1
+
         try:
-            content = file_path.read_text(encoding="utf-8")
+            selected_lines, total_lines = read_line_range(
+                file_path, start_idx, args.end_line
+            )
         except PermissionError as e:
             msg = f"Permission denied reading '{args.path}'."
             raise ToolError(msg) from e
@@ -125,17 +143,12 @@ class ReadFileTool(BaseTool[ReadFileArgs]):
             msg = f"File '{args.path}' is not valid UTF-8 text."
             raise ToolError(msg) from e
 
-        lines = content.splitlines()
-        total_lines = len(lines)
-
-        start_idx = args.start_line - 1
         end_idx = args.end_line if args.end_line else total_lines
 
         if start_idx >= total_lines:
             msg = f"Start line {args.start_line} exceeds file length ({total_lines})."
             raise ToolError(msg)
 
-        selected_lines = lines[start_idx:end_idx]
         numbered_lines = [
             f"{i}: {line}"
             for i, line in enumerate(selected_lines, start=args.start_line)
@@ -0,0 +1,98 @@
+"""Read more tool - pages through truncated tool outputs."""
+
+from __future__ import annotations
+
+from pydantic import BaseModel
+from pydantic import Field
+
+from .base import BaseTool
+from .errors import ToolError
+from .output_store import get_tool_output_store
+
+
+class ReadMoreArgs(BaseModel):
+    """Arguments for the read more tool."""
+
+    handle: str = Field(
+        description="Handle of a truncated output, e.g. 'out_1a2b3c4d5e6f'.",
+    )
+    offset: int = Field(
+        default=0,
+        ge=0,
+        description="Character offset to continue from, as given in the output.",
+    )
+    max_chars: int = Field(
+        default=16_000,
+        ge=1_000,
+        le=100_000,
+        description="Maximum characters to return.",
+    )
+
+
+class ReadMoreTool(BaseTool[ReadMoreArgs]):
+    """Page through a tool output that was too large to return at once."""
+
+    @property
+    def name(self) -> str:
+        """Tool name used in API calls."""
+        return "read_more"
+
+    @property
+    def description(self) -> str:
+        """Human-readable description for the LLM."""
+        return (
+            "Continue reading a truncated tool output. Use the handle and "
+            "offset given in the truncation note."
+        )
+
+    @property
+    def args_model(self) -> type[ReadMoreArgs]:
+        """Pydantic model class for arguments."""
+        return ReadMoreArgs
+
+    @property
+    def parallel_safe(self) -> bool:
+        """Safe to run concurrently with other calls."""
+        return True
+
+    @property
+    def read_only(self) -> bool:
+        """Has no side effects, so it may run speculatively."""
+        return True
+
+    @property
+    def max_output_chars(self) -> int | None:
+        """Pages are already bounded by ``max_chars``."""
+        return 0
+
+    @property
+    def isolatable(self) -> bool:
+        """Outputs are stored in the executor's process."""
+        return False
+
+    def execute(self, args: ReadMoreArgs) -> str:
+        """Return the next page of a stored output.
+
+        Args:
+            args: Validated arguments with handle, offset and page size
+
+        Returns:
+            Page text followed by a note on how to continue
+
+        Raises:
+            ToolError: If the handle is unknown or the offset is past the end
+        """
+        page = get_tool_output_store().page(args.handle, args.offset, args.max_chars)
+        if page is None:
+            msg = (
+                f"Output '{args.handle}' is not available. "
+                "Re-run the original tool call."
+            )
+            raise ToolError(msg)
+        if args.offset >= page.total_chars:
+            msg = (
+                f"Offset {args.offset} is past the end of '{args.handle}' "
+                f"({page.total_chars} chars)."
+            )
+            raise ToolError(msg)
+        return page.render()
@@ -0,0 +1,317 @@
+"""Shared tool registry with lazy imports and precomputed schemas."""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import json
+import platform
+import sys
+import threading
+from dataclasses import dataclass
+from importlib.metadata import entry_points
+from pathlib import Path
+
+from pydantic import VERSION as PYDANTIC_VERSION
+from pydantic import BaseModel
+
+from .base import BaseTool
+
+# Type alias for any tool (used in registry)
+AnyTool = BaseTool[BaseModel]
+
+ENTRY_POINT_GROUP = "personal_coding_agent.tools"
+
+type _Stamp = list[int]
+
+
+def _canonical_json(value: object) -> str:
+    """Serialize to compact JSON with sorted keys."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _module_stamp(module_name: str) -> _Stamp | None:
+    """Version stamp (mtime_ns, size) of a module's file, no import.
+
+    Locating a submodule imports its parent packages, but not the module.
+    """
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or spec.origin is None:
+        return None
+    try:
+        stat = Path(spec.origin).stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _versions() -> list[str]:
+    """Python and pydantic versions, which also shape generated schemas."""
+    return [platform.python_version(), PYDANTIC_VERSION]
+
+
+def _schema_sources(tool: AnyTool) -> list[str]:
+    """Modules whose code a tool's schema is built from.
+
+    The modules defining the tool class, its args model and their bases
+    (``BaseTool`` included); the standard library and pydantic are covered
+    by the Python and pydantic versions instead.
+    """
+    modules: dict[str, None] = {}
+    for cls in (*type(tool).__mro__, *tool.args_model.__mro__):
+        top_level = cls.__module__.partition(".")[0]
+        if top_level != "pydantic" and top_level not in sys.stdlib_module_names:
+            modules[cls.__module__] = None
+    return list(modules)
+
+
+@dataclass
+class RegisteredTool:
+    """A registry entry: metadata always, the tool instance once imported."""
+
+    name: str
+    target: str
+    tool: AnyTool | None = None
+    schema: dict[str, object] | None = None
+
+
+class ToolSchemaCache:
+    """Persistent target -> schema map, invalidated by source changes.
+
+    Each schema is stored with the version stamps of the modules it was
+    built from (see ``_schema_sources``) and the Python and pydantic
+    versions; it is served only while all of them are unchanged.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the cache.
+
+        Args:
+            path: JSON file holding cached schemas
+        """
+        self._path = path
+        self._entries: dict[str, dict[str, object]] = {}
+        self._dirty = False
+        try:
+            self._entries = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def get(self, target: str) -> dict[str, object] | None:
+        """Get the cached schema if none of its sources changed (no import)."""
+        entry = self._entries.get(target)
+        if entry is None or entry.get("versions") != _versions():
+            return None
+        sources = entry.get("sources")
+        if not isinstance(sources, dict) or not sources:
+            return None
+        for module_name, stamp in sources.items():
+            if _module_stamp(module_name) != stamp:
+                return None
+        schema = entry.get("schema")
+        return schema if isinstance(schema, dict) else None
+
+    def put(self, target: str, tool: AnyTool, schema: dict[str, object]) -> None:
+        """Store a tool's schema with the stamps of its sources."""
+        sources: dict[str, _Stamp] = {}
+        for module_name in _schema_sources(tool):
+            stamp = _module_stamp(module_name)
+            if stamp is None:
+                return
+            sources[module_name] = stamp
+        self._entries[target] = {
+            "versions": _versions(),
+            "sources": sources,
+            "schema": schema,
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write pending changes; failures only cost a rebuild next time."""
+        if not self._dirty:
+            return
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(self._entries), encoding="utf-8")
+            tmp_path.replace(self._path)
+        except OSError:
+            return
+        self._dirty = False
+
+
+class ToolRegistry:
+    """Shared name -> tool index.
+
+    Tools can be registered as instances or lazily as ``"module:Class"``
+    targets, including targets discovered through package entry points.
+    Names and schemas are available without importing lazy tools: schemas
+    come from a persistent cache keyed by the versions of their sources, and a
+    tool's module is imported the first time the tool itself is needed.
+    Each schema is built (pydantic ``model_json_schema()``) at most once.
+    """
+
+    def __init__(
+        self,
+        tools: list[AnyTool] | None = None,
+        schema_cache: ToolSchemaCache | None = None,
+    ) -> None:
+        """Initialize the registry.
+
+        Args:
+            tools: Tool instances to register immediately
+            schema_cache: Optional persistent cache for lazy tool schemas
+        """
+        self._entries: dict[str, RegisteredTool] = {}
+        self._schema_cache = schema_cache
+        self._schemas: list[dict[str, object]] | None = None
+        self._schemas_json: str | None = None
+        self._lock = threading.RLock()
+        for tool in tools or []:
+            self.register(tool)
+
+    def register(self, tool: AnyTool) -> None:
+        """Register a tool instance, replacing any tool with the same name.
+
+        Args:
+            tool: Tool instance to register
+        """
+        cls = type(tool)
+        entry = RegisteredTool(
+            name=tool.name,
+            target=f"{cls.__module__}:{cls.__qualname__}",
+            tool=tool,
+            schema=tool.schema,
+        )
+        with self._lock:
+            self._entries[tool.name] = entry
+            self._invalidate()
+
+    def register_lazy(self, name: str, target: str) -> None:
+        """Register a tool by import path without importing it.
+
+        Args:
+            name: Tool name used in API calls
+            target: ``"package.module:ToolClass"`` with a no-argument constructor
+        """
+        with self._lock:
+            self._entries[name] = RegisteredTool(name=name, target=target)
+            self._invalidate()
+
+    def discover_entry_points(self, group: str = ENTRY_POINT_GROUP) -> None:
+        """Register tools advertised by installed packages.
+
+        Each entry point's name is the tool name and its value the target,
+        e.g. ``grep = "my_tools.grep:GrepTool"``.
+
+        Args:
+            group: Entry point group to scan
+        """
+        for entry_point in entry_points(group=group):
+            self.register_lazy(entry_point.name, entry_point.value)
+
+    def names(self) -> list[str]:
+        """Get registered tool names (never imports)."""
+        return list(self._entries)
+
+    def get(self, name: str) -> AnyTool | None:
+        """Get a tool by name, importing its module on first use."""
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        return self._load(entry)
+
+    def __getitem__(self, name: str) -> AnyTool:
+        """Get a tool by name, importing it on first use.
+
+        Raises:
+            KeyError: If no tool has that name
+        """
+        return self._load(self._entries[name])
+
+    def tools(self) -> dict[str, AnyTool]:
+        """Get tool name -> tool instance mapping (imports every tool)."""
+        return {name: self._load(entry) for name, entry in self._entries.items()}
+
+    def schemas(self) -> list[dict[str, object]]:
+        """Get all tool schemas for the API.
+
+        The same list is returned until the registry changes; callers must
+        not mutate it.
+        """
+        with self._lock:
+            if self._schemas is None:
+                self._schemas = [
+                    self._ensure_schema(entry) for entry in self._entries.values()
+                ]
+                if self._schema_cache is not None:
+                    self._schema_cache.save()
+            return self._schemas
+
+    def schemas_json(self) -> str:
+        """Get the canonical JSON array of all tool schemas.
+
+        Built once per registry change, so request bodies can embed it
+        without serializing the schemas again.
+        """
+        with self._lock:
+            if self._schemas_json is None:
+                self._schemas_json = _canonical_json(self.schemas())
+            return self._schemas_json
+
+    def is_loaded(self, name: str) -> bool:
+        """Check whether a tool's module has been imported by the registry."""
+        entry = self._entries.get(name)
+        return entry is not None and entry.tool is not None
+
+    def __len__(self) -> int:
+        """Number of registered tools."""
+        return len(self._entries)
+
+    def __contains__(self, name: object) -> bool:
+        """Check whether a tool name is registered."""
+        return name in self._entries
+
+    def _invalidate(self) -> None:
+        """Drop the cached schema list after a registration."""
+        self._schemas = None
+        self._schemas_json = None
+
+    def _load(self, entry: RegisteredTool) -> AnyTool:
+        """Import and instantiate a lazy entry once."""
+        if entry.tool is not None:
+            return entry.tool
+        with self._lock:
+            if entry.tool is None:
+                module_name, _, class_name = entry.target.partition(":")
+                tool_class = getattr(importlib.import_module(module_name), class_name)
+                tool: AnyTool = tool_class()
+                if tool.name != entry.name:
+                    msg = (
+                        f"Tool target '{entry.target}' is named '{tool.name}', "
+                        f"but was registered as '{entry.name}'."
+                    )
+                    raise ValueError(msg)
+                entry.tool = tool
+            return entry.tool
+
+    def _ensure_schema(self, entry: RegisteredTool) -> dict[str, object]:
+        """Get an entry's schema from memory, the cache, or the tool."""
+        if entry.schema is not None:
+            return entry.schema
+
+        schema = (
+            self._schema_cache.get(entry.target)
+            if self._schema_cache is not None
+            else None
+        )
+        if schema is None:
+            tool = self._load(entry)
+            schema = tool.schema
+            if self._schema_cache is not None:
+                self._schema_cache.put(entry.target, tool, schema)
+        entry.schema = schema
+        return schema
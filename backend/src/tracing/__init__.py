@@ -9,6 +9,10 @@ from .config import TracingSink
 from .context import get_current_span
 from .context import get_current_trace
 from .processor import SQLiteProcessor
+from .prompt import jsonl_span_data
+from .prompt import reconstruct_prompt
+from .prompt import record_prompt
+from .prompt import sqlite_span_data
 from .span import Span
 from .sse_server import SSEServer
 from .trace import Trace
@@ -31,7 +35,11 @@ __all__ = [
     "get_broadcaster",
     "get_current_span",
     "get_current_trace",
+    "jsonl_span_data",
     "publish_span",
+    "reconstruct_prompt",
+    "record_prompt",
     "span",
+    "sqlite_span_data",
     "trace",
 ]
@@ -5,6 +5,7 @@ from __future__ import annotations
 import json
 import sqlite3
 import sys
+import threading
 from datetime import UTC
 from datetime import datetime
 from pathlib import Path
@@ -97,17 +98,18 @@ class FileProcessor:
     def __init__(self, file_path: str) -> None:
         self._file_path = Path(file_path)
         self._file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
 
     def on_span_start(self, span: Span) -> None:
         """Append span start to file."""
         event = _span_to_dict(span, is_start=True)
-        with self._file_path.open("a", encoding="utf-8") as f:
+        with self._lock, self._file_path.open("a", encoding="utf-8") as f:
             f.write(json.dumps(event) + "\n")
 
     def on_span_end(self, span: Span) -> None:
         """Append span to file."""
         event = _span_to_dict(span)
-        with self._file_path.open("a", encoding="utf-8") as f:
+        with self._lock, self._file_path.open("a", encoding="utf-8") as f:
             f.write(json.dumps(event) + "\n")
 
     def shutdown(self) -> None:
@@ -145,6 +147,8 @@ class SQLiteProcessor:
         self._db_path = Path(db_path)
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
         self._sse_enabled = sse_enabled
+        # Spans may finish on tool worker threads; serialize connection use.
+        self._lock = threading.Lock()
 
         self._conn = sqlite3.connect(
             str(self._db_path),
@@ -158,26 +162,27 @@ class SQLiteProcessor:
         """Insert span into database when it starts."""
         event = _span_to_dict(span, is_start=True)
 
-        self._conn.execute(
-            """
-            INSERT INTO spans (ts, trace_id, span_id, parent_id, name, kind,
-                               duration_ms, status, data_json, error)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                event["ts"],
-                event["trace_id"],
-                event["span_id"],
-                event["parent_id"],
-                event["name"],
-                event["kind"],
-                event["duration_ms"],
-                event["status"],
-                json.dumps(event["data"]),
-                event["error"],
-            ),
-        )
-        self._conn.commit()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO spans (ts, trace_id, span_id, parent_id, name, kind,
+                                   duration_ms, status, data_json, error)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    event["ts"],
+                    event["trace_id"],
+                    event["span_id"],
+                    event["parent_id"],
+                    event["name"],
+                    event["kind"],
+                    event["duration_ms"],
+                    event["status"],
+                    json.dumps(event["data"]),
+                    event["error"],
+                ),
+            )
+            self._conn.commit()
 
         if self._sse_enabled:
             from .broadcaster import publish_span  # noqa: PLC0415
@@ -188,21 +193,22 @@ class SQLiteProcessor:
         """Update span in database when it ends."""
         event = _span_to_dict(span)
 
-        self._conn.execute(
-            """
-            UPDATE spans
-            SET duration_ms = ?, status = ?, data_json = ?, error = ?
-            WHERE span_id = ?
-            """,
-            (
-                event["duration_ms"],
-                event["status"],
-                json.dumps(event["data"]),
-                event["error"],
-                event["span_id"],
-            ),
-        )
-        self._conn.commit()
+        with self._lock:
+            self._conn.execute(
+                """
+                UPDATE spans
+                SET duration_ms = ?, status = ?, data_json = ?, error = ?
+                WHERE span_id = ?
+                """,
+                (
+                    event["duration_ms"],
+                    event["status"],
+                    json.dumps(event["data"]),
+                    event["error"],
+                    event["span_id"],
+                ),
+            )
+            self._conn.commit()
 
         if self._sse_enabled:
             from .broadcaster import publish_span  # noqa: PLC0415
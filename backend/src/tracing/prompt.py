@@ -0,0 +1,149 @@
+"""Incremental prompt recording for llm spans.
+
+Each llm span stores only the messages appended since the previous llm span
+of the same trace, plus a reference to that span. Full prompts are rebuilt
+on demand by following the references.
+
+Span data written by ``record_prompt``:
+
+- ``messages``: JSON array of the new messages
+- ``messages_offset``: index of the first new message in the full prompt
+- ``prefix_span_id``: llm span holding the earlier messages (None: full prompt)
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import weakref
+from collections.abc import Callable
+from collections.abc import Mapping
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .context import get_current_trace
+
+if TYPE_CHECKING:
+    from .span import Span
+    from .trace import Trace
+
+type PromptMessage = dict[str, object]
+type SpanDataLookup = Callable[[str], Mapping[str, object] | None]
+
+
+@dataclass
+class _LastPrompt:
+    """The most recent prompt recorded in a trace."""
+
+    span_id: str
+    messages: list[PromptMessage]
+
+
+_last_prompts: weakref.WeakKeyDictionary[Trace, _LastPrompt] = (
+    weakref.WeakKeyDictionary()
+)
+_lock = threading.Lock()
+
+
+def _shared_prefix(
+    previous: list[PromptMessage], messages: list[PromptMessage]
+) -> bool:
+    """Whether messages starts with previous (same dict objects, or equal)."""
+    if len(previous) > len(messages):
+        return False
+    return all(
+        old is new or old == new for old, new in zip(previous, messages, strict=False)
+    )
+
+
+def record_prompt(
+    s: Span, messages: list[PromptMessage], *, incremental: bool = True
+) -> None:
+    """Store a request's messages on its llm span as a delta.
+
+    Only messages appended since the previous llm span in the current trace
+    are serialized. Outside a trace, or when the history was rewritten, the
+    full prompt is stored.
+
+    Args:
+        s: The llm span
+        messages: Messages sent in the request
+        incremental: False for side requests outside the conversation (such
+            as summaries): the full prompt is stored and later spans do not
+            use it as a prefix
+    """
+    current_trace = get_current_trace()
+    offset = 0
+    prefix_span_id: str | None = None
+
+    if current_trace is not None and incremental:
+        with _lock:
+            last = _last_prompts.get(current_trace)
+            if last is not None and _shared_prefix(last.messages, messages):
+                offset = len(last.messages)
+                prefix_span_id = last.span_id
+            _last_prompts[current_trace] = _LastPrompt(s.span_id, list(messages))
+
+    s.set(
+        messages=json.dumps(messages[offset:], ensure_ascii=False),
+        messages_offset=offset,
+        prefix_span_id=prefix_span_id,
+    )
+
+
+def reconstruct_prompt(span_id: str, lookup: SpanDataLookup) -> list[PromptMessage]:
+    """Rebuild the full prompt of an llm span.
+
+    Args:
+        span_id: llm span to rebuild
+        lookup: Returns a span's data by span ID (None if unknown)
+
+    Returns:
+        Messages as sent in the request
+
+    Raises:
+        KeyError: If a span in the chain is missing or has no messages
+    """
+    chain: list[Mapping[str, object]] = []
+    current: str | None = span_id
+    while current is not None:
+        data = lookup(current)
+        if data is None or not isinstance(data.get("messages"), str):
+            msg = f"No recorded prompt for span '{current}'."
+            raise KeyError(msg)
+        chain.append(data)
+        prefix = data.get("prefix_span_id")
+        current = prefix if isinstance(prefix, str) else None
+
+    messages: list[PromptMessage] = []
+    for data in reversed(chain):
+        offset = data.get("messages_offset")
+        del messages[offset if isinstance(offset, int) else 0 :]
+        messages.extend(json.loads(str(data["messages"])))
+    return messages
+
+
+def sqlite_span_data(db_path: str | Path) -> SpanDataLookup:
+    """Span data lookup over a trace database written by ``SQLiteProcessor``."""
+
+    def lookup(span_id: str) -> Mapping[str, object] | None:
+        with closing(sqlite3.connect(str(db_path))) as conn:
+            row = conn.execute(
+                "SELECT data_json FROM spans WHERE span_id = ?", (span_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    return lookup
+
+
+def jsonl_span_data(file_path: str | Path) -> SpanDataLookup:
+    """Span data lookup over a trace file written by ``FileProcessor``."""
+    spans: dict[str, Mapping[str, object]] = {}
+    with Path(file_path).open(encoding="utf-8") as f:
+        for line in f:
+            event = json.loads(line)
+            spans[event["span_id"]] = event["data"]
+    return spans.get
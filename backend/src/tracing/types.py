@@ -15,6 +15,7 @@ class SpanKind(Enum):
     LLM = "llm"
     TOOL = "tool"
     INTERNAL = "internal"
+    COMPACTION = "compaction"
 
 
 class SpanStatus(Enum):
@@ -2,16 +2,30 @@
 
 from __future__ import annotations
 
+import os
 from unittest.mock import Mock
 
 import pytest
 
+from src.config.paths import CACHE_DIR_ENV
 from src.models.config import ChatConfig
 from src.services.message_repository import MessageRepository
 from src.ui.console_output import ConsoleOutput
 from src.ui.loading_spinner import LoadingSpinner
 
 
+@pytest.fixture(autouse=True, scope="session")
+def isolated_cache_dir(tmp_path_factory):
+    """Keep on-disk caches out of the working directory during tests."""
+    previous = os.environ.get(CACHE_DIR_ENV)
+    os.environ[CACHE_DIR_ENV] = str(tmp_path_factory.mktemp("agent_cache"))
+    yield
+    if previous is None:
+        os.environ.pop(CACHE_DIR_ENV, None)
+    else:
+        os.environ[CACHE_DIR_ENV] = previous
+
+
 @pytest.fixture
 def sample_config():
     """Create a sample chat configuration."""
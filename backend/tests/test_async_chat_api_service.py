@@ -0,0 +1,128 @@
+"""Tests for AsyncChatApiService."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.models.config import ChatConfig
+from src.services.async_chat_api_service import AsyncChatApiService
+from src.services.sse_parser import StreamError
+from src.tracing import SpanKind
+from src.tracing import trace
+from src.tracing.processor import NullProcessor
+
+
+class RecordingProcessor(NullProcessor):
+    """Processor that keeps finished spans."""
+
+    def __init__(self) -> None:
+        self.spans = []
+
+    def on_span_end(self, span) -> None:
+        self.spans.append(span)
+
+
+def sse(*payloads: dict[str, object]) -> bytes:
+    """Encode chunk payloads as a server-sent event stream."""
+    events = [f"data: {json.dumps(payload)}\n\n" for payload in payloads]
+    return "".join([*events, "data: [DONE]\n\n"]).encode()
+
+
+def content_chunk(text: str) -> dict[str, object]:
+    """A chunk payload with a content delta."""
+    return {
+        "id": "chunk",
+        "created": 0,
+        "model": "test-model",
+        "choices": [{"index": 0, "delta": {"content": text}}],
+    }
+
+
+@pytest.fixture
+def config():
+    """Create a chat configuration."""
+    return ChatConfig(
+        api_key="test-key",
+        base_url="https://test.api.com/v4/",
+        model="test-model",
+        system_prompt="Test",
+    )
+
+
+async def _collect(service: AsyncChatApiService) -> list[str]:
+    """Stream one completion and return the content deltas."""
+    async with service.streaming_completion(
+        [{"role": "user", "content": "Hi"}]
+    ) as response:
+        return [delta.content async for delta in response]
+
+
+class TestAsyncChatApiService:
+    """Tests for AsyncChatApiService."""
+
+    def test_streams_chunks(self, config):
+        """Test the request is sent to the API and events are parsed."""
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(
+                200, content=sse(content_chunk("Hel"), content_chunk("lo"))
+            )
+
+        service = AsyncChatApiService(config, httpx.MockTransport(handler))
+        deltas = asyncio.run(_collect(service))
+
+        assert deltas == ["Hel", "lo"]
+        request = requests[0]
+        assert str(request.url) == "https://test.api.com/v4/chat/completions"
+        assert request.headers["Authorization"] == "Bearer test-key"
+        body = json.loads(request.content)
+        assert body["model"] == "test-model"
+        assert body["stream"] is True
+        assert body["messages"] == [{"role": "user", "content": "Hi"}]
+
+    def test_error_status_raises(self, config):
+        """Test a rejected request raises before any chunk is yielded."""
+        transport = httpx.MockTransport(
+            lambda _request: httpx.Response(401, json={"error": "bad key"})
+        )
+        service = AsyncChatApiService(config, transport)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(_collect(service))
+
+    def test_error_event_raises(self, config):
+        """Test an error reported mid-stream raises StreamError."""
+        transport = httpx.MockTransport(
+            lambda _request: httpx.Response(
+                200, content=sse(content_chunk("a"), {"error": {"code": "500"}})
+            )
+        )
+        service = AsyncChatApiService(config, transport)
+
+        with pytest.raises(StreamError, match="500"):
+            asyncio.run(_collect(service))
+
+    def test_request_is_traced_in_llm_span(self, config):
+        """Test each request gets an llm span with connection metrics."""
+        recorder = RecordingProcessor()
+        transport = httpx.MockTransport(
+            lambda _request: httpx.Response(200, content=sse(content_chunk("a")))
+        )
+        service = AsyncChatApiService(config, transport)
+
+        with (
+            patch("src.tracing.trace._create_processor", return_value=recorder),
+            trace("conversation"),
+        ):
+            asyncio.run(_collect(service))
+
+        (llm,) = [s for s in recorder.spans if s.kind == SpanKind.LLM]
+        assert llm.data.get("model") == "test-model"
+        assert llm.data.get("connection_reused") is True
@@ -0,0 +1,123 @@
+"""Tests for AsyncChatOrchestrator."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.models.config import ChatConfig
+from src.orchestrators.async_chat_orchestrator import AsyncChatOrchestrator
+from src.tracing import SpanKind
+from src.tracing.processor import NullProcessor
+
+
+class RecordingProcessor(NullProcessor):
+    """Processor that keeps finished spans."""
+
+    def __init__(self) -> None:
+        self.spans = []
+
+    def on_span_end(self, span) -> None:
+        self.spans.append(span)
+
+
+def _stream(*deltas: dict[str, object]) -> httpx.Response:
+    """A streamed completion response with one chunk per delta."""
+    events = [
+        "data: "
+        + json.dumps(
+            {
+                "id": "chunk",
+                "created": 0,
+                "model": "test-model",
+                "choices": [{"index": 0, "delta": delta}],
+            }
+        )
+        + "\n\n"
+        for delta in deltas
+    ]
+    return httpx.Response(200, content="".join([*events, "data: [DONE]\n\n"]))
+
+
+@pytest.fixture
+def config():
+    """Create test configuration."""
+    return ChatConfig(
+        api_key="test-key",
+        base_url="https://test.api.com",
+        model="test-model",
+        system_prompt="Test system prompt",
+    )
+
+
+@pytest.fixture
+def transport():
+    """Serve a tool call, then a reply that uses its result."""
+    responses = [
+        _stream(
+            {
+                "tool_calls": [
+                    {
+                        "index": 0,
+                        "id": "call_1",
+                        "function": {"name": "get_current_time", "arguments": "{}"},
+                    }
+                ]
+            }
+        ),
+        _stream({"content": "It is "}, {"content": "late."}),
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "HEAD":
+            # Connection warm-up
+            return httpx.Response(200)
+        return responses.pop(0)
+
+    return httpx.MockTransport(handler)
+
+
+class TestAsyncChatOrchestrator:
+    """Tests for AsyncChatOrchestrator."""
+
+    @patch("src.orchestrators.chat_orchestrator.ConsoleOutput")
+    def test_turn_with_tool_call(self, mock_output_class, config, transport):
+        """Test a turn streams, runs the tool and streams the final reply."""
+        orchestrator = AsyncChatOrchestrator(config, transport)
+
+        asyncio.run(orchestrator.process_message("What time is it?"))
+
+        messages = orchestrator._message_repository.get_messages_for_api()
+        assert [m["role"] for m in messages] == [
+            "system",
+            "user",
+            "assistant",
+            "tool",
+            "assistant",
+        ]
+        assert messages[3]["tool_call_id"] == "call_1"
+        assert messages[-1]["content"] == "It is late."
+        mock_output_class.return_value.display_tool_result.assert_called_once()
+
+    @patch("src.orchestrators.chat_orchestrator.ConsoleOutput")
+    def test_spans_nest_as_in_sync_loop(self, mock_output_class, config, transport):
+        """Test the turn span parents both llm spans and the tool span."""
+        recorder = RecordingProcessor()
+        mock_output = mock_output_class.return_value
+        mock_output.get_user_input.side_effect = ["What time is it?", "exit"]
+        orchestrator = AsyncChatOrchestrator(config, transport)
+
+        with patch("src.tracing.trace._create_processor", return_value=recorder):
+            asyncio.run(orchestrator.run())
+
+        (turn,) = [s for s in recorder.spans if s.kind == SpanKind.TURN]
+        llm = [s for s in recorder.spans if s.kind == SpanKind.LLM]
+        tool = [s for s in recorder.spans if s.kind == SpanKind.TOOL]
+        assert len(llm) == 2
+        assert {s.parent_id for s in llm} == {turn.span_id}
+        assert tool[0].parent_id == llm[0].span_id
+        mock_output.display_goodbye.assert_called_once()
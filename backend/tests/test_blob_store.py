@@ -0,0 +1,121 @@
+"""Tests for BlobStore."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from src.models.message import Message
+from src.models.message import MessageRole
+from src.models.tool import ToolResult
+from src.services.blob_store import BlobRef
+from src.services.blob_store import BlobStore
+from src.services.blob_store import rehydrate
+from src.services.context_window import estimate_tokens
+from src.services.message_repository import MessageRepository
+from src.services.session_store import SessionStore
+
+
+@pytest.fixture
+def blobs(tmp_path):
+    """Create a store that keeps texts of 10+ characters."""
+    store = BlobStore(tmp_path, min_chars=10)
+    yield store
+    store.close()
+
+
+class TestBlobStore:
+    """Tests for BlobStore."""
+
+    def test_round_trip(self, blobs):
+        """Test texts are read back as stored, including non-ASCII."""
+        first = blobs.put("héllo wörld")
+        second = blobs.put("another text")
+
+        assert first.text() == "héllo wörld"
+        assert second.text() == "another text"
+        assert first.chars == len("héllo wörld")
+
+    def test_identical_texts_are_stored_once(self, blobs):
+        """Test the store is content-addressed."""
+        first = blobs.put("same content")
+        size = blobs.size
+
+        assert blobs.put("same content") == first
+        assert blobs.size == size
+
+    def test_reads_after_the_file_grows(self, blobs):
+        """Test texts appended after the first read are still readable."""
+        first = blobs.put("x" * 100)
+        assert first.text() == "x" * 100
+
+        second = blobs.put("y" * 100_000)
+
+        assert second.text() == "y" * 100_000
+        assert first.text() == "x" * 100
+
+    def test_rehydrate(self, blobs):
+        """Test only messages with a BlobRef content are copied."""
+        inline = {"role": "user", "content": "short"}
+        stored = {"role": "tool", "content": blobs.put("a long result")}
+
+        assert rehydrate(inline) is inline
+        assert rehydrate(stored) == {"role": "tool", "content": "a long result"}
+
+
+class TestSpilledMessages:
+    """Tests for MessageRepository with a BlobStore."""
+
+    def test_long_contents_are_kept_as_handles(self, blobs):
+        """Test only contents at the threshold move out of memory."""
+        repository = MessageRepository("Prompt", blobs=blobs)
+        repository.add_user_message("Hi")
+        repository.add_tool_result(
+            ToolResult(tool_call_id="c1", name="read_file", content="z" * 50)
+        )
+
+        user, tool = repository.get_all_messages()[1:]
+
+        assert user.blob is None
+        assert tool.content == ""
+        assert isinstance(tool.blob, BlobRef)
+        assert tool.text == "z" * 50
+        assert repository.get_messages_for_api()[-1]["content"] is tool.blob
+
+    def test_to_dict_reads_the_content_back(self, blobs):
+        """Test to_dict gives plain text; only the stored form has the handle."""
+        ref = blobs.put("z" * 50)
+        message = Message(
+            role=MessageRole.TOOL, content="", tool_call_id="c1", blob=ref
+        )
+
+        assert json.loads(json.dumps(message.to_dict()))["content"] == "z" * 50
+        assert message.to_stored_dict()["content"] is ref
+        assert message.api_dict["content"] is ref
+
+    def test_token_estimate_matches_inline_content(self, blobs):
+        """Test a stored content is estimated without reading it back."""
+        message = {"role": "tool", "content": "z" * 50, "name": "read_file"}
+        stored = {**message, "content": blobs.put("z" * 50)}
+
+        assert estimate_tokens(stored) == estimate_tokens(message)
+
+    def test_sessions_store_the_full_text(self, blobs, tmp_path):
+        """Test the session store gets contents, not handles."""
+        store = SessionStore(tmp_path / "sessions.sqlite3")
+        session = store.create()
+        repository = MessageRepository("A long system prompt", session, blobs)
+        repository.add_assistant_message("A long assistant reply")
+        repository.clear()
+
+        resumed = MessageRepository.resume(store.open(session.id), 1000)
+
+        assert resumed.get_messages_for_api() == [
+            {"role": "system", "content": "A long system prompt"}
+        ]
+        assert [m.text for m in session.load(0, 2)] == [
+            "A long system prompt",
+            "A long assistant reply",
+        ]
+        store.close()
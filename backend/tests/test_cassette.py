@@ -0,0 +1,277 @@
+"""Tests for recording and replaying chat completions."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+from src.models.config import CassetteMode
+from src.models.config import ChatConfig
+from src.models.config import HttpConfig
+from src.processors.stream_response_processor import StreamResponseProcessor
+from src.services.cassette import AsyncRecordingTransport
+from src.services.cassette import CassetteError
+from src.services.cassette import Interaction
+from src.services.cassette import RecordingTransport
+from src.services.cassette import ReplayTransport
+from src.services.cassette import load_cassette
+from src.services.chat_api_service import ChatApiService
+from src.services.message_repository import MessageRepository
+
+URL = "https://api.test/v4/chat/completions"
+
+
+def _event(delta: dict[str, object]) -> bytes:
+    """One server-sent event of a streamed completion."""
+    chunk = {
+        "id": "1",
+        "created": 0,
+        "model": "glm-4.7",
+        "choices": [{"index": 0, "delta": {"role": "assistant", **delta}}],
+    }
+    return f"data: {json.dumps(chunk)}\n\n".encode()
+
+
+BODY = (
+    _event({"reasoning_content": "Think"})
+    + _event({"content": "Hello"})
+    + _event({"content": " there"})
+    + b"data: [DONE]\n\n"
+)
+
+
+def _network(body: bytes = BODY) -> httpx.MockTransport:
+    """Transport that streams ``body`` in pieces that split events."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "HEAD":
+            return httpx.Response(200)
+        pieces = [body[start : start + 7] for start in range(0, len(body), 7)]
+        return httpx.Response(
+            200, headers={"Content-Type": "text/event-stream"}, content=iter(pieces)
+        )
+
+    return httpx.MockTransport(handler)
+
+
+def _config(**http: object) -> ChatConfig:
+    """Chat config with the given HTTP settings."""
+    return ChatConfig(
+        api_key="test-key",
+        base_url="https://api.test/v4",
+        model="glm-4.7",
+        system_prompt="Test",
+        http=HttpConfig(warm_up=False, **http),  # type: ignore[arg-type]
+    )
+
+
+def _process(service: ChatApiService):
+    """Stream one completion and process it."""
+    processor = StreamResponseProcessor(MessageRepository("Test"), Mock(), Mock())
+    with service.streaming_completion([{"role": "user", "content": "Hi"}]) as response:
+        return processor.process(response)
+
+
+class TestRecordingTransport:
+    """Tests for RecordingTransport."""
+
+    def test_records_events_with_timing(self, tmp_path):
+        """Test a streamed body is recorded one event at a time."""
+        path = tmp_path / "run.cassette"
+        client = httpx.Client(transport=RecordingTransport(path, _network()))
+
+        with client.stream("POST", URL, json={}) as response:
+            body = response.read()
+        client.close()
+
+        assert body == BODY
+        (interaction,) = load_cassette(path)
+        assert interaction.status == 200
+        assert interaction.is_stream
+        texts = [text for _, text in interaction.events]
+        assert texts == [event.decode() for event in BODY.split(b"\n\n")[:-1]]
+        assert all(delay >= 0 for delay, _ in interaction.events)
+
+    def test_asks_for_an_unencoded_body(self, tmp_path):
+        """Test recorded requests ask for no content encoding."""
+        seen: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200, json={})
+
+        transport = RecordingTransport(tmp_path / "c", httpx.MockTransport(handler))
+        httpx.Client(transport=transport).post(URL, json={})
+
+        assert seen[0].headers["Accept-Encoding"] == "identity"
+
+    def test_stream_read_up_to_done_is_recorded(self, tmp_path):
+        """Test a stream closed right after [DONE] counts as complete."""
+        path = tmp_path / "run.cassette"
+        body = BODY + b": trailing comment\n\n"
+        client = httpx.Client(transport=RecordingTransport(path, _network(body)))
+
+        with client.stream("POST", URL, json={}) as response:
+            for line in response.iter_lines():
+                if line == "data: [DONE]":
+                    break
+        client.close()
+
+        (interaction,) = load_cassette(path)
+        assert interaction.events[-1][1] == "data: [DONE]"
+
+    def test_abandoned_stream_is_not_recorded(self, tmp_path):
+        """Test a stream closed before its end (e.g. a lost hedge) is skipped."""
+        path = tmp_path / "run.cassette"
+        client = httpx.Client(transport=RecordingTransport(path, _network()))
+
+        with client.stream("POST", URL, json={}) as response:
+            next(response.iter_bytes())
+        client.close()
+
+        assert load_cassette(path) == []
+
+    def test_other_requests_are_not_recorded(self, tmp_path):
+        """Test warm-ups pass through without being recorded."""
+        path = tmp_path / "run.cassette"
+        client = httpx.Client(transport=RecordingTransport(path, _network()))
+
+        client.head("https://api.test/v4")
+        client.close()
+
+        assert load_cassette(path) == []
+
+    def test_async_recording(self, tmp_path):
+        """Test async clients record the same way."""
+        path = tmp_path / "run.cassette"
+
+        async def handler(request: httpx.Request) -> httpx.Response:  # noqa: ARG001
+            return httpx.Response(
+                200, headers={"Content-Type": "text/event-stream"}, content=BODY
+            )
+
+        async def run() -> None:
+            transport = AsyncRecordingTransport(path, httpx.MockTransport(handler))
+            async with (
+                httpx.AsyncClient(transport=transport) as client,
+                client.stream("POST", URL, json={}) as response,
+            ):
+                await response.aread()
+
+        asyncio.run(run())
+
+        (interaction,) = load_cassette(path)
+        assert interaction.events[-1][1] == "data: [DONE]"
+
+
+class TestReplayTransport:
+    """Tests for ReplayTransport."""
+
+    def test_replays_body(self):
+        """Test a recorded stream is served back byte for byte."""
+        events = [(0.0, event.decode()) for event in BODY.split(b"\n\n")[:-1]]
+        interaction = Interaction(200, "text/event-stream", events)
+        client = httpx.Client(transport=ReplayTransport([interaction], speed=0))
+
+        response = client.post(URL, json={})
+
+        assert response.status_code == 200
+        assert response.headers["Content-Type"] == "text/event-stream"
+        assert response.content == BODY
+        assert interaction.body == BODY
+
+    def test_replays_in_order(self):
+        """Test responses are replayed in recording order, then run out."""
+        first = Interaction(200, "application/json", [(0.0, '{"n": 1}')])
+        second = Interaction(503, "application/json", [(0.0, '{"n": 2}')])
+        transport = ReplayTransport([first, second], speed=0)
+        client = httpx.Client(transport=transport)
+
+        assert client.post(URL, json={}).json() == {"n": 1}
+        assert client.post(URL, json={}).status_code == 503
+        assert transport.remaining == 0
+        with pytest.raises(CassetteError):
+            client.post(URL, json={})
+
+    def test_other_requests_get_empty_response(self):
+        """Test warm-ups do not use up recorded responses."""
+        transport = ReplayTransport([], speed=0)
+
+        response = httpx.Client(transport=transport).head("https://api.test/v4")
+
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize(("speed", "minimum"), [(1.0, 0.1), (4.0, 0.025)])
+    def test_paced_by_speed(self, speed, minimum):
+        """Test recorded delays are kept, scaled by the speed."""
+        events = [(50.0, "data: 1"), (50.0, "data: 2")]
+        interaction = Interaction(200, "text/event-stream", events)
+        client = httpx.Client(transport=ReplayTransport([interaction], speed))
+
+        start = time.perf_counter()
+        client.post(URL, json={})
+        elapsed = time.perf_counter() - start
+
+        assert minimum <= elapsed < minimum + 0.1
+
+    def test_async_replay(self):
+        """Test async clients replay the same way."""
+        events = [(0.0, event.decode()) for event in BODY.split(b"\n\n")[:-1]]
+        transport = ReplayTransport([Interaction(200, "text/event-stream", events)])
+
+        async def run() -> bytes:
+            async with httpx.AsyncClient(transport=transport) as client:
+                response = await client.post(URL, json={})
+                return response.content
+
+        assert asyncio.run(run()) == BODY
+
+
+class TestCassetteFile:
+    """Tests for load_cassette."""
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test files that are not cassettes raise CassetteError."""
+        path = tmp_path / "notes.txt"
+        path.write_text("not a cassette")
+
+        with pytest.raises(CassetteError):
+            load_cassette(path)
+
+    def test_missing_file(self, tmp_path):
+        """Test a missing file raises CassetteError."""
+        with pytest.raises(CassetteError):
+            load_cassette(tmp_path / "missing")
+
+
+class TestChatApiServiceCassette:
+    """Tests for recording and replaying through ChatApiService."""
+
+    @pytest.mark.parametrize("raw_stream", [False, True])
+    def test_record_then_replay(self, tmp_path, raw_stream):
+        """Test a replayed completion processes like the recorded one."""
+        path = str(tmp_path / "run.cassette")
+        recording = ChatApiService(
+            _config(raw_stream=raw_stream, cassette=path), _network()
+        )
+        recorded = _process(recording)
+        recording.close()
+
+        replaying = ChatApiService(
+            _config(
+                raw_stream=raw_stream,
+                cassette=path,
+                cassette_mode=CassetteMode.REPLAY,
+                replay_speed=0,
+            )
+        )
+        replayed = _process(replaying)
+        replaying.close()
+
+        assert recorded.content == "Hello there"
+        assert replayed == recorded
@@ -2,12 +2,33 @@
 
 from __future__ import annotations
 
+import json
+import threading
 from unittest.mock import ANY
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
+import httpx
+import pytest
+
 from src.models.config import ChatConfig
+from src.models.config import HttpConfig
 from src.services.chat_api_service import ChatApiService
+from src.services.resumable_stream import StreamStalledError
+from src.tools import get_tool_schemas_json
+from src.tracing import SpanKind
+from src.tracing import trace
+from src.tracing.processor import NullProcessor
+
+
+class RecordingProcessor(NullProcessor):
+    """Processor that keeps finished spans."""
+
+    def __init__(self) -> None:
+        self.spans = []
+
+    def on_span_end(self, span) -> None:
+        self.spans.append(span)
 
 
 class TestChatApiService:
@@ -26,7 +47,10 @@ class TestChatApiService:
         service = ChatApiService(config)
 
         mock_zai_client.assert_called_once_with(
-            api_key="test-key", base_url="https://test.api.com"
+            api_key="test-key",
+            base_url="https://test.api.com",
+            max_retries=0,
+            http_client=service._http,
         )
         assert service._config == config
 
@@ -45,7 +69,8 @@ class TestChatApiService:
         mock_chat = MagicMock()
         mock_client_instance.chat = mock_chat
         mock_chat.completions = mock_completions
-        mock_completions.create = MagicMock(return_value=iter([]))
+        # A stream with no chunks
+        mock_completions.create = MagicMock(return_value=MagicMock())
 
         mock_zai_client.return_value = mock_client_instance
 
@@ -79,7 +104,8 @@ class TestChatApiService:
         mock_chat = MagicMock()
         mock_client_instance.chat = mock_chat
         mock_chat.completions = mock_completions
-        mock_completions.create = MagicMock(return_value=iter([]))
+        # A stream with no chunks
+        mock_completions.create = MagicMock(return_value=MagicMock())
 
         mock_zai_client.return_value = mock_client_instance
 
@@ -100,3 +126,179 @@ class TestChatApiService:
             tools=ANY,
             tool_choice="auto",
         )
+
+    @patch("src.services.chat_api_service.ZaiClient")
+    def test_completion_returns_content(self, mock_zai_client):
+        """Test non-streaming completion calls the API without tools."""
+        config = ChatConfig(
+            api_key="test-key",
+            base_url="https://test.api.com",
+            model="test-model",
+            system_prompt="Test",
+        )
+        mock_create = mock_zai_client.return_value.chat.completions.create
+        mock_create.return_value.choices[0].message.content = "Summary"
+
+        service = ChatApiService(config)
+        messages = [{"role": "user", "content": "Summarize"}]
+
+        assert service.completion(messages) == "Summary"
+        mock_create.assert_called_once_with(
+            model="test-model", messages=messages, stream=False
+        )
+
+    def test_warm_up_connects_in_background(self):
+        """Test warm_up sends a HEAD request to the API through the pool."""
+        config = ChatConfig(
+            api_key="test-key",
+            base_url="https://test.api.com/v4",
+            model="test-model",
+            system_prompt="Test",
+        )
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(404)
+
+        service = ChatApiService(config, httpx.MockTransport(handler))
+        service.warm_up()
+        service._await_warm_up()
+
+        assert [(r.method, str(r.url)) for r in requests] == [
+            ("HEAD", "https://test.api.com/v4")
+        ]
+        service.close()
+
+    def test_warm_up_can_be_disabled(self):
+        """Test warm_up does nothing when disabled in config."""
+        config = ChatConfig(
+            api_key="test-key",
+            base_url="https://test.api.com",
+            model="test-model",
+            system_prompt="Test",
+            http=HttpConfig(warm_up=False),
+        )
+        transport = httpx.MockTransport(lambda _request: httpx.Response(200))
+
+        service = ChatApiService(config, transport)
+        service.warm_up()
+
+        assert service._warm_up is None
+
+    def test_raw_stream_parses_events_without_sdk(self):
+        """Test raw_stream reads the event stream into delta records."""
+        config = ChatConfig(
+            api_key="test-key",
+            base_url="https://test.api.com/v4/",
+            model="test-model",
+            system_prompt="Test",
+            http=HttpConfig(warm_up=False, raw_stream=True),
+        )
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(
+                200,
+                content=(
+                    b'data: {"choices": [{"delta": {"content": "Hel"}}]}\n\n'
+                    b'data: {"choices": [{"delta": {"content": "lo"}}]}\n\n'
+                    b"data: [DONE]\n\n"
+                ),
+            )
+
+        service = ChatApiService(config, httpx.MockTransport(handler))
+        with service.streaming_completion([{"role": "user", "content": "Hi"}]) as r:
+            deltas = [delta.content for delta in r]
+
+        assert deltas == ["Hel", "lo"]
+        assert str(requests[0].url) == "https://test.api.com/v4/chat/completions"
+        assert requests[0].headers["Authorization"] == "Bearer test-key"
+        assert requests[0].headers["Content-Type"] == "application/json"
+        assert b'"tools":' + get_tool_schemas_json().encode() in requests[0].content
+        service.close()
+
+    def test_retries_are_recorded_on_llm_span(self):
+        """Test a retried request records its attempts on the llm span."""
+        config = ChatConfig(
+            api_key="test-key",
+            base_url="https://test.api.com/v4/",
+            model="test-model",
+            system_prompt="Test",
+            http=HttpConfig(warm_up=False, raw_stream=True, retry_backoff=0.0),
+        )
+        responses = [
+            httpx.Response(503),
+            httpx.Response(
+                200, content=b'data: {"choices": [{"delta": {"content": "a"}}]}\n\n'
+            ),
+        ]
+        transport = httpx.MockTransport(lambda _request: responses.pop(0))
+        recorder = RecordingProcessor()
+
+        service = ChatApiService(config, transport)
+        with (
+            patch("src.tracing.trace._create_processor", return_value=recorder),
+            trace("conversation"),
+            service.streaming_completion([{"role": "user", "content": "Hi"}]) as r,
+        ):
+            assert [delta.content for delta in r] == ["a"]
+
+        (llm,) = [s for s in recorder.spans if s.kind == SpanKind.LLM]
+        assert llm.data.get("attempts") == 2
+        assert llm.data.get("winning_attempt") == 2
+        assert llm.data.get("time_to_first_token_ms") is not None
+        service.close()
+
+    def test_stalled_stream_is_continued(self):
+        """Test a stall sends a continuation with the partial content."""
+        config = ChatConfig(
+            api_key="test-key",
+            base_url="https://test.api.com/v4/",
+            model="test-model",
+            system_prompt="Test",
+            http=HttpConfig(warm_up=False, raw_stream=True, stream_idle_timeout=0.05),
+        )
+        release = threading.Event()
+
+        def stalling():
+            yield b'data: {"choices": [{"delta": {"content": "Hel"}}]}\n\n'
+            release.wait(5)
+
+        bodies = []
+        responses = [
+            httpx.Response(200, content=stalling()),
+            httpx.Response(
+                200, content=b'data: {"choices": [{"delta": {"content": "lo"}}]}\n\n'
+            ),
+        ]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            bodies.append(json.loads(request.content))
+            return responses.pop(0)
+
+        recorder = RecordingProcessor()
+        service = ChatApiService(config, httpx.MockTransport(handler))
+        messages = [{"role": "user", "content": "Hi"}]
+        with (
+            patch("src.tracing.trace._create_processor", return_value=recorder),
+            trace("conversation"),
+            service.streaming_completion(messages) as stream,
+        ):
+            received = []
+            with pytest.raises(StreamStalledError):
+                received.extend(delta.content for delta in stream)
+            stream.resume("".join(received))
+            received.extend(delta.content for delta in stream)
+        release.set()
+
+        assert received == ["Hel", "lo"]
+        assert bodies[1]["messages"] == [
+            *messages,
+            {"role": "assistant", "content": "Hel"},
+        ]
+        (llm,) = [s for s in recorder.spans if s.kind == SpanKind.LLM]
+        assert llm.data.get("stalls") == 1
+        assert llm.data.get("stall_recovery_ms") is not None
+        service.close()
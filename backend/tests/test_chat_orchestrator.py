@@ -9,6 +9,7 @@ from unittest.mock import patch
 import pytest
 
 from src.models.config import ChatConfig
+from src.models.config import SessionConfig
 from src.models.tool import StreamResult
 from src.orchestrators.chat_orchestrator import ChatOrchestrator
 
@@ -150,6 +151,8 @@ class TestChatOrchestrator:
         mock_spinner_class.return_value = mock_spinner
         mock_processor_class.return_value = mock_processor
 
+        mock_repo.get_messages_for_api.return_value = []
+
         @contextmanager
         def _raise_error(_messages):
             raise ValueError("API Error")
@@ -191,6 +194,8 @@ class TestChatOrchestrator:
         mock_output.display_welcome.assert_called_once()
         mock_output.display_goodbye.assert_called_once()
         mock_output.get_user_input.assert_called_once()
+        mock_api_class.return_value.warm_up.assert_called_once()
+        mock_api_class.return_value.close.assert_called_once()
 
     @patch("src.orchestrators.chat_orchestrator.ToolExecutor")
     @patch("src.orchestrators.chat_orchestrator.StreamResponseProcessor")
@@ -293,3 +298,47 @@ class TestChatOrchestrator:
         # Should skip empty input and exit on "exit"
         assert mock_output.get_user_input.call_count == 2
         mock_output.display_goodbye.assert_called_once()
+
+    @patch("src.orchestrators.chat_orchestrator.ToolExecutor")
+    @patch("src.orchestrators.chat_orchestrator.ChatApiService")
+    def test_resumes_latest_session(self, mock_api_class, mock_executor, tmp_path):
+        """Test a saved session is continued when resume is set."""
+        config = ChatConfig(
+            api_key="test-key",
+            base_url="https://test.api.com",
+            model="test-model",
+            system_prompt="Test system prompt",
+            session=SessionConfig(db_path=str(tmp_path / "sessions.sqlite3")),
+        )
+        first = ChatOrchestrator(config)
+        first._message_repository.add_user_message("remember me")
+        first._session_store.close()
+
+        config.session.resume = "latest"
+        resumed = ChatOrchestrator(config)
+
+        assert resumed._session.id == first._session.id
+        assert resumed._message_repository.get_messages_for_api()[-1] == {
+            "role": "user",
+            "content": "remember me",
+        }
+        resumed._session_store.close()
+
+    @patch("src.orchestrators.chat_orchestrator.ConsoleOutput")
+    def test_branch_commands(self, mock_output_class, config):
+        """Test /fork, /switch and /branches drive the repository."""
+        mock_output = mock_output_class.return_value
+        orchestrator = ChatOrchestrator(config)
+
+        assert orchestrator._handle_command("/fork alt") is True
+        assert orchestrator._message_repository.branch_id == "alt"
+        assert orchestrator._handle_command("/switch main") is True
+        assert orchestrator._message_repository.branch_id == "main"
+        orchestrator._handle_command("/branches")
+        mock_output.display_info.assert_called_with("*main, alt")
+
+        orchestrator._handle_command("/switch nope")
+        mock_output.display_error.assert_called_once_with(
+            "Unknown branch 'nope'. Branches: main, alt."
+        )
+        assert orchestrator._handle_command("/etc/hosts looks wrong") is False
@@ -0,0 +1,125 @@
+"""Tests for ConversationCompactor."""
+
+from __future__ import annotations
+
+import threading
+from unittest.mock import Mock
+from unittest.mock import patch
+
+from src.models.config import ContextConfig
+from src.services.chat_api_service import ChatApiService
+from src.services.compactor import SUMMARY_PREFIX
+from src.services.compactor import ConversationCompactor
+from src.services.context_window import ContextWindowManager
+from src.tracing import SpanKind
+from src.tracing import trace
+from src.tracing.processor import NullProcessor
+
+
+class _RecordingProcessor(NullProcessor):
+    """Keeps finished spans."""
+
+    def __init__(self) -> None:
+        self.spans = []
+
+    def on_span_end(self, span) -> None:
+        self.spans.append(span)
+
+
+def _add_turns(repository, count: int) -> None:
+    for index in range(count):
+        repository.add_user_message(f"question {index} " + "x" * 400)
+        repository.add_assistant_message(f"answer {index}")
+
+
+def _compactor(repository, summary: str = "They asked questions.", keep: int = 1):
+    api_service = Mock(spec=ChatApiService)
+    api_service.completion.return_value = summary
+    config = ContextConfig(
+        max_tokens=100_000, keep_recent_turns=keep, compact_at_tokens=200
+    )
+    window = ContextWindowManager(repository, config)
+    window.messages_for_request()
+    return ConversationCompactor(repository, api_service, window, config), api_service
+
+
+class TestConversationCompactor:
+    """Tests for ConversationCompactor."""
+
+    def test_below_threshold_does_nothing(self, message_repository):
+        """Test no summarization starts while the prompt is small."""
+        message_repository.add_user_message("hi")
+        compactor, api_service = _compactor(message_repository)
+
+        assert compactor.maybe_start() is False
+        assert compactor.apply() is False
+        api_service.completion.assert_not_called()
+
+    def test_old_turns_are_replaced_by_summary(self, message_repository):
+        """Test the summary replaces everything but the recent turns."""
+        _add_turns(message_repository, 4)
+        compactor, api_service = _compactor(message_repository)
+
+        assert compactor.maybe_start() is True
+        assert compactor.wait(timeout=5)
+        assert compactor.apply() is True
+
+        messages = message_repository.get_messages_for_api()
+        assert messages[0] == {"role": "system", "content": "Test system prompt"}
+        assert messages[1] == {
+            "role": "system",
+            "content": f"{SUMMARY_PREFIX}\nThey asked questions.",
+        }
+        assert messages[2]["content"].startswith("question 3")
+        assert len(messages) == 4
+        transcript = api_service.completion.call_args.args[0][1]["content"]
+        assert "question 0" in transcript
+        assert "question 3" not in transcript
+
+    def test_summary_is_applied_only_when_ready(self, message_repository):
+        """Test apply does not wait for a running summarization."""
+        _add_turns(message_repository, 4)
+        release = threading.Event()
+        compactor, api_service = _compactor(message_repository)
+        api_service.completion.side_effect = lambda _: release.wait(5) and "done"
+
+        compactor.maybe_start()
+        assert compactor.apply() is False
+        assert compactor.maybe_start() is False
+
+        release.set()
+        assert compactor.wait(timeout=5)
+        assert compactor.apply() is True
+        assert compactor.pending is False
+
+    def test_stale_summary_is_discarded(self, message_repository):
+        """Test a summary is dropped if the history was rewritten meanwhile."""
+        _add_turns(message_repository, 4)
+        compactor, _ = _compactor(message_repository)
+
+        compactor.maybe_start()
+        compactor.wait(timeout=5)
+        message_repository.clear()
+
+        assert compactor.apply() is False
+        assert len(message_repository) == 1
+
+    def test_failed_summary_is_traced_and_discarded(self, message_repository):
+        """Test a failed request leaves the history alone and errors the span."""
+        _add_turns(message_repository, 4)
+        compactor, api_service = _compactor(message_repository)
+        api_service.completion.side_effect = RuntimeError("rate limited")
+        processor = _RecordingProcessor()
+
+        with (
+            patch("src.tracing.trace._create_processor", return_value=processor),
+            trace("test"),
+        ):
+            compactor.maybe_start()
+            compactor.wait(timeout=5)
+
+        assert compactor.apply() is False
+        assert len(message_repository) == 9
+        compaction = next(s for s in processor.spans if s.kind == SpanKind.COMPACTION)
+        assert compaction.error == "RuntimeError: rate limited"
+        assert compaction.data.get("message_count") == 6
@@ -0,0 +1,146 @@
+"""Tests for ContextWindowManager."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import patch
+
+from src.models.config import ContextConfig
+from src.models.tool import ToolCall
+from src.models.tool import ToolResult
+from src.services.blob_store import BlobRef
+from src.services.blob_store import BlobStore
+from src.services.context_window import ContextWindowManager
+from src.services.context_window import estimate_tokens
+from src.services.message_repository import MessageRepository
+from src.tracing import SpanKind
+from src.tracing import span
+from src.tracing import trace
+from src.tracing.processor import NullProcessor
+
+
+def _add_turn(repository: MessageRepository, index: int, result_chars: int) -> None:
+    """Add a user turn with one tool call and its result."""
+    repository.add_user_message(f"question {index}")
+    call = ToolCall(id=f"call_{index}", name="read_file", arguments="{}")
+    repository.add_assistant_tool_calls([call])
+    repository.add_tool_result(
+        ToolResult(tool_call_id=call.id, name="read_file", content="x" * result_chars)
+    )
+    repository.add_assistant_message(f"answer {index}")
+
+
+def _manager(repository, max_tokens: int, keep: int = 1) -> ContextWindowManager:
+    config = ContextConfig(max_tokens=max_tokens, keep_recent_turns=keep)
+    return ContextWindowManager(repository, config)
+
+
+class TestContextWindowManager:
+    """Tests for ContextWindowManager."""
+
+    def test_under_budget_sends_everything(self, message_repository):
+        """Test nothing is evicted while within budget."""
+        _add_turn(message_repository, 0, 100)
+        manager = _manager(message_repository, max_tokens=10_000)
+
+        messages = manager.messages_for_request()
+
+        assert messages == message_repository.get_messages_for_api()
+        assert manager.total_tokens == sum(estimate_tokens(m) for m in messages)
+
+    def test_stored_contents_are_read_back(self, tmp_path):
+        """Test requests carry the text of contents kept in a BlobStore."""
+        blobs = BlobStore(tmp_path, min_chars=50)
+        repository = MessageRepository("Test system prompt", blobs=blobs)
+        _add_turn(repository, 0, 100)
+
+        messages = _manager(repository, max_tokens=10_000).messages_for_request()
+
+        assert isinstance(repository.get_messages_for_api()[3]["content"], BlobRef)
+        assert messages[3]["content"] == "x" * 100
+        blobs.close()
+
+    def test_estimates_only_new_messages(self, message_repository):
+        """Test each message is estimated once, when first seen."""
+        manager = _manager(message_repository, max_tokens=10_000)
+        _add_turn(message_repository, 0, 100)
+        manager.messages_for_request()
+
+        _add_turn(message_repository, 1, 100)
+        with patch(
+            "src.services.context_window.estimate_tokens", return_value=1
+        ) as estimate:
+            manager.messages_for_request()
+
+        assert estimate.call_count == 4
+
+    def test_old_tool_results_are_stubbed_first(self, message_repository):
+        """Test old tool results become stubs and recent turns are kept."""
+        for index in range(3):
+            _add_turn(message_repository, index, 2000)
+        manager = _manager(message_repository, max_tokens=900)
+
+        messages = manager.messages_for_request()
+
+        tool_messages = [m for m in messages if m["role"] == "tool"]
+        assert "removed to save context" in tool_messages[0]["content"]
+        assert "removed to save context" in tool_messages[1]["content"]
+        assert tool_messages[2]["content"] == "x" * 2000
+        assert tool_messages[0]["tool_call_id"] == "call_0"
+        assert manager.total_tokens <= 900
+        assert len(messages) == len(message_repository)
+
+    def test_old_turns_are_dropped_when_stubs_are_not_enough(self, message_repository):
+        """Test whole old turns are dropped, keeping the system prompt."""
+        for index in range(4):
+            _add_turn(message_repository, index, 400)
+        manager = _manager(message_repository, max_tokens=200)
+
+        messages = manager.messages_for_request()
+
+        assert messages[0]["role"] == "system"
+        assert messages[1] == {"role": "user", "content": "question 3"}
+        assert len(messages) == 5
+
+    def test_evictions_persist_across_requests(self, message_repository):
+        """Test the evicted prefix stays stable as the conversation grows."""
+        for index in range(3):
+            _add_turn(message_repository, index, 2000)
+        manager = _manager(message_repository, max_tokens=900)
+        first = manager.messages_for_request()
+
+        message_repository.add_user_message("follow-up")
+        second = manager.messages_for_request()
+
+        assert second[: len(first)] == first
+
+    def test_clear_resets_the_view(self, message_repository):
+        """Test clearing the repository rebuilds the view."""
+        _add_turn(message_repository, 0, 100)
+        manager = _manager(message_repository, max_tokens=10_000)
+        manager.messages_for_request()
+
+        message_repository.clear()
+
+        assert manager.messages_for_request() == [
+            {"role": "system", "content": "Test system prompt"}
+        ]
+
+    def test_evictions_are_recorded_on_turn_span(self, message_repository):
+        """Test the turn span records budget state and each eviction."""
+        for index in range(3):
+            _add_turn(message_repository, index, 2000)
+        manager = _manager(message_repository, max_tokens=900)
+
+        with (
+            patch("src.tracing.trace._create_processor", return_value=NullProcessor()),
+            trace("test"),
+            span("turn", kind=SpanKind.TURN) as s,
+        ):
+            manager.messages_for_request()
+
+        evictions = json.loads(s.data.get("context_evictions"))
+        assert [e["action"] for e in evictions] == ["stub_tool_result"] * 2
+        assert s.data.get("context_budget") == 900
+        assert s.data.get("context_tokens") <= 900
+        assert s.data.get("context_tokens_freed") == sum(e["tokens"] for e in evictions)
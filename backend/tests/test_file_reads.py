@@ -0,0 +1,219 @@
+"""Tests for FileReadTracker."""
+
+from __future__ import annotations
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.models.config import ContextConfig
+from src.models.message import Message
+from src.models.message import MessageRole
+from src.models.tool import ToolCall
+from src.models.tool import ToolResult
+from src.services.context_window import ContextWindowManager
+from src.services.file_reads import FileReadTracker
+from src.tools.read_file import ReadFileArgs
+from src.tools.read_file import ReadFileTool
+from src.tracing import SpanKind
+from src.tracing import span
+from src.tracing import trace
+from src.tracing.processor import NullProcessor
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    """Create a 40-line file."""
+    path = tmp_path / "module.py"
+    path.write_text("".join(f"line {n}\n" for n in range(1, 41)))
+    return path
+
+
+@pytest.fixture
+def window(message_repository):
+    """Create a context window that never evicts."""
+    return ContextWindowManager(message_repository, ContextConfig())
+
+
+@pytest.fixture
+def tracker(message_repository, window):
+    """Create a tracker over the test repository."""
+    return FileReadTracker(message_repository, window)
+
+
+def _read(repository, tracker, call_id: str, **arguments) -> str:
+    """Run read_file like the orchestrator and return the content added."""
+    call = ToolCall(id=call_id, name="read_file", arguments=json.dumps(arguments))
+    output = ReadFileTool().execute(ReadFileArgs(**arguments))
+    repository.add_assistant_tool_calls([call])
+    result = tracker.dedupe(
+        call, ToolResult(tool_call_id=call_id, name="read_file", content=output)
+    )
+    repository.add_tool_result(result)
+    return result.content
+
+
+class TestFileReadTracker:
+    """Tests for FileReadTracker."""
+
+    def test_unchanged_reread_is_stubbed(
+        self, message_repository, tracker, source_file
+    ):
+        """Test reading the same lines again returns a pointer."""
+        first = _read(message_repository, tracker, "c1", path=str(source_file))
+        second = _read(message_repository, tracker, "c2", path=str(source_file))
+
+        assert "40: line 40" in first
+        assert second == (
+            f"[file: {source_file}]\n"
+            "[lines 1-40 unchanged since message 2 (read_file call c1); "
+            "use the content shown there]"
+        )
+
+    def test_subrange_of_earlier_read_is_stubbed(
+        self, message_repository, tracker, source_file
+    ):
+        """Test a range inside an earlier read returns a pointer."""
+        _read(message_repository, tracker, "c1", path=str(source_file))
+
+        content = _read(
+            message_repository,
+            tracker,
+            "c2",
+            path=str(source_file),
+            start_line=5,
+            end_line=9,
+        )
+
+        assert content.endswith(
+            "[lines 5-9 unchanged since message 2 (read_file call c1); "
+            "use the content shown there]"
+        )
+
+    def test_changed_file_returns_diff(self, message_repository, tracker, source_file):
+        """Test a small edit is sent as a diff with file line numbers."""
+        _read(message_repository, tracker, "c1", path=str(source_file))
+        source_file.write_text(
+            source_file.read_text().replace("line 20\n", "line twenty\n")
+        )
+
+        content = _read(message_repository, tracker, "c2", path=str(source_file))
+
+        assert "[changed since message 2; diff of lines 1-40]" in content
+        assert "@@ -18,5 +18,5 @@\n line 18\n line 19\n-line 20\n+line twenty\n" in (
+            content
+        )
+        assert "line 5" not in content
+
+    def test_large_change_returns_full_content(
+        self, message_repository, tracker, source_file
+    ):
+        """Test a rewrite is sent in full when a diff would not be smaller."""
+        _read(message_repository, tracker, "c1", path=str(source_file))
+        source_file.write_text("".join(f"new {n}\n" for n in range(1, 41)))
+
+        content = _read(message_repository, tracker, "c2", path=str(source_file))
+
+        assert "40: new 40" in content
+
+    def test_touched_file_is_stubbed(self, message_repository, tracker, source_file):
+        """Test a new mtime without new content still returns a pointer."""
+        _read(message_repository, tracker, "c1", path=str(source_file))
+        stat = source_file.stat()
+        os.utime(source_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        content = _read(message_repository, tracker, "c2", path=str(source_file))
+
+        assert "unchanged since message 2" in content
+
+    def test_evicted_read_is_sent_again(self, message_repository, source_file):
+        """Test content removed from the context window is not referenced."""
+        window = ContextWindowManager(
+            message_repository, ContextConfig(max_tokens=1, keep_recent_turns=0)
+        )
+        tracker = FileReadTracker(message_repository, window)
+        _read(message_repository, tracker, "c1", path=str(source_file))
+        window.messages_for_request()
+
+        content = _read(message_repository, tracker, "c2", path=str(source_file))
+
+        assert "40: line 40" in content
+
+    def test_stub_is_sent_in_full_once_original_is_evicted(
+        self, message_repository, source_file
+    ):
+        """Test the model is sent the content when the stub's target is gone."""
+        config = ContextConfig(keep_recent_turns=1)
+        window = ContextWindowManager(message_repository, config)
+        tracker = FileReadTracker(message_repository, window)
+        message_repository.add_user_message("Read it")
+        _read(message_repository, tracker, "c1", path=str(source_file))
+        message_repository.add_user_message("Read it again")
+        stub = _read(message_repository, tracker, "c2", path=str(source_file))
+        window.messages_for_request()
+        config.max_tokens = window.total_tokens - 1
+
+        sent = {
+            message.get("tool_call_id"): message.get("content")
+            for message in window.messages_for_request()
+        }
+
+        assert "unchanged since message" in stub
+        assert "40: line 40" not in str(sent.get("c1"))
+        assert "40: line 40" in str(sent["c2"])
+
+    def test_stub_is_sent_in_full_once_original_is_compacted(
+        self, message_repository, window, tracker, source_file
+    ):
+        """Test a summary replacing the original read expands the stub."""
+        message_repository.add_user_message("Read it")
+        _read(message_repository, tracker, "c1", path=str(source_file))
+        message_repository.add_user_message("Read it again")
+        _read(message_repository, tracker, "c2", path=str(source_file))
+        window.messages_for_request()
+
+        message_repository.replace_range(
+            1, 4, Message(role=MessageRole.USER, content="[Summary] read a file")
+        )
+        sent = window.messages_for_request()
+
+        assert "40: line 40" in str(sent[-1]["content"])
+
+    def test_rewritten_history_is_not_referenced(
+        self, message_repository, tracker, source_file
+    ):
+        """Test reads from before a history rewrite are forgotten."""
+        _read(message_repository, tracker, "c1", path=str(source_file))
+        message_repository.clear()
+
+        content = _read(message_repository, tracker, "c2", path=str(source_file))
+
+        assert "40: line 40" in content
+
+    def test_other_tools_and_errors_pass_through(self, tracker):
+        """Test only successful read_file results are considered."""
+        call = ToolCall(id="c1", name="get_current_time", arguments="{}")
+        result = ToolResult(tool_call_id="c1", name="get_current_time", content="now")
+        error = ToolResult(
+            tool_call_id="c2", name="read_file", content="x", is_error=True
+        )
+
+        assert tracker.dedupe(call, result) is result
+        assert tracker.dedupe(call, error) is error
+
+    def test_savings_are_recorded_on_span(
+        self, message_repository, tracker, source_file
+    ):
+        """Test the active span counts deduplicated reads and saved chars."""
+        with (
+            patch("src.tracing.trace._create_processor", return_value=NullProcessor()),
+            trace("test"),
+            span("llm", kind=SpanKind.LLM) as s,
+        ):
+            first = _read(message_repository, tracker, "c1", path=str(source_file))
+            second = _read(message_repository, tracker, "c2", path=str(source_file))
+
+        assert s.data.get("dedup_reads") == 1
+        assert s.data.get("dedup_chars_saved") == len(first) - len(second)
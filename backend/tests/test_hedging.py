@@ -0,0 +1,206 @@
+"""Tests for hedged and retried stream starts."""
+
+from __future__ import annotations
+
+import threading
+
+import httpx
+import pytest
+
+from src.models.config import HttpConfig
+from src.services.hedging import LatencyTracker
+from src.services.hedging import call_with_retries
+from src.services.hedging import is_retryable
+from src.services.hedging import retry_delay
+from src.services.hedging import start_stream
+
+NO_BACKOFF = HttpConfig(retry_backoff=0.0)
+HEDGED = HttpConfig(retry_backoff=0.0, hedge=True)
+
+
+def status_error(status: int, headers: dict[str, str] | None = None):
+    """An httpx status error for a response with ``status``."""
+    request = httpx.Request("POST", "https://test.api.com/chat/completions")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError("failed", request=request, response=response)
+
+
+class FakeStream:
+    """Opens streams that fail, block or yield chunks, one per call."""
+
+    def __init__(self, *behaviors) -> None:
+        self._behaviors = list(behaviors)
+        self.calls = 0
+        self.closed: list[int] = []
+
+    def __call__(self):
+        self.calls += 1
+        number = self.calls
+        behavior = self._behaviors.pop(0)
+        if isinstance(behavior, Exception):
+            raise behavior
+
+        def chunks():
+            if isinstance(behavior, threading.Event):
+                behavior.wait(5)
+                yield f"late {number}"
+            else:
+                yield from behavior
+
+        return chunks(), lambda: self.closed.append(number)
+
+
+class TestRetries:
+    """Tests for retry decisions and delays."""
+
+    def test_retryable_errors(self):
+        """Test 5xx, 429 and connection errors are retried; 4xx are not."""
+        request = httpx.Request("POST", "https://test.api.com")
+        wrapped = RuntimeError("Connection error.")
+        wrapped.__cause__ = httpx.ConnectError("refused", request=request)
+
+        assert is_retryable(status_error(503))
+        assert is_retryable(status_error(429))
+        assert is_retryable(httpx.ReadTimeout("slow", request=request))
+        assert is_retryable(wrapped)
+        assert not is_retryable(status_error(400))
+        assert not is_retryable(ValueError("bad"))
+
+    def test_delay_backs_off_and_honors_retry_after(self):
+        """Test delays double per retry, are capped, and follow Retry-After."""
+        config = HttpConfig(retry_backoff=1.0, retry_backoff_max=5.0)
+
+        assert 0.5 <= retry_delay(status_error(503), 0, config) <= 1.0
+        assert 2.0 <= retry_delay(status_error(503), 2, config) <= 4.0
+        assert retry_delay(status_error(503), 10, config) == 5.0
+        retry_after = status_error(429, {"Retry-After": "3"})
+        assert retry_delay(retry_after, 0, config) == 3.0
+
+    def test_call_with_retries(self):
+        """Test a call is repeated until it succeeds or retries run out."""
+        outcomes = [status_error(502), "ok"]
+
+        def call():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        assert call_with_retries(call, NO_BACKOFF) == "ok"
+
+    def test_call_with_retries_gives_up(self):
+        """Test the error is raised once retries are used up."""
+        calls = []
+
+        def call():
+            calls.append(1)
+            raise status_error(500)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            call_with_retries(call, HttpConfig(max_retries=1, retry_backoff=0.0))
+        assert len(calls) == 2
+
+
+class TestLatencyTracker:
+    """Tests for LatencyTracker."""
+
+    def test_percentile(self):
+        """Test the nearest-rank percentile over the window."""
+        tracker = LatencyTracker(size=100)
+        assert tracker.percentile(0.95) is None
+
+        for ms in range(1, 101):
+            tracker.add(ms / 1000)
+
+        assert tracker.percentile(0.95) == 0.095
+        assert tracker.percentile(1.0) == 0.1
+
+    def test_window_keeps_recent_samples(self):
+        """Test old samples fall out of the window."""
+        tracker = LatencyTracker(size=3)
+        for seconds in (9.0, 1.0, 2.0, 3.0):
+            tracker.add(seconds)
+
+        assert len(tracker) == 3
+        assert tracker.percentile(1.0) == 3.0
+
+
+class TestStartStream:
+    """Tests for start_stream."""
+
+    def test_first_request_streams(self):
+        """Test a healthy stream is used as is, with its first chunk."""
+        opener = FakeStream(["a", "b"])
+        latencies = LatencyTracker()
+
+        stream = start_stream(opener, NO_BACKOFF, latencies)
+
+        assert list(stream.chunks) == ["a", "b"]
+        assert (stream.attempts, stream.winner) == (1, 1)
+        assert len(latencies) == 1
+
+    def test_retries_retryable_failure(self):
+        """Test a retryable failure is retried and the retry streams."""
+        opener = FakeStream(status_error(503), ["a"])
+
+        stream = start_stream(opener, NO_BACKOFF, LatencyTracker())
+
+        assert list(stream.chunks) == ["a"]
+        assert (stream.attempts, stream.winner) == (2, 2)
+
+    def test_non_retryable_failure_raises(self):
+        """Test a non-retryable failure is raised without retrying."""
+        opener = FakeStream(status_error(401))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            start_stream(opener, NO_BACKOFF, LatencyTracker())
+        assert opener.calls == 1
+
+    def test_gives_up_after_max_retries(self):
+        """Test the last error is raised once retries are used up."""
+        opener = FakeStream(status_error(500), status_error(502), status_error(503))
+
+        with pytest.raises(httpx.HTTPStatusError, match="failed") as info:
+            start_stream(
+                opener, HttpConfig(max_retries=2, retry_backoff=0.0), LatencyTracker()
+            )
+        assert info.value.response.status_code == 503
+
+    def test_hedges_slow_first_chunk(self):
+        """Test a second request is sent after the p95 and the faster wins."""
+        stalled = threading.Event()
+        opener = FakeStream(stalled, ["fast"])
+        latencies = LatencyTracker()
+        for _ in range(5):
+            latencies.add(0.01)
+
+        stream = start_stream(opener, HEDGED, latencies)
+        stalled.set()
+
+        assert list(stream.chunks) == ["fast"]
+        assert (stream.attempts, stream.winner) == (2, 2)
+        assert opener.closed == [1]
+
+    def test_no_hedging_without_enough_samples(self):
+        """Test nothing is hedged until enough latencies are observed."""
+        opener = FakeStream(["a"])
+        latencies = LatencyTracker()
+        latencies.add(0.0)
+
+        config = HttpConfig(hedge=True, hedge_min_samples=2)
+        stream = start_stream(opener, config, latencies)
+
+        assert stream.attempts == 1
+
+    def test_no_hedging_by_default(self):
+        """Test hedging is opt-in."""
+        stalled = threading.Event()
+        opener = FakeStream(stalled, ["fast"])
+        latencies = LatencyTracker()
+        for _ in range(5):
+            latencies.add(0.0)
+
+        threading.Timer(0.1, stalled.set).start()
+        stream = start_stream(opener, NO_BACKOFF, latencies)
+
+        assert stream.attempts == 1
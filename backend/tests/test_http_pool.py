@@ -0,0 +1,94 @@
+"""Tests for the pooled HTTP client."""
+
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.models.config import HttpConfig
+from src.services.http_pool import create_http_client
+from src.tracing import SpanKind
+from src.tracing import span
+from src.tracing import trace
+from src.tracing.processor import NullProcessor
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    """Answers every request with an empty 200, keeping the connection open."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def server_url():
+    """Run a local HTTP/1.1 server."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def _get_in_span(client: httpx.Client, url: str):
+    """Send a request inside an llm span and return the span."""
+    with span("llm", kind=SpanKind.LLM) as s:
+        client.get(url)
+    return s
+
+
+class TestHttpPool:
+    """Tests for create_http_client."""
+
+    def test_connections_are_reused(self, server_url):
+        """Test the first request connects and the next one reuses it."""
+        client = create_http_client(HttpConfig())
+        with (
+            patch("src.tracing.trace._create_processor", return_value=NullProcessor()),
+            trace("test"),
+        ):
+            first = _get_in_span(client, server_url)
+            second = _get_in_span(client, server_url)
+        client.close()
+
+        assert first.data.get("connection_reused") is False
+        assert first.data.get("connect_ms") > 0
+        assert second.data.get("connection_reused") is True
+        assert second.data.get("connect_ms") == 0.0
+
+    def test_requests_outside_spans_are_not_traced(self):
+        """Test no trace callback is attached without a current span."""
+        seen: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200)
+
+        client = create_http_client(HttpConfig(), httpx.MockTransport(handler))
+        client.get("https://api.test/")
+
+        assert "trace" not in seen[0].extensions
+
+    def test_pool_limits_come_from_config(self):
+        """Test keep-alive settings are applied to the transport pool."""
+        config = HttpConfig(max_keepalive_connections=2, keepalive_expiry=30.0)
+
+        client = create_http_client(config)
+        pool = client._transport._pool
+
+        assert pool._max_keepalive_connections == 2
+        assert pool._keepalive_expiry == 30.0
+        client.close()
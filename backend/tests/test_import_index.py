@@ -0,0 +1,150 @@
+"""Tests for the reverse-import index."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from src.tools.import_index import ImportIndex
+from src.tools.import_index import get_import_index
+from src.tools.import_index import imported_modules
+from src.tools.read_file import ReadFileArgs
+from src.tools.read_file import ReadFileTool
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    """A small package with absolute, relative and dotted imports."""
+    root = tmp_path / "ws"
+    pkg = root / "app"
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "storage.py").write_text("VALUE = 1\n")
+    (pkg / "service.py").write_text("from .storage import VALUE\n")
+    (pkg / "cli.py").write_text("import app.service\n")
+    (root / "tests").mkdir()
+    (root / "tests" / "test_storage.py").write_text("from app import storage\n")
+    return root
+
+
+def _index(workspace, tmp_path) -> ImportIndex:
+    return ImportIndex(workspace, tmp_path / "index.sqlite3", refresh_interval=0.0)
+
+
+def _touch(path, content: str) -> None:
+    """Rewrite a file and move its mtime forward so the change is visible."""
+    path.write_text(content)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestImportedModules:
+    """Tests for import extraction."""
+
+    def test_collects_every_form(self):
+        """Test plain, dotted, relative and function-level imports."""
+        source = (
+            "import os.path\n"
+            "from . import sibling\n"
+            "from ..pkg.mod import name\n"
+            "def f():\n"
+            "    import late\n"
+        )
+        modules = imported_modules(source)
+        assert {"os", "path", "sibling", "pkg", "mod", "name", "late"} <= modules
+
+
+class TestImportIndex:
+    """Tests for ImportIndex."""
+
+    def test_finds_importers(self, workspace, tmp_path):
+        """Test relative, dotted and from-imports are all indexed."""
+        index = _index(workspace, tmp_path)
+
+        assert index.importers("storage") == [
+            "app/service.py",
+            "tests/test_storage.py",
+        ]
+        assert index.importers("service") == ["app/cli.py"]
+        assert index.importers("missing") == []
+
+    def test_only_changed_files_are_parsed(self, workspace, tmp_path):
+        """Test a rescan re-parses modified files and drops deleted ones."""
+        index = _index(workspace, tmp_path)
+        assert index.refresh() == 5
+        assert index.refresh() == 0
+
+        _touch(workspace / "app" / "cli.py", "from app import storage\n")
+        (workspace / "app" / "service.py").unlink()
+
+        assert index.refresh() == 1
+        assert index.importers("storage") == ["app/cli.py", "tests/test_storage.py"]
+        assert index.importers("service") == []
+
+    def test_state_persists_across_instances(self, workspace, tmp_path):
+        """Test a new index loads stored imports instead of re-parsing."""
+        _index(workspace, tmp_path).refresh()
+
+        index = _index(workspace, tmp_path)
+
+        assert index.refresh() == 0
+        assert index.importers("service") == ["app/cli.py"]
+
+    def test_skips_hidden_and_vendored_dirs(self, workspace, tmp_path):
+        """Test virtualenvs and caches are not indexed."""
+        for name in (".venv", "node_modules", "__pycache__"):
+            (workspace / name).mkdir()
+            (workspace / name / "dep.py").write_text("import storage\n")
+
+        index = _index(workspace, tmp_path)
+
+        assert index.importers("storage") == [
+            "app/service.py",
+            "tests/test_storage.py",
+        ]
+
+    def test_invalid_source_imports_nothing(self, workspace, tmp_path):
+        """Test files with syntax errors are indexed as importing nothing."""
+        (workspace / "broken.py").write_text("import storage\ndef (:\n")
+
+        index = _index(workspace, tmp_path)
+
+        assert "broken.py" not in index.importers("storage")
+
+    def test_scans_are_throttled(self, workspace, tmp_path):
+        """Test lookups inside the refresh interval reuse the last scan."""
+        index = ImportIndex(workspace, tmp_path / "index.sqlite3", refresh_interval=60)
+        index.importers("storage")
+
+        (workspace / "app" / "new.py").write_text("from . import storage\n")
+
+        assert "app/new.py" not in index.importers("storage")
+        index.refresh()
+        assert "app/new.py" in index.importers("storage")
+
+
+class TestReadFileUsedBy:
+    """Tests for the read_file used_by header."""
+
+    def test_header_lists_non_test_importers(self, workspace, monkeypatch):
+        """Test the header comes from the index and excludes tests."""
+        monkeypatch.chdir(workspace)
+        path = workspace / "app" / "storage.py"
+
+        output = ReadFileTool().execute(ReadFileArgs(path=str(path)))
+
+        assert "[used_by: app/service.py]" in output
+
+    def test_fingerprint_changes_with_importers(self, workspace, monkeypatch):
+        """Test a new importer invalidates cached outputs of the file."""
+        monkeypatch.chdir(workspace)
+        tool = ReadFileTool()
+        args = ReadFileArgs(path=str(workspace / "app" / "storage.py"))
+        before = tool.fingerprint(args)
+
+        (workspace / "app" / "jobs.py").write_text("from .storage import VALUE\n")
+        get_import_index().refresh()
+
+        assert tool.fingerprint(args) != before
+        assert "[used_by: app/jobs.py, app/service.py]" in tool.execute(args)
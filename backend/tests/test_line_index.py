@@ -0,0 +1,79 @@
+"""Tests for memory-mapped line range reads."""
+
+from __future__ import annotations
+
+import os
+import random
+from unittest.mock import patch
+
+import pytest
+
+from src.tools import line_index
+from src.tools.line_index import LineIndex
+from src.tools.line_index import read_line_range
+
+
+@pytest.fixture(autouse=True)
+def small_blocks(monkeypatch):
+    """Use small checkpoint blocks so tests cross their boundaries."""
+    monkeypatch.setattr(line_index, "CHECKPOINT_LINES", 4)
+    line_index._index_cache.clear()
+
+
+def _write(tmp_path, data: bytes):
+    path = tmp_path / "data.txt"
+    path.write_bytes(data)
+    return path
+
+
+class TestReadLineRange:
+    """Tests for read_line_range."""
+
+    @pytest.mark.parametrize("newline", ["\n", "\r\n"])
+    @pytest.mark.parametrize("trailing", [True, False])
+    def test_matches_splitlines(self, tmp_path, newline, trailing):
+        """Test every range equals slicing the fully split file."""
+        rng = random.Random(7)  # noqa: S311
+        lines = ["x" * rng.randrange(12) + "é" * rng.randrange(3) for _ in range(37)]
+        text = newline.join(lines) + (newline if trailing else "")
+        path = _write(tmp_path, text.encode())
+        expected = text.splitlines()
+
+        for start in range(0, 40, 3):
+            for end in (None, start + 1, start + 5, 100):
+                selected, total = read_line_range(path, start, end)
+                assert total == len(expected)
+                assert selected == expected[start:end]
+
+    def test_empty_file(self, tmp_path):
+        """Test an empty file has no lines."""
+        assert read_line_range(_write(tmp_path, b""), 0, None) == ([], 0)
+
+    def test_blank_lines_are_kept(self, tmp_path):
+        """Test consecutive newlines produce empty lines."""
+        path = _write(tmp_path, b"a\n\n\nb")
+        assert read_line_range(path, 0, None) == (["a", "", "", "b"], 4)
+
+    def test_only_selected_bytes_are_decoded(self, tmp_path):
+        """Test invalid UTF-8 outside the range does not fail the read."""
+        path = _write(tmp_path, b"ok\n\xff\xfe\nfine\n")
+
+        assert read_line_range(path, 2, 3) == (["fine"], 3)
+        with pytest.raises(UnicodeDecodeError):
+            read_line_range(path, 1, 2)
+
+    def test_index_is_reused_until_file_changes(self, tmp_path):
+        """Test the index is built once per file version."""
+        path = _write(tmp_path, b"one\ntwo\nthree\n")
+
+        with patch.object(LineIndex, "build", wraps=LineIndex.build) as build:
+            read_line_range(path, 0, 1)
+            read_line_range(path, 1, 3)
+            assert build.call_count == 1
+
+            path.write_bytes(b"one\ntwo\nthree\nfour\n")
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+            assert read_line_range(path, 3, None) == (["four"], 4)
+            assert build.call_count == 2
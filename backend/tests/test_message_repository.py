@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import pytest
+
+from src.models.message import Message
 from src.models.message import MessageRole
 from src.services.message_repository import MessageRepository
 
@@ -95,3 +98,131 @@ class TestMessageRepository:
         assert len(messages1) == 1
         assert len(messages2) == 2
         assert messages1 is not messages2
+
+    def test_api_messages_are_serialized_once(self, message_repository):
+        """Test each round reuses the dicts built when messages were added."""
+        message_repository.add_user_message("Hello")
+        first = message_repository.get_messages_for_api()
+        message_repository.add_assistant_message("Hi")
+        second = message_repository.get_messages_for_api()
+
+        assert first is not second
+        assert len(first) == 2
+        assert all(a is b for a, b in zip(first, second, strict=False))
+
+    def test_clear_resets_api_messages(self, message_repository):
+        """Test clearing drops API messages except the system prompt."""
+        message_repository.add_user_message("Hello")
+        message_repository.clear()
+
+        assert message_repository.get_messages_for_api() == [
+            {"role": "system", "content": "Test system prompt"}
+        ]
+
+    def test_replace_range(self, message_repository):
+        """Test a range of messages is swapped for one and the revision bumps."""
+        for content in ("a", "b", "c"):
+            message_repository.add_user_message(content)
+        revision = message_repository.revision
+
+        message_repository.replace_range(
+            1, 3, Message(role=MessageRole.SYSTEM, content="summary")
+        )
+
+        assert [m.content for m in message_repository.get_all_messages()] == [
+            "Test system prompt",
+            "summary",
+            "c",
+        ]
+        assert message_repository.get_messages_for_api()[1] == {
+            "role": "system",
+            "content": "summary",
+        }
+        assert message_repository.revision == revision + 1
+
+
+class TestBranches:
+    """Tests for forking and switching branches."""
+
+    def test_fork_shares_messages(self, message_repository):
+        """Test a fork starts with the parent's messages, without copying them."""
+        message_repository.add_user_message("shared")
+        before = message_repository.get_all_messages()
+
+        branch_id = message_repository.fork("alt")
+        message_repository.switch(branch_id)
+
+        after = message_repository.get_all_messages()
+        assert message_repository.branch_id == "alt"
+        assert all(a is b for a, b in zip(before, after, strict=True))
+
+    def test_branches_diverge(self, message_repository):
+        """Test messages added on one branch are not seen by the other."""
+        message_repository.add_user_message("shared")
+        message_repository.fork("alt")
+        message_repository.add_user_message("main only")
+        message_repository.switch("alt")
+        message_repository.add_user_message("alt only")
+
+        alt = [m["content"] for m in message_repository.get_messages_for_api()]
+        message_repository.switch("main")
+        main = [m["content"] for m in message_repository.get_messages_for_api()]
+
+        assert alt == ["Test system prompt", "shared", "alt only"]
+        assert main == ["Test system prompt", "shared", "main only"]
+
+    def test_fork_of_fork(self, message_repository):
+        """Test forks chain through several segments."""
+        message_repository.add_user_message("a")
+        message_repository.switch(message_repository.fork("b"))
+        message_repository.add_user_message("b")
+        message_repository.switch(message_repository.fork("c"))
+        message_repository.add_user_message("c")
+
+        contents = [m.content for m in message_repository.get_all_messages()]
+
+        assert contents == ["Test system prompt", "a", "b", "c"]
+        assert len(message_repository) == 4
+
+    def test_each_branch_has_its_own_api_cache(self, message_repository):
+        """Test branch API lists are separate but share the message dicts."""
+        message_repository.add_user_message("shared")
+        main_api = message_repository.get_messages_for_api()
+        message_repository.switch(message_repository.fork("alt"))
+
+        alt_api = message_repository.get_messages_for_api()
+
+        assert alt_api == main_api
+        assert all(a is b for a, b in zip(main_api, alt_api, strict=True))
+
+    def test_switch_bumps_revision(self, message_repository):
+        """Test switching branches invalidates views of the history."""
+        message_repository.fork("alt")
+        revision = message_repository.revision
+
+        message_repository.switch("alt")
+        message_repository.switch("alt")
+
+        assert message_repository.revision == revision + 1
+
+    def test_replace_range_leaves_other_branches_alone(self, message_repository):
+        """Test rewriting a fork's history does not change its parent."""
+        for content in ("a", "b", "c"):
+            message_repository.add_user_message(content)
+        message_repository.switch(message_repository.fork("alt"))
+
+        message_repository.replace_range(
+            1, 3, Message(role=MessageRole.SYSTEM, content="summary")
+        )
+        message_repository.switch("main")
+
+        contents = [m.content for m in message_repository.get_all_messages()]
+        assert contents == ["Test system prompt", "a", "b", "c"]
+
+    def test_unknown_and_duplicate_branches(self, message_repository):
+        """Test switching to a missing branch or reusing an ID fails."""
+        with pytest.raises(KeyError, match="Unknown branch 'nope'"):
+            message_repository.switch("nope")
+        with pytest.raises(ValueError, match="already exists"):
+            message_repository.fork("main")
+        assert message_repository.branches == ["main"]
@@ -0,0 +1,272 @@
+"""Tests for the mock LLM server."""
+
+from __future__ import annotations
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.mock_llm import Faults
+from src.mock_llm import MockLLMServer
+from src.mock_llm import MockResponse
+from src.mock_llm import MockScript
+from src.mock_llm import MockToolCall
+from src.mock_llm.script import stream_chunks
+from src.models.config import ChatConfig
+from src.models.config import HttpConfig
+from src.models.tool import ToolCall
+from src.processors.stream_response_processor import StreamResponseProcessor
+from src.services.chat_api_service import ChatApiService
+from src.services.message_repository import MessageRepository
+from src.services.sse_parser import StreamError
+from src.tracing import SpanKind
+from src.tracing import trace
+from src.tracing.processor import NullProcessor
+
+
+class RecordingProcessor(NullProcessor):
+    """Processor that keeps finished spans."""
+
+    def __init__(self) -> None:
+        self.spans = []
+
+    def on_span_end(self, span) -> None:
+        self.spans.append(span)
+
+
+TOOL_TURN = [
+    MockResponse(
+        reasoning="Need the time.",
+        tool_calls=[MockToolCall("get_current_time", '{"tz": "UTC"}')],
+    ),
+    MockResponse(content="It is late."),
+]
+
+
+@pytest.fixture
+def server():
+    """A running server with a tool call turn and no delays."""
+    server = MockLLMServer(
+        MockScript(responses=list(TOOL_TURN), ttft=0.0, token_delay=0.0), port=0
+    )
+    server.start()
+    yield server
+    server.stop()
+
+
+def service(server: MockLLMServer, **http: object) -> ChatApiService:
+    """A service talking to ``server``."""
+    config = ChatConfig(
+        api_key="any",
+        base_url=server.url,
+        model="mock-model",
+        system_prompt="Test",
+        http=HttpConfig(warm_up=False, **http),
+    )
+    return ChatApiService(config)
+
+
+def process(api: ChatApiService, messages: list[dict[str, object]]):
+    """Stream one completion through the processor."""
+    processor = StreamResponseProcessor(MessageRepository("Test"), Mock(), Mock())
+    with api.streaming_completion(messages) as response:
+        return processor.process(response)
+
+
+class TestMockScript:
+    """Tests for MockScript."""
+
+    def test_response_follows_steps_of_the_turn(self):
+        """Test each assistant message since the user's advances a step."""
+        script = MockScript(responses=list(TOOL_TURN))
+        user = {"role": "user", "content": "Time?"}
+        assistant = {"role": "assistant", "content": ""}
+        tool = {"role": "tool", "content": "12:00", "tool_call_id": "c"}
+
+        assert script.response_for([user]) is TOOL_TURN[0]
+        assert script.response_for([user, assistant, tool]) is TOOL_TURN[1]
+        assert script.response_for([user, assistant, tool] * 2) is TOOL_TURN[1]
+        assert script.response_for([user, assistant, user]) is TOOL_TURN[0]
+
+    def test_continues_partial_reply(self):
+        """Test a trailing assistant message is continued, not answered."""
+        script = MockScript(responses=[MockResponse(reasoning="r", content="Hello")])
+        messages = [
+            {"role": "user", "content": "Hi"},
+            {"role": "assistant", "content": "Hel"},
+        ]
+
+        assert script.response_for(messages) == MockResponse(content="lo")
+
+    def test_chunks_split_text_and_arguments(self):
+        """Test reasoning, content and arguments are cut into chunk_chars."""
+        response = MockResponse(
+            reasoning="abcdef",
+            content="xyz",
+            tool_calls=[MockToolCall("read_file", '{"a":1}')],
+        )
+        script = MockScript(chunk_chars=3)
+
+        chunks = list(stream_chunks(response, script, [], "c1"))
+        deltas = [chunk["choices"][0]["delta"] for chunk in chunks]
+
+        assert deltas[0] == {"role": "assistant", "reasoning_content": "abc"}
+        assert deltas[1] == {"reasoning_content": "def"}
+        assert deltas[2] == {"content": "xyz"}
+        assert deltas[3]["tool_calls"][0]["function"]["name"] == "read_file"
+        arguments = [d["tool_calls"][0]["function"]["arguments"] for d in deltas[4:-1]]
+        assert arguments == ['{"a', '":1', "}"]
+        assert chunks[-1]["choices"][0]["finish_reason"] == "tool_calls"
+        assert "usage" in chunks[-1]
+
+    def test_load(self, tmp_path):
+        """Test scripts load from JSON, with defaults for missing fields."""
+        path = tmp_path / "script.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "responses": [{"content": "Hi"}],
+                    "ttft": 1.5,
+                    "faults": {"error_rate": 0.1, "seed": 7},
+                }
+            )
+        )
+
+        script = MockScript.load(path)
+
+        assert script.responses == [MockResponse(content="Hi")]
+        assert script.ttft == 1.5
+        assert script.faults == Faults(error_rate=0.1, seed=7)
+
+
+class TestMockLLMServer:
+    """Tests for MockLLMServer."""
+
+    @pytest.mark.parametrize("raw_stream", [False, True])
+    def test_streams_tool_call_turn(self, server, raw_stream):
+        """Test both transports stream the scripted tool call and reply."""
+        api = service(server, raw_stream=raw_stream)
+        user = {"role": "user", "content": "Time?"}
+
+        first = process(api, [user])
+        second = process(
+            api,
+            [
+                user,
+                {"role": "assistant", "content": ""},
+                {"role": "tool", "content": "12:00", "tool_call_id": "c"},
+            ],
+        )
+        api.close()
+
+        (call,) = first.tool_calls
+        assert call == ToolCall(
+            id=call.id, name="get_current_time", arguments='{"tz": "UTC"}'
+        )
+        assert second.content == "It is late."
+
+    def test_non_streamed_completion(self, server):
+        """Test requests without stream get a complete response."""
+        server.script.responses = [MockResponse(content="Summary.")]
+        api = service(server)
+
+        assert api.completion([{"role": "user", "content": "Sum up"}]) == "Summary."
+        api.close()
+
+    def test_injected_error_status(self, server):
+        """Test error_rate rejects requests with error_status."""
+        server.script.faults = Faults(error_rate=1.0, error_status=429)
+        api = service(server, raw_stream=True, max_retries=0)
+
+        with pytest.raises(httpx.HTTPStatusError) as info:
+            process(api, [{"role": "user", "content": "Hi"}])
+        assert info.value.response.status_code == 429
+        api.close()
+
+    def test_injected_error_event(self, server):
+        """Test error_event_rate sends an error event mid-stream."""
+        server.script.responses = [MockResponse(content="x" * 40)]
+        server.script.faults = Faults(error_event_rate=1.0)
+        api = service(server, raw_stream=True)
+
+        with pytest.raises(StreamError, match="Injected stream error"):
+            process(api, [{"role": "user", "content": "Hi"}])
+        api.close()
+
+    def test_injected_disconnect(self, server):
+        """Test disconnect_rate drops the connection mid-stream."""
+        server.script.responses = [MockResponse(content="x" * 40)]
+        server.script.faults = Faults(disconnect_rate=1.0)
+        api = service(server, raw_stream=True)
+
+        with pytest.raises(httpx.RemoteProtocolError):
+            process(api, [{"role": "user", "content": "Hi"}])
+        api.close()
+
+    def test_injected_stall_is_continued(self, server):
+        """Test a stalled stream is continued and completes."""
+        server.script.responses = [MockResponse(content="abcdefgh" * 4)]
+        # Every request stalls, so each continuation carries on a bit further
+        server.script.faults = Faults(stall_rate=1.0, stall_seconds=1.0)
+        api = service(
+            server, raw_stream=True, stream_idle_timeout=0.2, max_stall_resumes=8
+        )
+        recorder = RecordingProcessor()
+
+        with (
+            patch("src.tracing.trace._create_processor", return_value=recorder),
+            trace("conversation"),
+        ):
+            result = process(api, [{"role": "user", "content": "Hi"}])
+        api.close()
+
+        assert result.content == "abcdefgh" * 4
+        (llm,) = [s for s in recorder.spans if s.kind == SpanKind.LLM]
+        assert llm.data.get("stalls") >= 1
+
+    def test_seeded_faults_do_not_depend_on_threads(self):
+        """Test concurrent clients see the same faults as serial ones."""
+
+        def statuses(workers: int) -> list[int]:
+            script = MockScript(
+                responses=[MockResponse(content="x" * 40)],
+                ttft=0.0,
+                token_delay=0.0,
+                faults=Faults(error_rate=0.3, error_event_rate=0.3, seed=11),
+            )
+            mock = MockLLMServer(script, port=0)
+            mock.start()
+            body = {"messages": [{"role": "user", "content": "Hi"}], "stream": True}
+
+            def send(_index: int) -> tuple[int, bool]:
+                with httpx.Client() as client:
+                    response = client.post(
+                        f"{mock.url}/chat/completions", json=body, timeout=5
+                    )
+                return (
+                    response.status_code,
+                    b"Injected stream error" in response.content,
+                )
+
+            with ThreadPoolExecutor(workers) as pool:
+                results = list(pool.map(send, range(12)))
+            mock.stop()
+            return sorted(results)
+
+        assert statuses(workers=8) == statuses(workers=1)
+
+    def test_request_rng_is_derived_from_seed_and_number(self, server):
+        """Test each request's dice depend only on the seed and its number."""
+        server.script.faults = Faults(seed=5)
+        other = MockLLMServer(MockScript(faults=Faults(seed=5)), port=0)
+
+        first = [server._server.request_rng().random() for _ in range(3)]
+        second = [other._server.request_rng().random() for _ in range(3)]
+        other.stop()
+
+        assert first == second
+        assert len(set(first)) == 3
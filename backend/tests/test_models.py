@@ -31,6 +31,13 @@ class TestMessage:
 
         assert result == {"role": "system", "content": "System prompt"}
 
+    def test_api_dict_is_cached(self):
+        """Test the API representation is built once and reused."""
+        message = Message(role=MessageRole.USER, content="Hello")
+
+        assert message.api_dict == message.to_dict()
+        assert message.api_dict is message.api_dict
+
     def test_from_dict(self):
         """Test creating message from dictionary."""
         data = {"role": "user", "content": "Hello"}
@@ -0,0 +1,119 @@
+"""Tests for incremental prompt recording on llm spans."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from src.tracing import SpanKind
+from src.tracing import TracingConfig
+from src.tracing import jsonl_span_data
+from src.tracing import reconstruct_prompt
+from src.tracing import record_prompt
+from src.tracing import span
+from src.tracing import sqlite_span_data
+from src.tracing import trace
+
+
+def _message(role: str, content: str) -> dict[str, object]:
+    return {"role": role, "content": content}
+
+
+def _run_conversation(config: TracingConfig) -> list[tuple[str, list]]:
+    """Record three requests of a growing conversation; return (span_id, prompt)."""
+    history = [_message("system", "sys"), _message("user", "hi")]
+    recorded = []
+    with trace("conversation", config=config):
+        for reply in ("one", "two", "three"):
+            prompt = list(history)
+            with span("llm", kind=SpanKind.LLM) as s:
+                record_prompt(s, prompt)
+                recorded.append((s.span_id, prompt))
+            history += [_message("assistant", reply), _message("user", "more")]
+    return recorded
+
+
+class TestRecordPrompt:
+    """Tests for record_prompt."""
+
+    def test_only_new_messages_are_stored(self, tmp_path):
+        """Test later spans store the delta and point at the previous span."""
+        path = tmp_path / "traces.sqlite3"
+        recorded = _run_conversation(TracingConfig.sqlite(path=str(path)))
+        lookup = sqlite_span_data(path)
+
+        first = lookup(recorded[0][0])
+        second = lookup(recorded[1][0])
+
+        assert first["prefix_span_id"] is None
+        assert len(json.loads(first["messages"])) == 2
+        assert second["prefix_span_id"] == recorded[0][0]
+        assert second["messages_offset"] == 2
+        assert json.loads(second["messages"]) == [
+            _message("assistant", "one"),
+            _message("user", "more"),
+        ]
+
+    def test_rewritten_history_stores_full_prompt(self, tmp_path):
+        """Test a prompt that does not extend the previous one is stored whole."""
+        path = tmp_path / "traces.jsonl"
+        with trace("conversation", config=TracingConfig.file(path=str(path))):
+            with span("llm", kind=SpanKind.LLM) as s:
+                record_prompt(s, [_message("user", "a"), _message("user", "b")])
+            with span("llm", kind=SpanKind.LLM) as s:
+                record_prompt(s, [_message("user", "a"), _message("user", "c")])
+                second_id = s.span_id
+
+        data = jsonl_span_data(path)(second_id)
+        assert data["prefix_span_id"] is None
+        assert len(json.loads(data["messages"])) == 2
+
+    def test_side_requests_do_not_break_the_chain(self):
+        """Test a non-incremental prompt is stored whole and not used as prefix."""
+        history = [_message("user", "hi")]
+        with trace("conversation"):
+            with span("llm", kind=SpanKind.LLM) as first:
+                record_prompt(first, history)
+            with span("llm", kind=SpanKind.LLM) as side:
+                record_prompt(side, [_message("user", "summarize")], incremental=False)
+            with span("llm", kind=SpanKind.LLM) as second:
+                record_prompt(second, [*history, _message("assistant", "hello")])
+
+        assert side.data.get("prefix_span_id") is None
+        assert second.data.get("prefix_span_id") == first.span_id
+        assert second.data.get("messages_offset") == 1
+
+    def test_separate_traces_do_not_share_prefixes(self):
+        """Test the first llm span of each trace stores its full prompt."""
+        prompt = [_message("user", "hi")]
+        for _ in range(2):
+            with trace("conversation"), span("llm", kind=SpanKind.LLM) as s:
+                record_prompt(s, prompt)
+                assert s.data.get("prefix_span_id") is None
+
+
+class TestReconstructPrompt:
+    """Tests for reconstruct_prompt."""
+
+    def test_rebuilds_every_request(self, tmp_path):
+        """Test each llm span's full prompt is recovered from the database."""
+        path = tmp_path / "traces.sqlite3"
+        recorded = _run_conversation(TracingConfig.sqlite(path=str(path)))
+        lookup = sqlite_span_data(path)
+
+        for span_id, prompt in recorded:
+            assert reconstruct_prompt(span_id, lookup) == prompt
+
+    def test_rebuilds_from_jsonl(self, tmp_path):
+        """Test reconstruction from a trace file."""
+        path = tmp_path / "traces.jsonl"
+        recorded = _run_conversation(TracingConfig.file(path=str(path)))
+
+        span_id, prompt = recorded[-1]
+        assert reconstruct_prompt(span_id, jsonl_span_data(path)) == prompt
+
+    def test_unknown_span(self):
+        """Test a span without a recorded prompt raises KeyError."""
+        with pytest.raises(KeyError, match="sp_missing"):
+            reconstruct_prompt("sp_missing", lambda _: None)
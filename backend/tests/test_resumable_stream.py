@@ -0,0 +1,114 @@
+"""Tests for stall detection and continuation of streams."""
+
+from __future__ import annotations
+
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from src.models.config import HttpConfig
+from src.services.hedging import StartedStream
+from src.services.resumable_stream import ResumableStream
+from src.services.resumable_stream import StreamStalledError
+from src.services.resumable_stream import watch
+
+
+def stalling(*chunks, release: threading.Event):
+    """Yield ``chunks``, then block until ``release`` is set."""
+    yield from chunks
+    release.wait(5)
+
+
+def started(chunks, attempts=1) -> StartedStream:
+    """A started stream over ``chunks``."""
+    return StartedStream(
+        chunks=iter(chunks),
+        close=Mock(),
+        attempts=attempts,
+        winner=attempts,
+        time_to_first_chunk=0.0,
+    )
+
+
+class TestWatch:
+    """Tests for watch."""
+
+    def test_yields_chunks(self):
+        """Test chunks come through in order."""
+        assert list(watch(iter(["a", "b"]), 1.0)) == ["a", "b"]
+
+    def test_stall_raises(self):
+        """Test a chunk that takes longer than the timeout raises."""
+        release = threading.Event()
+        chunks = watch(stalling("a", release=release), 0.05)
+
+        assert next(chunks) == "a"
+        with pytest.raises(StreamStalledError, match=r"no data for 0\.05s"):
+            next(chunks)
+        release.set()
+
+    def test_errors_propagate(self):
+        """Test an error raised while reading reaches the consumer."""
+
+        def failing():
+            yield "a"
+            raise ConnectionError("reset")
+
+        with pytest.raises(ConnectionError, match="reset"):
+            list(watch(failing(), 1.0))
+
+
+class TestResumableStream:
+    """Tests for ResumableStream."""
+
+    def test_resume_continues_after_partial_content(self):
+        """Test resume closes the stalled stream and reads the continuation."""
+        release = threading.Event()
+        first = StartedStream(
+            chunks=stalling("Hel", release=release),
+            close=Mock(),
+            attempts=1,
+            winner=1,
+            time_to_first_chunk=0.0,
+        )
+        restart = Mock(return_value=started(["lo"], attempts=2))
+        span = Mock()
+        config = HttpConfig(stream_idle_timeout=0.05)
+        stream = ResumableStream(first, restart, config, span)
+
+        received = []
+        with pytest.raises(StreamStalledError):
+            received.extend(stream)
+        stream.resume("".join(received))
+        received.extend(stream)
+        release.set()
+
+        assert received == ["Hel", "lo"]
+        first.close.assert_called_once()
+        restart.assert_called_once_with("Hel")
+        recorded = {}
+        for call in span.set.call_args_list:
+            recorded.update(call.kwargs)
+        assert recorded["stalls"] == 1
+        assert recorded["attempts"] == 3
+        assert recorded["stall_recovery_ms"] >= 0
+
+    def test_resumes_are_limited(self):
+        """Test can_resume turns false after max_stall_resumes."""
+        restart = Mock(side_effect=lambda _partial: started([]))
+        config = HttpConfig(max_stall_resumes=1)
+        stream = ResumableStream(started([]), restart, config, Mock())
+
+        assert stream.can_resume
+        stream.resume("")
+        assert not stream.can_resume
+
+    def test_idle_timeout_can_be_disabled(self):
+        """Test chunks are read directly when the idle timeout is 0."""
+        first = started(["a"])
+        config = HttpConfig(stream_idle_timeout=0)
+
+        stream = ResumableStream(first, Mock(), config, Mock())
+
+        assert iter(stream) is first.chunks
@@ -0,0 +1,187 @@
+"""Tests for SessionStore and resuming stored conversations."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from src.models.message import Message
+from src.models.message import MessageRole
+from src.models.tool import ToolCall
+from src.models.tool import ToolResult
+from src.services.message_repository import MessageRepository
+from src.services.session_store import SessionStore
+
+
+def _add_turns(repository: MessageRepository, count: int, start: int = 0) -> None:
+    """Add user turns with a tool call each."""
+    for index in range(start, start + count):
+        repository.add_user_message(f"question {index}")
+        call = ToolCall(id=f"call_{index}", name="read_file", arguments="{}")
+        repository.add_assistant_tool_calls([call])
+        repository.add_tool_result(
+            ToolResult(tool_call_id=call.id, name="read_file", content="x" * 400)
+        )
+        repository.add_assistant_message(f"answer {index}")
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create a session store in a temporary directory."""
+    store = SessionStore(tmp_path / "sessions.sqlite3")
+    yield store
+    store.close()
+
+
+class TestSessionStore:
+    """Tests for SessionStore."""
+
+    def test_each_message_is_one_row(self, store, tmp_path):
+        """Test messages are written as they are added."""
+        session = store.create()
+        repository = MessageRepository("system", session)
+        _add_turns(repository, 2)
+
+        conn = sqlite3.connect(tmp_path / "sessions.sqlite3")
+        (count,) = conn.execute("SELECT COUNT(*) FROM messages").fetchone()
+        conn.close()
+        assert count == len(session) == 9
+
+    def test_resume_restores_messages(self, store):
+        """Test a resumed conversation has the same API messages."""
+        session = store.create()
+        repository = MessageRepository("system", session)
+        _add_turns(repository, 2)
+
+        resumed = MessageRepository.resume(store.open(session.id), 100_000)
+
+        assert resumed.get_messages_for_api() == repository.get_messages_for_api()
+        assert resumed.get_all_messages() == repository.get_all_messages()
+
+    def test_resume_loads_only_the_tail(self, store):
+        """Test resume loads whole recent turns within the budget."""
+        session = store.create()
+        _add_turns(MessageRepository("system", session), 10)
+
+        resumed = MessageRepository.resume(store.open(session.id), 500)
+        messages = resumed.get_messages_for_api()
+
+        assert messages[0] == {"role": "system", "content": "system"}
+        assert messages[1] == {"role": "user", "content": "question 8"}
+        assert len(messages) == 9
+
+    def test_latest_turn_is_loaded_even_over_budget(self, store):
+        """Test the last turn is loaded when it alone exceeds the budget."""
+        session = store.create()
+        _add_turns(MessageRepository("system", session), 3)
+
+        resumed = MessageRepository.resume(store.open(session.id), 1)
+
+        assert resumed.get_messages_for_api()[1]["content"] == "question 2"
+        assert len(resumed) == 5
+
+    def test_older_messages_are_read_lazily(self, store):
+        """Test get_all_messages includes messages not loaded on resume."""
+        session = store.create()
+        _add_turns(MessageRepository("system", session), 10)
+        expected = MessageRepository("system")
+        _add_turns(expected, 11)
+
+        resumed = MessageRepository.resume(store.open(session.id), 500)
+        _add_turns(resumed, 1, start=10)
+
+        assert len(resumed) < len(expected)
+        assert resumed.get_all_messages() == expected.get_all_messages()
+
+    def test_resumed_session_keeps_appending(self, store):
+        """Test messages added after resume are stored after the old ones."""
+        session = store.create()
+        _add_turns(MessageRepository("system", session), 1)
+
+        resumed = MessageRepository.resume(store.open(session.id), 100_000)
+        resumed.add_user_message("follow-up")
+
+        again = MessageRepository.resume(store.open(session.id), 100_000)
+        assert again.get_messages_for_api()[-1] == {
+            "role": "user",
+            "content": "follow-up",
+        }
+
+    def test_clear_starts_a_new_history(self, store):
+        """Test a cleared conversation resumes empty."""
+        session = store.create()
+        repository = MessageRepository("system", session)
+        _add_turns(repository, 2)
+        repository.clear()
+        repository.add_user_message("fresh start")
+
+        resumed = MessageRepository.resume(store.open(session.id), 100_000)
+
+        assert resumed.get_messages_for_api() == [
+            {"role": "system", "content": "system"},
+            {"role": "user", "content": "fresh start"},
+        ]
+
+    def test_resume_after_compaction(self, store):
+        """Test a compaction summary is stored in place of the turns it replaced."""
+        session = store.create()
+        repository = MessageRepository("system", session)
+        _add_turns(repository, 3)
+        summary = Message(role=MessageRole.USER, content="summary of turns 0-1")
+        repository.replace_range(1, 9, summary)
+        repository.add_user_message("next")
+
+        resumed = MessageRepository.resume(store.open(session.id), 100_000)
+
+        assert resumed.get_messages_for_api() == repository.get_messages_for_api()
+        assert resumed.get_messages_for_api()[1] == summary.to_dict()
+
+    def test_compaction_after_resume_keeps_unloaded_messages(self, store):
+        """Test messages not loaded on resume survive a later compaction."""
+        session = store.create()
+        _add_turns(MessageRepository("system", session), 10)
+        resumed = MessageRepository.resume(store.open(session.id), 500)
+        summary = Message(role=MessageRole.USER, content="summary of turn 8")
+        resumed.replace_range(1, 5, summary)
+        expected = resumed.get_all_messages()
+
+        again = MessageRepository.resume(store.open(session.id), 100_000)
+
+        assert again.get_all_messages() == expected
+        assert len(expected) == 1 + 4 * 8 + 1 + 4
+
+    def test_latest_session(self, store):
+        """Test latest returns the most recently opened session."""
+        assert store.latest() is None
+        first = store.create()
+        store.create()
+        store.open(first.id)
+
+        latest = store.latest()
+
+        assert latest is not None
+        assert latest.id == first.id
+
+    def test_unknown_session(self, store):
+        """Test opening a missing session raises KeyError."""
+        with pytest.raises(KeyError, match="ses_missing"):
+            store.open("ses_missing")
+
+
+class TestMessageFromDict:
+    """Tests for restoring stored messages."""
+
+    def test_tool_calls_round_trip(self):
+        """Test every field of the API format is restored."""
+        message = Message(
+            role=MessageRole.ASSISTANT,
+            content="",
+            tool_calls=[ToolCall(id="c1", name="read_file", arguments="{}")],
+        )
+        result = Message(
+            role=MessageRole.TOOL, content="ok", tool_call_id="c1", name="read_file"
+        )
+
+        assert Message.from_dict(message.to_dict()) == message
+        assert Message.from_dict(result.to_dict()) == result
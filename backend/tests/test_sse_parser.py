@@ -0,0 +1,139 @@
+"""Tests for the streamed completion event parser."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from src.services.sse_parser import SSEParser
+from src.services.sse_parser import StreamDelta
+from src.services.sse_parser import StreamError
+from src.services.sse_parser import ToolCallDelta
+from src.services.sse_parser import aiter_deltas
+from src.services.sse_parser import iter_deltas
+from src.services.sse_parser import stream_body
+
+
+def event(delta: dict[str, object]) -> bytes:
+    """Encode one chunk with the given delta as an event."""
+    chunk = {"id": "c", "choices": [{"index": 0, "delta": delta}]}
+    return f"data: {json.dumps(chunk)}\n\n".encode()
+
+
+class TestSSEParser:
+    """Tests for SSEParser."""
+
+    def test_parses_content_and_reasoning(self):
+        """Test each event becomes one delta record."""
+        parser = SSEParser()
+
+        deltas = parser.feed(
+            event({"reasoning_content": "Hmm"}) + event({"content": "Hi"})
+        )
+
+        assert deltas == [
+            StreamDelta(reasoning_content="Hmm"),
+            StreamDelta(content="Hi"),
+        ]
+
+    def test_events_split_across_reads(self):
+        """Test a line split between reads is parsed once complete."""
+        data = event({"content": "Hello"})
+        parser = SSEParser()
+
+        assert parser.feed(data[:10]) == []
+        assert parser.feed(data[10:]) == [StreamDelta(content="Hello")]
+
+    def test_parses_tool_calls(self):
+        """Test tool call deltas become ToolCallDelta records."""
+        parser = SSEParser()
+
+        (delta,) = parser.feed(
+            event(
+                {
+                    "tool_calls": [
+                        {
+                            "index": 1,
+                            "id": "call_1",
+                            "type": "function",
+                            "function": {"name": "read_file", "arguments": "{"},
+                        }
+                    ]
+                }
+            )
+        )
+
+        assert delta.tool_calls == [ToolCallDelta(1, "call_1", "read_file", "{")]
+
+    def test_ignores_other_fields_and_stops_at_done(self):
+        """Test comments and non-data fields are skipped and [DONE] ends it."""
+        parser = SSEParser()
+
+        deltas = parser.feed(
+            b": keep-alive\r\nevent: message\r\n"
+            + event({"content": "a"})
+            + b"data: [DONE]\n\n"
+            + event({"content": "ignored"})
+        )
+
+        assert deltas == [StreamDelta(content="a")]
+        assert parser.done
+        assert parser.feed(event({"content": "b"})) == []
+
+    def test_chunk_without_choices(self):
+        """Test a chunk without choices (e.g. usage) gives an empty delta."""
+        parser = SSEParser()
+
+        assert parser.feed(b'data: {"choices": [], "usage": {}}\n') == [StreamDelta()]
+
+    def test_error_event_raises(self):
+        """Test an error event raises StreamError."""
+        parser = SSEParser()
+
+        with pytest.raises(StreamError, match="rate limited"):
+            parser.feed(b'data: {"error": {"message": "rate limited"}}\n\n')
+
+
+class TestIterDeltas:
+    """Tests for iter_deltas and aiter_deltas."""
+
+    def test_last_event_without_newline(self):
+        """Test an event not followed by a newline is still parsed."""
+        pieces = [event({"content": "a"}), b'data: {"choices": [{"delta": {}}]}']
+
+        assert list(iter_deltas(pieces)) == [StreamDelta(content="a"), StreamDelta()]
+
+    def test_async_matches_sync(self):
+        """Test aiter_deltas yields the same records as iter_deltas."""
+        data = event({"content": "a"}) + event({"content": "b"}) + b"data: [DONE]\n"
+        pieces = [data[i : i + 7] for i in range(0, len(data), 7)]
+
+        async def source():
+            for piece in pieces:
+                yield piece
+
+        async def collect():
+            return [delta async for delta in aiter_deltas(source())]
+
+        assert asyncio.run(collect()) == list(iter_deltas(pieces))
+
+
+class TestStreamBody:
+    """Tests for stream_body."""
+
+    def test_embeds_pre_serialized_tools(self):
+        """Test the tools JSON is spliced into a valid request body."""
+        tools = [{"type": "function", "function": {"name": "t", "parameters": {}}}]
+        messages: list[dict[str, object]] = [{"role": "user", "content": "héllo"}]
+
+        body = stream_body("glm-4.7", messages, json.dumps(tools))
+
+        assert json.loads(body) == {
+            "model": "glm-4.7",
+            "messages": messages,
+            "stream": True,
+            "tool_choice": "auto",
+            "tools": tools,
+        }
@@ -2,12 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
 from unittest.mock import Mock
 
 import pytest
 
+from src.models.config import HttpConfig
+from src.models.tool import ToolCall
 from src.processors.stream_response_processor import StreamResponseProcessor
+from src.services.hedging import StartedStream
 from src.services.message_repository import MessageRepository
+from src.services.resumable_stream import ResumableStream
+from src.services.resumable_stream import StreamStalledError
+from src.services.sse_parser import StreamDelta
+from src.services.sse_parser import ToolCallDelta
+from src.services.tool_executor import ToolExecutor
 
 
 class MockChunk:
@@ -29,6 +39,17 @@ class MockChunk:
             self.choices = [choice]
 
 
+def _tool_delta(index, call_id=None, name=None, arguments=None):
+    """Create a mock tool call delta."""
+    delta = Mock()
+    delta.index = index
+    delta.id = call_id
+    delta.function = Mock()
+    delta.function.name = name
+    delta.function.arguments = arguments
+    return delta
+
+
 class TestStreamResponseProcessor:
     """Tests for StreamResponseProcessor."""
 
@@ -175,3 +196,139 @@ class TestStreamResponseProcessor:
         assert "Error processing response" in str(
             mock_output_handler.display_error.call_args
         )
+
+    def test_speculates_calls_once_next_index_appears(
+        self, mock_output_handler, mock_spinner
+    ):
+        """Test earlier tool calls are handed to the executor mid-stream."""
+        repo = MessageRepository("System")
+        executor = Mock(spec=ToolExecutor)
+        processor = StreamResponseProcessor(
+            repo, mock_output_handler, mock_spinner, tool_executor=executor
+        )
+        speculated_before_end = []
+        executor.end_stream.side_effect = lambda: speculated_before_end.extend(
+            executor.speculate.call_args_list
+        )
+
+        chunks = [
+            MockChunk(tool_calls=[_tool_delta(0, "call_0", "read_file", '{"pa')]),
+            MockChunk(tool_calls=[_tool_delta(0, arguments='th": "/a"}')]),
+            MockChunk(tool_calls=[_tool_delta(1, "call_1", "read_file", "{}")]),
+        ]
+
+        result = processor.process(iter(chunks))
+
+        executor.begin_stream.assert_called_once()
+        assert len(speculated_before_end) == 1
+        executor.speculate.assert_called_once_with(
+            ToolCall(id="call_0", name="read_file", arguments='{"path": "/a"}')
+        )
+        assert len(result.tool_calls) == 2
+
+    def test_aprocess_consumes_async_stream(self, mock_output_handler, mock_spinner):
+        """Test async streams are processed like sync ones."""
+        repo = MessageRepository("System")
+        processor = StreamResponseProcessor(repo, mock_output_handler, mock_spinner)
+
+        async def chunks():
+            yield MockChunk(content="Hello")
+            yield MockChunk(tool_calls=[_tool_delta(0, "c1", "read_file", "{}")])
+
+        result = asyncio.run(processor.aprocess(chunks()))
+
+        assert result.content == "Hello"
+        assert result.tool_calls == [
+            ToolCall(id="c1", name="read_file", arguments="{}")
+        ]
+        assert repo.get_all_messages()[-1].content == "Hello"
+
+    def test_processes_stream_delta_records(self, mock_output_handler, mock_spinner):
+        """Test records from the raw event parser are processed like chunks."""
+        repo = MessageRepository("System")
+        processor = StreamResponseProcessor(repo, mock_output_handler, mock_spinner)
+
+        deltas = [
+            StreamDelta(reasoning_content="Thinking"),
+            StreamDelta(content="Hello"),
+            StreamDelta(),
+            StreamDelta(tool_calls=[ToolCallDelta(0, "c1", "read_file", '{"pa')]),
+            StreamDelta(tool_calls=[ToolCallDelta(0, arguments='th": "/a"}')]),
+        ]
+
+        result = processor.process(iter(deltas))
+
+        assert result.content == "Hello"
+        assert result.tool_calls == [
+            ToolCall(id="c1", name="read_file", arguments='{"path": "/a"}')
+        ]
+        mock_output_handler.display_reasoning.assert_called_once_with("Thinking", True)
+
+    def test_resumes_stalled_stream(self, mock_output_handler, mock_spinner):
+        """Test a stall is continued after the content received so far."""
+        repo = MessageRepository("System")
+        processor = StreamResponseProcessor(repo, mock_output_handler, mock_spinner)
+        release = threading.Event()
+
+        def stalling():
+            yield StreamDelta(content="It is ")
+            yield StreamDelta(tool_calls=[ToolCallDelta(0, "c1", "read_", None)])
+            release.wait(5)
+
+        def stream(chunks):
+            return StartedStream(
+                chunks=chunks,
+                close=Mock(),
+                attempts=1,
+                winner=1,
+                time_to_first_chunk=0.0,
+            )
+
+        continuation = [
+            StreamDelta(content="late."),
+            StreamDelta(tool_calls=[ToolCallDelta(0, "c2", "read_file", "{}")]),
+        ]
+        restart = Mock(return_value=stream(iter(continuation)))
+        response = ResumableStream(
+            stream(stalling()),
+            restart,
+            HttpConfig(stream_idle_timeout=0.05),
+            Mock(),
+        )
+
+        result = processor.process(response)
+        release.set()
+
+        restart.assert_called_once_with("It is ")
+        assert result.content == "It is late."
+        assert result.tool_calls == [
+            ToolCall(id="c2", name="read_file", arguments="{}")
+        ]
+
+    def test_stall_fails_once_resumes_run_out(self, mock_output_handler, mock_spinner):
+        """Test a stall is reported as an error when it cannot be resumed."""
+        repo = MessageRepository("System")
+        processor = StreamResponseProcessor(repo, mock_output_handler, mock_spinner)
+        release = threading.Event()
+
+        def stalling():
+            release.wait(5)
+            yield StreamDelta()
+
+        response = ResumableStream(
+            StartedStream(
+                chunks=stalling(),
+                close=Mock(),
+                attempts=1,
+                winner=1,
+                time_to_first_chunk=0.0,
+            ),
+            Mock(),
+            HttpConfig(stream_idle_timeout=0.05, max_stall_resumes=0),
+            Mock(),
+        )
+
+        with pytest.raises(StreamStalledError):
+            processor.process(response)
+        release.set()
+        mock_output_handler.display_error.assert_called_once()
@@ -0,0 +1,36 @@
+"""Tests for tool error types."""
+
+from __future__ import annotations
+
+import pickle
+
+from src.tools.errors import ToolError
+from src.tools.errors import ToolTimeoutError
+
+
+class TestToolErrorPickling:
+    """Tests for tool errors crossing process boundaries."""
+
+    def test_tool_error_round_trip(self):
+        """Test the message and retryable flag survive pickling."""
+        original = ToolError("Try again.", retryable=True)
+
+        error = pickle.loads(pickle.dumps(original))  # noqa: S301
+
+        assert type(error) is ToolError
+        assert error.message == "Try again."
+        assert error.retryable is True
+        assert str(error) == "Try again."
+
+    def test_subclass_round_trip(self):
+        """Test a subclass keeps its type and its own attributes."""
+        original = ToolTimeoutError("grep", 2.5, killed=True)
+
+        error = pickle.loads(pickle.dumps(original))  # noqa: S301
+
+        assert type(error) is ToolTimeoutError
+        assert error.message == original.message
+        assert error.retryable is True
+        assert error.timeout == 2.5
+        assert error.killed is True
+        assert str(error) == str(original)
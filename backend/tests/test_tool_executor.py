@@ -0,0 +1,593 @@
+"""Tests for ToolExecutor."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from unittest.mock import patch
+
+from pydantic import BaseModel
+from pydantic import Field
+
+from src.models.config import ToolIsolation
+from src.models.config import ToolsConfig
+from src.models.tool import ToolCall
+from src.services.tool_executor import ToolExecutor
+from src.tools.base import BaseTool
+from src.tools.line_index import read_line_range
+from src.tools.read_file import ReadFileTool
+from src.tools.read_more import ReadMoreTool
+from src.tracing import SpanKind
+from src.tracing import span
+from src.tracing import trace
+from src.tracing.processor import NullProcessor
+
+
+class SleepArgs(BaseModel):
+    """Arguments for the sleep tool."""
+
+    seconds: float = Field(default=0.0)
+    label: str = Field(default="")
+
+
+class SleepTool(BaseTool[SleepArgs]):
+    """Sleeps, then echoes its label."""
+
+    def __init__(
+        self,
+        name: str = "sleep",
+        *,
+        parallel_safe: bool = True,
+        read_only: bool = True,
+        timeout: float | None = 30.0,
+    ) -> None:
+        self._name = name
+        self._timeout = timeout
+        self._parallel_safe = parallel_safe
+        self._read_only = read_only
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return "Sleep for a while."
+
+    @property
+    def args_model(self) -> type[SleepArgs]:
+        return SleepArgs
+
+    @property
+    def timeout(self) -> float | None:
+        return self._timeout
+
+    @property
+    def parallel_safe(self) -> bool:
+        return self._parallel_safe
+
+    @property
+    def read_only(self) -> bool:
+        return self._read_only
+
+    def execute(self, args: SleepArgs) -> str:
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(args.seconds)
+        with self._lock:
+            self.active -= 1
+        return args.label
+
+
+class ShortDeadlineTool(SleepTool):
+    """Sleep tool with a short deadline, constructible without arguments."""
+
+    def __init__(self) -> None:
+        super().__init__(timeout=1.0)
+
+
+class RecordingProcessor(NullProcessor):
+    """Processor that keeps finished spans."""
+
+    def __init__(self) -> None:
+        self.spans = []
+
+    def on_span_end(self, span) -> None:
+        self.spans.append(span)
+
+
+def _call(call_id: str, seconds: float, name: str = "sleep") -> ToolCall:
+    return ToolCall(
+        id=call_id,
+        name=name,
+        arguments=f'{{"seconds": {seconds}, "label": "{call_id}"}}',
+    )
+
+
+class TestExecuteMany:
+    """Tests for ToolExecutor.execute_many."""
+
+    def test_results_keep_call_order(self):
+        """Test results come back in call order, not completion order."""
+        executor = ToolExecutor(tools={"sleep": SleepTool()})
+        calls = [_call("a", 0.05), _call("b", 0.0), _call("c", 0.02)]
+
+        results = executor.execute_many(calls)
+        executor.shutdown()
+
+        assert [r.tool_call_id for r in results] == ["a", "b", "c"]
+        assert [r.content for r in results] == ["a", "b", "c"]
+
+    def test_parallel_safe_calls_overlap(self):
+        """Test parallel-safe calls run concurrently."""
+        tool = SleepTool()
+        executor = ToolExecutor(tools={"sleep": tool})
+        calls = [_call(str(i), 0.1) for i in range(5)]
+
+        start = time.perf_counter()
+        executor.execute_many(calls)
+        elapsed = time.perf_counter() - start
+        executor.shutdown()
+
+        assert tool.max_active > 1
+        assert elapsed < 0.4
+
+    def test_pool_size_is_bounded(self):
+        """Test no more than max_parallel calls run at once."""
+        tool = SleepTool()
+        executor = ToolExecutor(
+            tools_config=ToolsConfig(max_parallel=2),
+            tools={"sleep": tool},
+        )
+
+        executor.execute_many([_call(str(i), 0.05) for i in range(6)])
+        executor.shutdown()
+
+        assert tool.max_active == 2
+
+    def test_unsafe_calls_run_alone(self):
+        """Test a non-parallel-safe call never overlaps other calls."""
+        safe = SleepTool()
+        unsafe = SleepTool("unsafe", parallel_safe=False)
+        executor = ToolExecutor(tools={"sleep": safe, "unsafe": unsafe})
+        calls = [
+            _call("a", 0.02),
+            _call("b", 0.02),
+            _call("c", 0.02, name="unsafe"),
+            _call("d", 0.02),
+        ]
+
+        results = executor.execute_many(calls)
+        executor.shutdown()
+
+        assert [r.tool_call_id for r in results] == ["a", "b", "c", "d"]
+        assert unsafe.max_active == 1
+        assert safe.max_active <= 2
+
+    def test_unknown_tool_in_batch(self):
+        """Test unknown tools produce errors without breaking the batch."""
+        executor = ToolExecutor(tools={"sleep": SleepTool()})
+        calls = [_call("a", 0.0), _call("b", 0.0, name="missing")]
+
+        results = executor.execute_many(calls)
+        executor.shutdown()
+
+        assert results[0].is_error is False
+        assert results[1].is_error is True
+        assert "Unknown tool 'missing'" in results[1].content
+
+    def test_tool_spans_nest_under_active_span(self):
+        """Test spans created on worker threads keep the caller's parent."""
+        recorder = RecordingProcessor()
+        executor = ToolExecutor(tools={"sleep": SleepTool()})
+
+        with (
+            patch("src.tracing.trace._create_processor", return_value=recorder),
+            trace("conversation"),
+            span("llm", kind=SpanKind.LLM) as llm_span,
+        ):
+            executor.execute_many([_call("a", 0.01), _call("b", 0.01)])
+        executor.shutdown()
+
+        tool_spans = [s for s in recorder.spans if s.kind == SpanKind.TOOL]
+        assert len(tool_spans) == 2
+        assert {s.parent_id for s in tool_spans} == {llm_span.span_id}
+
+
+class TestAsyncExecution:
+    """Tests for ToolExecutor.aexecute_many."""
+
+    def test_results_keep_call_order(self):
+        """Test results come back in call order."""
+        executor = ToolExecutor(tools={"sleep": SleepTool()})
+        calls = [_call("a", 0.05), _call("b", 0.0), _call("c", 0.02)]
+
+        results = asyncio.run(executor.aexecute_many(calls))
+        executor.shutdown()
+
+        assert [r.content for r in results] == ["a", "b", "c"]
+
+    def test_batch_runs_concurrently_within_limit(self):
+        """Test parallel-safe calls overlap, at most max_parallel at once."""
+        tool = SleepTool()
+        executor = ToolExecutor(
+            tools_config=ToolsConfig(max_parallel=2), tools={"sleep": tool}
+        )
+
+        asyncio.run(executor.aexecute_many([_call(str(i), 0.05) for i in range(6)]))
+        executor.shutdown()
+
+        assert tool.max_active == 2
+
+    def test_unsafe_calls_run_alone(self):
+        """Test a non-parallel-safe call never overlaps other calls."""
+        safe = SleepTool()
+        unsafe = SleepTool("unsafe", parallel_safe=False)
+        executor = ToolExecutor(tools={"sleep": safe, "unsafe": unsafe})
+        calls = [_call("a", 0.02), _call("b", 0.02, name="unsafe"), _call("c", 0.02)]
+
+        results = asyncio.run(executor.aexecute_many(calls))
+        executor.shutdown()
+
+        assert [r.tool_call_id for r in results] == ["a", "b", "c"]
+        assert unsafe.max_active == 1
+
+    def test_speculated_call_is_collected(self):
+        """Test a call started during the stream is awaited, not rerun."""
+        tool = SleepTool()
+        executor = ToolExecutor(tools={"sleep": tool})
+        executor.begin_stream()
+        executor.speculate(_call("a", 0.01))
+
+        results = asyncio.run(executor.aexecute_many([_call("a", 0.01)]))
+        executor.shutdown()
+
+        assert results[0].content == "a"
+        assert tool.calls == 1
+
+    def test_tool_spans_nest_under_awaiting_span(self):
+        """Test spans of calls on worker threads keep the task's parent."""
+        recorder = RecordingProcessor()
+        executor = ToolExecutor(tools={"sleep": SleepTool()})
+
+        async def run() -> str:
+            with span("llm", kind=SpanKind.LLM) as llm_span:
+                await executor.aexecute_many([_call("a", 0.01), _call("b", 0.01)])
+            return llm_span.span_id
+
+        with (
+            patch("src.tracing.trace._create_processor", return_value=recorder),
+            trace("conversation"),
+        ):
+            llm_span_id = asyncio.run(run())
+        executor.shutdown()
+
+        tool_spans = [s for s in recorder.spans if s.kind == SpanKind.TOOL]
+        assert {s.parent_id for s in tool_spans} == {llm_span_id}
+
+
+class TestSpeculation:
+    """Tests for speculative execution during streaming."""
+
+    def test_speculated_call_is_collected_not_rerun(self):
+        """Test execute_many reuses the speculative result."""
+        tool = SleepTool()
+        executor = ToolExecutor(tools={"sleep": tool})
+        call = _call("a", 0.01)
+
+        executor.begin_stream()
+        assert executor.speculate(call) is True
+        executor.end_stream()
+        results = executor.execute_many([call])
+        executor.shutdown()
+
+        assert results[0].content == "a"
+        assert tool.calls == 1
+
+    def test_does_not_speculate_side_effecting_tools(self):
+        """Test tools that are not read-only wait for the stream to end."""
+        executor = ToolExecutor(tools={"sleep": SleepTool(read_only=False)})
+
+        executor.begin_stream()
+        assert executor.speculate(_call("a", 0.0)) is False
+
+    def test_does_not_speculate_incomplete_json(self):
+        """Test partial argument strings are not executed."""
+        executor = ToolExecutor(tools={"sleep": SleepTool()})
+        call = ToolCall(id="a", name="sleep", arguments='{"seconds": 0')
+
+        executor.begin_stream()
+        assert executor.speculate(call) is False
+
+    def test_changed_arguments_rerun_call(self):
+        """Test a speculation is discarded if the final call differs."""
+        tool = SleepTool()
+        executor = ToolExecutor(tools={"sleep": tool})
+
+        executor.begin_stream()
+        executor.speculate(_call("a", 0.0))
+        final = ToolCall(id="a", name="sleep", arguments='{"label": "final"}')
+        results = executor.execute_many([final])
+        executor.shutdown()
+
+        assert results[0].content == "final"
+        assert tool.calls == 2
+
+    def test_span_records_speculation_and_time_saved(self):
+        """Test the tool span records speculative execution and time saved."""
+        recorder = RecordingProcessor()
+        executor = ToolExecutor(tools={"sleep": SleepTool()})
+
+        with (
+            patch("src.tracing.trace._create_processor", return_value=recorder),
+            trace("conversation"),
+        ):
+            executor.begin_stream()
+            executor.speculate(_call("a", 0.02))
+            time.sleep(0.05)
+            executor.end_stream()
+            executor.execute_many([_call("a", 0.02), _call("b", 0.0)])
+        executor.shutdown()
+
+        tool_spans = {
+            s.data.get("tool_call_id"): s
+            for s in recorder.spans
+            if s.kind == SpanKind.TOOL
+        }
+        assert tool_spans["a"].data.get("speculative") is True
+        assert tool_spans["a"].data.get("speculation_saved_ms") >= 15
+        assert tool_spans["b"].data.get("speculative") is False
+
+
+class TestTimeouts:
+    """Tests for per-tool deadlines and process isolation."""
+
+    def test_overrunning_call_returns_retryable_error(self):
+        """Test a call past its deadline returns a timeout error quickly."""
+        recorder = RecordingProcessor()
+        executor = ToolExecutor(tools={"sleep": SleepTool(timeout=0.05)})
+
+        start = time.perf_counter()
+        with (
+            patch("src.tracing.trace._create_processor", return_value=recorder),
+            trace("conversation"),
+        ):
+            result = executor.execute(_call("a", 1.0))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.5
+        assert result.is_error is True
+        assert "timed out after 0.05s" in result.content
+        tool_span = next(s for s in recorder.spans if s.kind == SpanKind.TOOL)
+        assert tool_span.data.get("error_type") == "timeout"
+        assert tool_span.data.get("timed_out") is True
+        assert tool_span.data.get("worker_killed") is False
+
+    def test_call_within_deadline_succeeds(self):
+        """Test calls that finish in time return their output."""
+        executor = ToolExecutor(tools={"sleep": SleepTool(timeout=1.0)})
+
+        result = executor.execute(_call("a", 0.0))
+
+        assert result.is_error is False
+        assert result.content == "a"
+
+    def test_call_without_deadline_runs_inline(self):
+        """Test tools without a timeout do not get a deadline thread."""
+        executor = ToolExecutor(tools={"sleep": SleepTool(timeout=None)})
+
+        with patch("src.services.tool_executor._execute_with_deadline") as deadline:
+            result = executor.execute(_call("a", 0.0))
+
+        assert result.content == "a"
+        deadline.assert_not_called()
+
+    def test_tools_have_no_deadline_by_default(self):
+        """Test deadlines are opt-in."""
+        assert ReadMoreTool().timeout is None
+        assert ReadFileTool().timeout == 20.0
+
+    def test_process_isolation_kills_overrunning_worker(self):
+        """Test process mode kills a hung worker and keeps serving calls."""
+        recorder = RecordingProcessor()
+        executor = ToolExecutor(
+            tools_config=ToolsConfig(
+                isolation=ToolIsolation.PROCESS, process_workers=1
+            ),
+            tools={"sleep": ShortDeadlineTool()},
+        )
+
+        with (
+            patch("src.tracing.trace._create_processor", return_value=recorder),
+            trace("conversation"),
+        ):
+            # The first call also pays for worker start-up.
+            assert executor.execute(_call("warm", 0.0)).content == "warm"
+            timed_out = executor.execute(_call("a", 30.0))
+            after = executor.execute(_call("b", 0.0))
+        executor.shutdown()
+
+        assert timed_out.is_error is True
+        assert "timed out" in timed_out.content
+        assert after.is_error is False
+        assert after.content == "b"
+        spans = {
+            s.data.get("tool_call_id"): s
+            for s in recorder.spans
+            if s.kind == SpanKind.TOOL
+        }
+        assert spans["a"].data.get("worker_killed") is True
+
+
+class TestResultCache:
+    """Tests for cached execution of idempotent tools."""
+
+    def _read_call(self, call_id, path):
+        return ToolCall(
+            id=call_id, name="read_file", arguments=json.dumps({"path": str(path)})
+        )
+
+    def test_repeated_read_is_served_from_cache(self, tmp_path):
+        """Test an identical read of an unchanged file hits the cache."""
+        recorder = RecordingProcessor()
+        target = tmp_path / "a.txt"
+        target.write_text("one\n")
+        executor = ToolExecutor(tools={"read_file": ReadFileTool()})
+
+        with (
+            patch("src.tools.read_file._get_importers", return_value=[]),
+            patch(
+                "src.tools.read_file.read_line_range", wraps=read_line_range
+            ) as reads,
+            patch("src.tracing.trace._create_processor", return_value=recorder),
+            trace("conversation"),
+        ):
+            first = executor.execute(self._read_call("a", target))
+            second = executor.execute(self._read_call("b", target))
+
+        assert first.content == second.content
+        assert reads.call_count == 1
+        spans = [s for s in recorder.spans if s.kind == SpanKind.TOOL]
+        assert [s.data.get("cache") for s in spans] == ["miss", "hit"]
+        assert spans[1].data.get("cache_hits") == 1
+        assert spans[1].data.get("cache_misses") == 1
+
+    def test_modified_file_is_read_again(self, tmp_path):
+        """Test a changed fingerprint bypasses the cached output."""
+        target = tmp_path / "a.txt"
+        target.write_text("one\n")
+        executor = ToolExecutor(tools={"read_file": ReadFileTool()})
+
+        with patch("src.tools.read_file._get_importers", return_value=[]):
+            first = executor.execute(self._read_call("a", target))
+            target.write_text("two\n")
+            stat = target.stat()
+            os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            second = executor.execute(self._read_call("b", target))
+
+        assert "1: one" in first.content
+        assert "1: two" in second.content
+
+    def test_tools_without_opt_in_are_not_cached(self):
+        """Test tools that are not cacheable always execute."""
+        tool = SleepTool()
+        executor = ToolExecutor(tools={"sleep": tool})
+
+        executor.execute(_call("a", 0.0))
+        executor.execute(_call("a", 0.0))
+
+        assert tool.calls == 2
+
+
+class TestArgumentParsing:
+    """Tests for single-pass argument validation and its error messages."""
+
+    def _run(self, arguments: str) -> str:
+        executor = ToolExecutor(tools={"read_file": ReadFileTool()})
+        result = executor.execute(
+            ToolCall(id="c1", name="read_file", arguments=arguments)
+        )
+        assert result.is_error
+        return result.content
+
+    def test_invalid_json_message(self):
+        """Test malformed JSON reports the stdlib decoder message."""
+        assert self._run("{") == (
+            "Invalid JSON in arguments. "
+            "Expecting property name enclosed in double quotes."
+        )
+
+    def test_missing_argument_message(self):
+        """Test empty arguments validate as an empty object."""
+        assert self._run("") == "Missing required argument 'path'."
+
+    def test_wrong_type_message(self):
+        """Test type errors keep their field-specific message."""
+        assert self._run('{"path": 1}') == "Argument 'path' must be a string."
+
+    def test_non_object_arguments(self):
+        """Test a JSON array is rejected as a validation error."""
+        assert self._run("[1]").startswith("Invalid argument")
+
+    def test_string_numbers_are_coerced(self):
+        """Test lax coercion matches dict validation."""
+        tool = ReadFileTool()
+        args = tool.parse_json_arguments('{"path": "/x", "start_line": "2"}')
+        assert args == tool.parse_arguments({"path": "/x", "start_line": "2"})
+
+
+class TestOutputBudget:
+    """Tests for per-call output budgets and read_more continuation."""
+
+    def _executor(self, budget: int) -> ToolExecutor:
+        return ToolExecutor(
+            tools_config=ToolsConfig(max_output_chars=budget),
+            tools={"sleep": SleepTool(), "read_more": ReadMoreTool()},
+        )
+
+    def _label_call(self, label: str) -> ToolCall:
+        arguments = json.dumps({"label": label})
+        return ToolCall(id="c1", name="sleep", arguments=arguments)
+
+    def test_small_output_is_untouched(self):
+        """Test outputs within budget are returned as is."""
+        result = self._executor(1000).execute(self._label_call("short"))
+
+        assert result.content == "short"
+
+    def test_large_output_is_paged_through_read_more(self):
+        """Test an over-budget output can be reassembled with read_more."""
+        label = "".join(f"row {i}\n" for i in range(500))
+        executor = self._executor(1000)
+
+        result = executor.execute(self._label_call(label))
+
+        assert not result.is_error
+        assert len(result.content) < 1500
+        handle = result.content.split("Full output saved as '")[1].split("'")[0]
+
+        pages = [result.content.split("\n\n[Output truncated")[0]]
+        offset = len(pages[0]) + 1
+        while True:
+            arguments = json.dumps({"handle": handle, "offset": offset})
+            page = executor.execute(
+                ToolCall(id="c2", name="read_more", arguments=arguments)
+            ).content
+            text, note = page.rsplit("\n\n", 1)
+            pages.append(text)
+            if note.startswith("[End of output"):
+                break
+            offset = int(note.split("offset ")[1].split(" ")[0])
+
+        assert "\n".join(pages) == label.removesuffix("\n")
+
+    def test_zero_budget_disables_truncation(self):
+        """Test a budget of 0 returns full outputs."""
+        label = "x" * 5000
+
+        result = self._executor(0).execute(self._label_call(label))
+
+        assert result.content == label
+
+    def test_truncation_is_recorded_on_span(self):
+        """Test the tool span records the full size and handle."""
+        recorder = RecordingProcessor()
+        with (
+            patch("src.tracing.trace._create_processor", return_value=recorder),
+            trace("test"),
+        ):
+            self._executor(100).execute(self._label_call("y" * 400))
+
+        tool_span = next(s for s in recorder.spans if s.kind == SpanKind.TOOL)
+        assert tool_span.data.get("truncated") is True
+        assert tool_span.data.get("output_chars") == 400
+        assert tool_span.data.get("output_handle").startswith("out_")
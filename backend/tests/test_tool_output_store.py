@@ -0,0 +1,107 @@
+"""Tests for the tool output store and the read_more tool."""
+
+from __future__ import annotations
+
+import pytest
+
+from src.tools.errors import ToolError
+from src.tools.output_store import ToolOutputStore
+from src.tools.output_store import get_tool_output_store
+from src.tools.read_more import ReadMoreArgs
+from src.tools.read_more import ReadMoreTool
+
+TEXT = "".join(f"{i}: line number {i}\n" for i in range(1, 201))
+
+
+class TestToolOutputStore:
+    """Tests for ToolOutputStore."""
+
+    def test_handles_are_content_addressed(self):
+        """Test storing the same output twice yields one entry."""
+        store = ToolOutputStore()
+
+        assert store.put(TEXT) == store.put(TEXT)
+        assert len(store) == 1
+
+    def test_pages_end_on_line_boundaries(self):
+        """Test pages cover the output without splitting lines."""
+        store = ToolOutputStore()
+        handle = store.put(TEXT)
+
+        pages = []
+        offset = 0
+        while True:
+            page = store.page(handle, offset, 500)
+            assert page is not None
+            pages.append(page)
+            if not page.has_more:
+                break
+            offset = page.end
+
+        assert "\n".join(page.text for page in pages) == TEXT.removesuffix("\n")
+        assert pages[0].first_line == 1
+        assert pages[1].first_line == pages[0].last_line + 1
+        assert pages[-1].last_line == pages[-1].total_lines == 200
+
+    def test_long_line_is_split(self):
+        """Test a line longer than the page size is cut mid-line."""
+        store = ToolOutputStore()
+        handle = store.put("x" * 2500)
+
+        page = store.page(handle, 0, 1000)
+
+        assert page is not None
+        assert len(page.text) == 1000
+        assert page.end == 1000
+
+    def test_oldest_outputs_are_evicted(self):
+        """Test the store stays within its size limit."""
+        store = ToolOutputStore(max_chars=250)
+        first = store.put("a" * 100)
+        second = store.put("b" * 100)
+        third = store.put("c" * 100)
+
+        assert first not in store
+        assert second in store
+        assert third in store
+
+
+class TestReadMoreTool:
+    """Tests for ReadMoreTool."""
+
+    def test_continues_from_offset(self):
+        """Test the tool returns the requested page and a continuation note."""
+        handle = get_tool_output_store().put(TEXT)
+
+        output = ReadMoreTool().execute(
+            ReadMoreArgs(handle=handle, offset=0, max_chars=1000)
+        )
+
+        assert output.startswith("1: line number 1\n")
+        assert f"read_more with handle '{handle}'" in output
+
+    def test_last_page_says_end(self):
+        """Test the final page is marked as the end."""
+        handle = get_tool_output_store().put(TEXT)
+
+        output = ReadMoreTool().execute(
+            ReadMoreArgs(handle=handle, offset=len(TEXT) - 40, max_chars=1000)
+        )
+
+        assert output.endswith(
+            f"[End of output '{handle}' "
+            f"(lines 199-200 of 200, chars {len(TEXT) - 40}"
+            f"-{len(TEXT)} of {len(TEXT)}).]"
+        )
+
+    def test_unknown_handle(self):
+        """Test an unknown handle is a tool error."""
+        with pytest.raises(ToolError, match="not available"):
+            ReadMoreTool().execute(ReadMoreArgs(handle="out_missing"))
+
+    def test_offset_past_end(self):
+        """Test an offset beyond the output is a tool error."""
+        handle = get_tool_output_store().put(TEXT)
+
+        with pytest.raises(ToolError, match="past the end"):
+            ReadMoreTool().execute(ReadMoreArgs(handle=handle, offset=len(TEXT)))
@@ -0,0 +1,271 @@
+"""Tests for ToolRegistry."""
+
+from __future__ import annotations
+
+import json
+import sys
+import textwrap
+from unittest.mock import patch
+
+import pytest
+
+from src.tools import CurrentTimeArgs
+from src.tools import CurrentTimeTool
+from src.tools import ReadFileTool
+from src.tools import ToolRegistry
+from src.tools import ToolSchemaCache
+from src.tools import get_tool_registry
+from src.tools import get_tool_schemas
+
+
+class TestToolRegistry:
+    """Tests for ToolRegistry."""
+
+    def test_schema_built_once_at_registration(self):
+        """Test repeated schema requests do not regenerate schemas."""
+        with patch.object(
+            CurrentTimeArgs,
+            "model_json_schema",
+            wraps=CurrentTimeArgs.model_json_schema,
+        ) as build_schema:
+            registry = ToolRegistry([CurrentTimeTool()])
+            first = registry.schemas()
+            second = registry.schemas()
+            registry.schemas_json()
+
+        assert first is second
+        assert first[0]["function"]["name"] == "get_current_time"
+        assert build_schema.call_count == 1
+
+    def test_schemas_json_matches_schemas(self):
+        """Test the pre-serialized form decodes to the schema list."""
+        registry = ToolRegistry([CurrentTimeTool(), ReadFileTool()])
+
+        assert json.loads(registry.schemas_json()) == registry.schemas()
+        assert registry.schemas_json() is registry.schemas_json()
+
+    def test_register_replaces_and_invalidates(self):
+        """Test registering a tool refreshes the cached schema list."""
+        registry = ToolRegistry([CurrentTimeTool()])
+        before = registry.schemas()
+
+        registry.register(ReadFileTool())
+
+        assert len(registry) == 2
+        assert "read_file" in registry
+        assert registry.schemas() is not before
+        assert len(json.loads(registry.schemas_json())) == 2
+
+    def test_default_schemas_are_shared(self):
+        """Test get_tool_schemas returns the precomputed list."""
+        assert get_tool_schemas() is get_tool_schemas()
+
+
+LAZY_MODULE = textwrap.dedent(
+    """
+    from pydantic import BaseModel
+
+    from src.tools.base import BaseTool
+
+
+    class EchoArgs(BaseModel):
+        text: str
+
+
+    class EchoTool(BaseTool[EchoArgs]):
+        name = "echo"
+        description = "Echo text."
+        args_model = EchoArgs
+
+        def execute(self, args):
+            return args.text
+    """
+)
+
+
+@pytest.fixture
+def lazy_module(tmp_path, monkeypatch):
+    """Write an importable tool module and forget it after the test."""
+    (tmp_path / "lazy_echo_tool.py").write_text(LAZY_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazy_echo_tool"
+    sys.modules.pop("lazy_echo_tool", None)
+
+
+SPLIT_ARGS_MODULE = textwrap.dedent(
+    """
+    from pydantic import BaseModel
+    from pydantic import Field
+
+
+    class EchoArgs(BaseModel):
+        text: str = Field(description="Text to echo.")
+    """
+)
+
+SPLIT_TOOL_MODULE = textwrap.dedent(
+    """
+    from lazy_echo_args import EchoArgs
+
+    from src.tools.base import BaseTool
+
+
+    class EchoTool(BaseTool[EchoArgs]):
+        name = "echo"
+        description = "Echo text."
+        args_model = EchoArgs
+
+        def execute(self, args):
+            return args.text
+    """
+)
+
+
+@pytest.fixture
+def split_module(tmp_path, monkeypatch):
+    """Write a tool module whose args model lives in another module."""
+    (tmp_path / "lazy_echo_args.py").write_text(SPLIT_ARGS_MODULE)
+    (tmp_path / "lazy_split_tool.py").write_text(SPLIT_TOOL_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazy_split_tool"
+    sys.modules.pop("lazy_split_tool", None)
+    sys.modules.pop("lazy_echo_args", None)
+
+
+def _forget(*module_names: str) -> None:
+    """Drop modules so the next import reads their files again."""
+    for module_name in module_names:
+        sys.modules.pop(module_name, None)
+
+
+class TestLazyRegistry:
+    """Tests for lazily imported tools."""
+
+    def test_names_do_not_import(self, lazy_module):
+        """Test registering and listing a lazy tool does not import it."""
+        registry = ToolRegistry()
+        registry.register_lazy("echo", f"{lazy_module}:EchoTool")
+
+        assert registry.names() == ["echo"]
+        assert "echo" in registry
+        assert lazy_module not in sys.modules
+        assert registry.is_loaded("echo") is False
+
+    def test_first_use_imports_once(self, lazy_module):
+        """Test the module is imported on first use and reused afterwards."""
+        registry = ToolRegistry()
+        registry.register_lazy("echo", f"{lazy_module}:EchoTool")
+
+        tool = registry["echo"]
+
+        assert lazy_module in sys.modules
+        assert registry.get("echo") is tool
+        assert registry.is_loaded("echo") is True
+
+    def test_cached_schema_skips_import(self, lazy_module, tmp_path):
+        """Test a warm schema cache serves schemas without importing."""
+        cache_path = tmp_path / "schemas.json"
+        target = f"{lazy_module}:EchoTool"
+
+        warm = ToolRegistry(schema_cache=ToolSchemaCache(cache_path))
+        warm.register_lazy("echo", target)
+        expected = warm.schemas()
+        sys.modules.pop(lazy_module)
+
+        cold = ToolRegistry(schema_cache=ToolSchemaCache(cache_path))
+        cold.register_lazy("echo", target)
+
+        assert cold.schemas() == expected
+        assert lazy_module not in sys.modules
+
+    def test_edited_module_refreshes_schema(self, lazy_module, tmp_path):
+        """Test the schema cache is invalidated when the module changes."""
+        cache_path = tmp_path / "schemas.json"
+        target = f"{lazy_module}:EchoTool"
+        warm = ToolRegistry(schema_cache=ToolSchemaCache(cache_path))
+        warm.register_lazy("echo", target)
+        warm.schemas()
+        sys.modules.pop(lazy_module)
+
+        module_file = tmp_path / f"{lazy_module}.py"
+        module_file.write_text(
+            LAZY_MODULE.replace('description = "Echo text."', 'description = "New."')
+        )
+        cold = ToolRegistry(schema_cache=ToolSchemaCache(cache_path))
+        cold.register_lazy("echo", target)
+
+        assert cold.schemas()[0]["function"]["description"] == "New."
+
+    def test_edited_args_module_refreshes_schema(self, split_module, tmp_path):
+        """Test editing an args model in another module invalidates the cache."""
+        cache_path = tmp_path / "schemas.json"
+        target = f"{split_module}:EchoTool"
+        warm = ToolRegistry(schema_cache=ToolSchemaCache(cache_path))
+        warm.register_lazy("echo", target)
+        warm.schemas()
+        _forget(split_module, "lazy_echo_args")
+
+        (tmp_path / "lazy_echo_args.py").write_text(
+            SPLIT_ARGS_MODULE.replace("Text to echo.", "Text to repeat back.")
+        )
+        cold = ToolRegistry(schema_cache=ToolSchemaCache(cache_path))
+        cold.register_lazy("echo", target)
+
+        properties = cold.schemas()[0]["function"]["parameters"]["properties"]
+        assert properties["text"]["description"] == "Text to repeat back."
+
+    def test_edited_base_module_refreshes_schema(self, split_module, tmp_path):
+        """Test the cache is keyed by BaseTool's module too."""
+        cache_path = tmp_path / "schemas.json"
+        target = f"{split_module}:EchoTool"
+        warm = ToolRegistry(schema_cache=ToolSchemaCache(cache_path))
+        warm.register_lazy("echo", target)
+        warm.schemas()
+        _forget(split_module, "lazy_echo_args")
+        sources = json.loads(cache_path.read_text())[target]["sources"]
+
+        def stamp(module_name: str) -> list[int]:
+            edited = module_name == "src.tools.base"
+            return [0, 0] if edited else sources[module_name]
+
+        with patch("src.tools.registry._module_stamp", side_effect=stamp):
+            cold = ToolRegistry(schema_cache=ToolSchemaCache(cache_path))
+            cold.register_lazy("echo", target)
+            cold.schemas()
+
+        assert set(sources) == {split_module, "lazy_echo_args", "src.tools.base"}
+        assert split_module in sys.modules
+
+    def test_pydantic_upgrade_refreshes_schema(self, lazy_module, tmp_path):
+        """Test schemas cached under another pydantic version are rebuilt."""
+        cache_path = tmp_path / "schemas.json"
+        target = f"{lazy_module}:EchoTool"
+        warm = ToolRegistry(schema_cache=ToolSchemaCache(cache_path))
+        warm.register_lazy("echo", target)
+        warm.schemas()
+        _forget(lazy_module)
+
+        with patch("src.tools.registry.PYDANTIC_VERSION", "0.0"):
+            cold = ToolRegistry(schema_cache=ToolSchemaCache(cache_path))
+            cold.register_lazy("echo", target)
+            cold.schemas()
+
+        assert lazy_module in sys.modules
+
+    def test_name_mismatch_is_rejected(self, lazy_module):
+        """Test a target whose tool name differs from its registration fails."""
+        registry = ToolRegistry()
+        registry.register_lazy("other", f"{lazy_module}:EchoTool")
+
+        with pytest.raises(ValueError, match="registered as 'other'"):
+            registry["other"]
+
+    def test_default_registry_is_shared(self):
+        """Test executors share one registry instead of rebuilding it."""
+        assert get_tool_registry() is get_tool_registry()
+        assert set(get_tool_registry().names()) >= {
+            "get_current_time",
+            "get_random_date",
+            "read_file",
+            "read_more",
+        }
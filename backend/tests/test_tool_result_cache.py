@@ -0,0 +1,79 @@
+"""Tests for ToolResultCache."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from src.services.tool_result_cache import CacheStatus
+from src.services.tool_result_cache import ToolResultCache
+
+
+class TestToolResultCache:
+    """Tests for ToolResultCache."""
+
+    def test_second_lookup_is_a_hit(self):
+        """Test repeated keys are served from the cache."""
+        cache = ToolResultCache()
+        calls = []
+
+        first = cache.get_or_compute("k", lambda: calls.append(1) or "out")
+        second = cache.get_or_compute("k", lambda: calls.append(1) or "out")
+
+        assert first == ("out", CacheStatus.MISS)
+        assert second == ("out", CacheStatus.HIT)
+        assert len(calls) == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_evicts_least_recently_used(self):
+        """Test the cache stays within max_entries, dropping the oldest."""
+        cache = ToolResultCache(max_entries=2)
+        cache.get_or_compute("a", lambda: "a")
+        cache.get_or_compute("b", lambda: "b")
+        cache.get_or_compute("a", lambda: "a")
+        cache.get_or_compute("c", lambda: "c")
+
+        assert len(cache) == 2
+        assert cache.get_or_compute("a", lambda: "new")[1] == CacheStatus.HIT
+        assert cache.get_or_compute("b", lambda: "new") == ("new", CacheStatus.MISS)
+
+    def test_errors_are_not_cached(self):
+        """Test a failed computation is retried on the next lookup."""
+        cache = ToolResultCache()
+
+        def _fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            cache.get_or_compute("k", _fail)
+
+        assert cache.get_or_compute("k", lambda: "ok") == ("ok", CacheStatus.MISS)
+
+    def test_concurrent_identical_lookups_share_one_computation(self):
+        """Test single-flight: concurrent callers wait for the leader."""
+        cache = ToolResultCache()
+        calls = []
+        results = []
+
+        def _slow():
+            calls.append(1)
+            time.sleep(0.05)
+            return "out"
+
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(cache.get_or_compute("k", _slow))
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert [output for output, _ in results] == ["out"] * 4
+        statuses = sorted(status.value for _, status in results)
+        assert statuses == ["miss", "shared", "shared", "shared"]
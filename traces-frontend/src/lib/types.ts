@@ -1,4 +1,4 @@
-export type SpanKind = 'conversation' | 'turn' | 'llm' | 'tool' | 'internal';
+export type SpanKind = 'conversation' | 'turn' | 'llm' | 'tool' | 'internal' | 'compaction';
 export type SpanStatus = 'ok' | 'error' | 'running';
 
 export interface SpanData {